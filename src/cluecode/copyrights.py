@@ -13,6 +13,7 @@ import re
 import string
 import sys
 
+from bisect import bisect_right
 from collections import deque
 from time import time
 
@@ -148,6 +149,17 @@ def detect_copyrights(
 DETECTOR = None
 
 
+def get_detector():
+    """
+    Return a CopyrightDetector shared in this process and created on first use
+    as building its lexer and parser is costly.
+    """
+    global DETECTOR
+    if not DETECTOR:
+        DETECTOR = CopyrightDetector()
+    return DETECTOR
+
+
 def detect_copyrights_from_lines(
     numbered_lines,
     include_copyrights=True,
@@ -177,12 +189,11 @@ def detect_copyrights_from_lines(
     include_copyright_years = include_copyrights and include_copyright_years
     include_copyright_allrights = include_copyrights and include_copyright_allrights
 
-    global DETECTOR
+    numbered_lines = filter_candidate_lines(numbered_lines)
+    if not numbered_lines:
+        return
 
-    if not DETECTOR:
-        DETECTOR = detector = CopyrightDetector()
-    else:
-        detector = DETECTOR
+    detector = get_detector()
 
     candidate_lines_groups = list(collect_candidate_lines(numbered_lines))
 
@@ -225,6 +236,97 @@ def detect_copyrights_from_lines(
 ################################################################################
 
 
+class CompiledLexer(lex.Lexer):
+    """
+    A pygmars Lexer that assigns the same labels as the Lexer built from the
+    same ``matchers`` with fewer regex calls:
+
+    - All the regex matchers are combined in a single regex alternation.
+      Alternatives are tried in order and re.match returns the first
+      alternative that matches, like the Lexer that tries each matcher in
+      sequence. Each alternative ends with an empty marker group: the index of
+      the marker of the matched alternative is the match ``lastindex``. The
+      alternatives start with their first character rather than with a group
+      or a redundant "^" anchor such that the re module skips quickly the
+      alternatives that cannot match.
+
+    - The label of a token depends only on its value: the label (or None if no
+      matcher matches) is cached by token value as the same words are lexed
+      over and over in a scan. The cache is cleared when it reaches
+      ``max_cached`` entries.
+    """
+
+    def __init__(self, matchers, re_flags=0, max_cached=100000):
+        matchers = list(matchers)
+        super().__init__(matchers=matchers, re_flags=re_flags)
+        self.max_cached = max_cached
+        # mapping of {token value: label or None}
+        self.labels_by_value = {}
+        self._combined_match = None
+        # mapping of {alternative group index: label}
+        self._labels_by_group = {}
+
+        if not all(isinstance(m, str) for m, _label in matchers):
+            # callable matchers cannot be combined
+            return
+
+        alternatives = []
+        group_index = 0
+        for pattern, label in matchers:
+            if pattern.startswith('^'):
+                # re.match always matches at the start
+                pattern = pattern[1:]
+            alternatives.append(f'(?:{pattern})()')
+            # skip the groups of this pattern to get its marker group index
+            group_index += re.compile(pattern, flags=re_flags).groups + 1
+            self._labels_by_group[group_index] = label
+
+        self._combined_match = re.compile(
+            '|'.join(alternatives),
+            flags=re_flags,
+        ).match
+
+    def get_label(self, value):
+        """
+        Return the label of the first matcher that matches a ``value`` string
+        or None.
+        """
+        if self._combined_match:
+            matched = self._combined_match(value)
+            if matched:
+                return self._labels_by_group[matched.lastindex]
+            return
+
+        for matcher, label in self._matchers:
+            if matcher(value):
+                return label
+
+    def lex_tokens(self, tokens, trace=False):
+        if trace:
+            yield from super().lex_tokens(tokens, trace=trace)
+            return
+
+        labels_by_value = self.labels_by_value
+        get_label = self.get_label
+        max_cached = self.max_cached
+        for token in tokens:
+            value = token.value
+            try:
+                label = labels_by_value[value]
+            except KeyError:
+                label = get_label(value)
+                if len(labels_by_value) >= max_cached:
+                    labels_by_value.clear()
+                labels_by_value[value] = label
+
+            if label is not None:
+                token.label = label
+            yield token
+
+    def __repr__(self):
+        return f'<CompiledLexer: size={len(self._matchers)}>'
+
+
 class CopyrightDetector(object):
     """
     Detect copyrights and authors.
@@ -234,7 +336,7 @@ class CopyrightDetector(object):
         """
         Initialize this detector with a lexer and a parser.
         """
-        self.lexer = lex.Lexer(matchers=PATTERNS)
+        self.lexer = CompiledLexer(matchers=PATTERNS)
         self.parser = parse.Parser(
             grammar=GRAMMAR,
             loop=1,
@@ -4319,6 +4421,94 @@ remove_non_chars = re.compile(r'[^a-z0-9]', re.IGNORECASE).sub
 has_trailing_year = re.compile(r'(?:19\d\d|20[0-4]\d)+$').findall
 
 
+def _get_candidate_markers_regex():
+    """
+    Return a regex string matching the markers that a line must contain to be a
+    candidate or an end of statement line in collect_candidate_lines(). These
+    markers are checked on prepared lines: here they are searched in lines as
+    found in a text and the regex matches a superset of these markers.
+    """
+    # letters possibly separated by non-chars as in remove_non_chars(), but
+    # within a line
+    non_chars = r'[^a-z0-9\n]*'
+
+    markers = [
+        # any non-ASCII char such as © could be converted to ASCII markers
+        r'[^\x00-\x7f]',
+        # the many spellings of a (c) copyright sign
+        r'\(\s*c\s*\)',
+        '&copy',
+        r'[\\<]a9',
+        # "by " with any trailing space or punctuation
+        r'by(?![a-z0-9])',
+        # years, possibly after an escaped \0
+        r'(?:(?<![0-9])|(?<=\\0))(?:19[6-9]|20\d)\d(?![0-9])',
+        # is_end_of_statement() and http
+        non_chars.join('right'),
+        non_chars.join('http'),
+        # legacy Debian <s> tags
+        's>',
+    ]
+    markers.extend(
+        re.escape(marker)
+        for marker in copyrights_hint.statement_markers
+        if marker.isascii() and marker.strip() == marker
+    )
+    return '|'.join(markers)
+
+
+find_candidate_marker = re.compile(
+    _get_candidate_markers_regex(),
+    re.IGNORECASE,
+).search
+
+
+def filter_candidate_lines(numbered_lines, following_lines=3):
+    """
+    Return a list of the ``numbered_lines`` tuples of (line number, line text)
+    that contain a candidate marker and of the ``following_lines`` lines that
+    follow each of these.
+
+    This is a fast prefilter of the lines processed by collect_candidate_lines()
+    searching all the lines at once: the other lines cannot be candidate lines
+    and are skipped without changing the candidate lines groups as a candidate
+    line is followed by at most ``following_lines`` non-candidate lines in a
+    group of candidate lines.
+    """
+    numbered_lines = list(numbered_lines)
+    if not numbered_lines:
+        return []
+
+    # the offsets of each line start in the text of all lines
+    starts = []
+    offset = 0
+    for _ln, line in numbered_lines:
+        starts.append(offset)
+        offset += len(line) + 1
+
+    text = '\n'.join(line for _ln, line in numbered_lines)
+
+    filtered = []
+    filtered_append = filtered.append
+    # index of the first line not yet filtered
+    next_index = 0
+    lines_count = len(numbered_lines)
+    match = find_candidate_marker(text)
+    while match:
+        index = bisect_right(starts, match.start()) - 1
+        end_index = min(index + 1 + following_lines, lines_count)
+        for idx in range(max(index, next_index), end_index):
+            filtered_append(numbered_lines[idx])
+        next_index = max(end_index, next_index)
+
+        # search from the next line start
+        if index + 1 >= lines_count:
+            break
+        match = find_candidate_marker(text, starts[index + 1])
+
+    return filtered
+
+
 def collect_candidate_lines(numbered_lines):
     """
     Yield groups of prepared candidate line lists where each list element is a tuple of
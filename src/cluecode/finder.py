@@ -7,6 +7,7 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+import os
 import string
 import re
 
@@ -124,13 +125,13 @@ def emails_regex():
     return re.compile('\\b[A-Z0-9._%-]+@[A-Z0-9.-]+\\.[A-Z]{2,4}\\b', re.IGNORECASE)
 
 
-def find_emails(location, unique=True):
+def find_emails(location, unique=True, clue_keys=('emails',)):
     """
     Yield an iterable of (email, line_number) found in file at ``location``.
     Only return unique items if ``unique`` is True.
+    Search the file at once for all the ``clue_keys`` clues. See find_clues().
     """
-    patterns = [('emails', emails_regex(),)]
-    matches = find(location, patterns)
+    matches = find_clues(location, keys=clue_keys)['emails']
 
     if TRACE_EMAIL:
         matches = list(matches)
@@ -226,14 +227,130 @@ def urls_regex():
 INVALID_URLS_PATTERN = '((?:' + schemes + ')://([$%*/_])+)'
 
 
-def find_urls(location, unique=True):
+# mapping of {clue key: function returning a compiled regex}
+CLUE_PATTERNS = {
+    'emails': emails_regex,
+    'urls': urls_regex,
+}
+
+
+# A regex to find the "anchors" that any email or URL match contains: "@" for
+# emails and git-style URLs and "://", "www." or "ftp." for URLs. This regex
+# starts with a set of characters such that the text without anchors is skipped
+# quickly.
+find_clue_anchors = re.compile(
+    r'[@:wWfF](?:(?<=@)|(?<=:)//|(?<=[wW])[wW][wW]\.|(?<=[fF])[tT][pP]\.)'
+).finditer
+
+
+def find_clues(location, keys=tuple(CLUE_PATTERNS)):
+    """
+    Return a mapping of {key: list of (key, match, line, line_number) tuples}
+    with the unfiltered matches of each of the ``keys`` CLUE_PATTERNS such as
+    "emails" and "urls" found in the file at ``location``. These are the same
+    matches as returned by find().
+
+    The whole file text is searched once for the anchors of all the ``keys``
+    clues and each clue pattern is matched only in the lines with an anchor.
+    Files larger than the FileContext size limit are searched line by line
+    instead, such that their whole text is not loaded in memory at once.
+
+    The matches are cached in the current FileContext of this file if any, such
+    that an email scan of a file finds the URLs for a later URL scan of this
+    file in the same pass.
+    """
+    context = analysis.get_file_context(location)
+    if context:
+        cached = context.cache.setdefault('clues', {})
+    else:
+        cached = {}
+
+    missing = [key for key in keys if key not in cached]
+    if not missing:
+        return {key: cached[key] for key in keys}
+
+    if is_large_file(location):
+        numbered_lines = analysis.numbered_text_lines(location, demarkup=False)
+        cached.update(find_clues_in_lines(numbered_lines, keys=missing))
+    else:
+        numbered_text = analysis.numbered_text(location, demarkup=False)
+        cached.update(find_clues_in_text(numbered_text, keys=missing))
+
+    return {key: cached[key] for key in keys}
+
+
+def is_large_file(location):
+    """
+    Return True if ``location`` is a file too large to be cached in a
+    FileContext.
+    """
+    return (
+        isinstance(location, str)
+        and os.path.isfile(location)
+        and os.path.getsize(location) > analysis.MAX_CONTEXT_FILE_SIZE
+    )
+
+
+def find_clues_in_text(numbered_text, keys):
+    """
+    Return a mapping of {key: list of matches} for each of the ``keys`` clues
+    found in a ``numbered_text`` NumberedText searched at once for anchors.
+    """
+    line_index = numbered_text.line_index
+
+    # sets of the indexes of the lines with an anchor
+    email_lines = set()
+    url_lines = set()
+    for anchor in find_clue_anchors(numbered_text.text):
+        index = line_index(anchor.start())
+        url_lines.add(index)
+        if anchor.group() == '@':
+            email_lines.add(index)
+
+    lines_by_key = dict(emails=email_lines, urls=url_lines)
+    numbered_lines = numbered_text.numbered_lines
+    matches_by_key = {}
+    for key in keys:
+        findall = CLUE_PATTERNS[key]().findall
+        matches_by_key[key] = matches = []
+        for index in sorted(lines_by_key[key]):
+            line_number, line = numbered_lines[index]
+            for match in findall(line):
+                matches.append((key, toascii(match), line, line_number))
+
+    return matches_by_key
+
+
+def find_clues_in_lines(numbered_lines, keys):
+    """
+    Return a mapping of {key: list of matches} for each of the ``keys`` clues
+    found in a ``numbered_lines`` iterable of (line number, line) searched one
+    line at a time for anchors.
+    """
+    findalls = [(key, CLUE_PATTERNS[key]().findall) for key in keys]
+    matches_by_key = {key: [] for key in keys}
+    for line_number, line in numbered_lines:
+        anchors = {anchor.group() for anchor in find_clue_anchors(line)}
+        if not anchors:
+            continue
+        for key, findall in findalls:
+            if key == 'emails' and '@' not in anchors:
+                continue
+            matches = matches_by_key[key]
+            for match in findall(line):
+                matches.append((key, toascii(match), line, line_number))
+
+    return matches_by_key
+
+
+def find_urls(location, unique=True, clue_keys=('urls',)):
     """
     Yield an iterable of (url, line_number) found in file at ``location``.
     Only return unique items if ``unique`` is True.
+    Search the file at once for all the ``clue_keys`` clues. See find_clues().
     `location` can be a list of strings for testing.
     """
-    patterns = [('urls', urls_regex(),)]
-    matches = find(location, patterns)
+    matches = find_clues(location, keys=clue_keys)['urls']
     if TRACE:
         matches = list(matches)
         for m in matches:
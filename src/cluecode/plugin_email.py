@@ -46,11 +46,21 @@ class EmailScanner(ScanPlugin):
     def is_enabled(self, email, **kwargs):
         return email
 
-    def get_scanner(self, max_email=50, test_slow_mode=False, test_error_mode=False, **kwargs):
+    def get_scanner(
+        self,
+        max_email=50,
+        test_slow_mode=False,
+        test_error_mode=False,
+        url=False,
+        **kwargs,
+    ):
         from scancode.api import get_emails
+        # find URLs in the same pass if we also scan for URLs
+        clue_keys = ('emails', 'urls') if url else ('emails',)
         return partial(
             get_emails,
             threshold=max_email,
             test_slow_mode=test_slow_mode,
-            test_error_mode=test_error_mode
+            test_error_mode=test_error_mode,
+            clue_keys=clue_keys,
         )
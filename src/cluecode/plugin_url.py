@@ -47,6 +47,8 @@ class UrlScanner(ScanPlugin):
     def is_enabled(self, url, **kwargs):
         return url
 
-    def get_scanner(self, max_url=50, **kwargs):
+    def get_scanner(self, max_url=50, email=False, **kwargs):
         from scancode.api import get_urls
-        return partial(get_urls, threshold=max_url)
+        # find emails in the same pass if we also scan for emails
+        clue_keys = ('emails', 'urls') if email else ('urls',)
+        return partial(get_urls, threshold=max_url, clue_keys=clue_keys)
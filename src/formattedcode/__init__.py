@@ -84,3 +84,48 @@ def validate_output_file_path(location):
                 raise InvalidScanCodeOutputFileError(
                     f'output file parent is not a writable directory: {os.fsdecode(location)!r}',
                 )
+
+
+def write_files(writer, files):
+    """
+    Write the ``files`` iterable of serialized file mappings with a ``writer``
+    files writer.
+
+    A files writer is a generator that writes the start of its output when
+    first advanced, then receives the file mappings one at a time with send()
+    and completes its output when it receives None. A files writer must not
+    modify the file mappings it receives: these are shared by all the writers
+    of a scan such that the codebase is walked and serialized only once for
+    all the output formats.
+    """
+    next(writer)
+    for scanned_file in files:
+        writer.send(scanned_file)
+    close_files_writer(writer)
+
+
+def close_files_writer(writer):
+    """
+    Signal to a ``writer`` files writer that there are no more files such that
+    it completes its output.
+    """
+    try:
+        writer.send(None)
+    except StopIteration:
+        return
+    raise Exception(f'Files writer did not complete: {writer!r}')
+
+
+def collect_files(callback):
+    """
+    Files writer that collects all the file mappings it receives in a list and
+    calls ``callback`` with this list once done. Used for output formats that
+    need all the files at once.
+    """
+    files = []
+    while True:
+        scanned_file = yield
+        if scanned_file is None:
+            break
+        files.append(scanned_file)
+    callback(files)
@@ -11,6 +11,8 @@ import attr
 import csv
 import logging
 import os
+import pickle
+import tempfile
 import warnings
 
 import saneyaml
@@ -21,6 +23,8 @@ from plugincode.output import output_impl
 from plugincode.output import OutputPlugin
 
 from formattedcode import FileOptionType
+from formattedcode import write_files
+from scancode_config import scancode_temp_dir
 
 # Tracing flags
 TRACE = os.environ.get('SCANCODE_DEBUG_OUTPUT_CSV', False)
@@ -64,6 +68,10 @@ class CsvOutput(OutputPlugin):
         return csv
 
     def process_codebase(self, codebase, csv, **kwargs):
+        results = self.get_files(codebase, **kwargs)
+        write_files(self.get_files_writer(codebase, csv, **kwargs), results)
+
+    def get_files_writer(self, codebase, csv, **kwargs):
         warnings.warn(
             DEPRECATED_MSG,
             DeprecationWarning,
@@ -72,14 +80,22 @@ class CsvOutput(OutputPlugin):
         import click
         click.secho('[DEPRECATION WARNING] ' + DEPRECATED_MSG, err=True)
 
-        results = self.get_files(codebase, **kwargs)
-        write_csv(results, csv)
+        return csv_writer(output_file=csv)
 
 
 def write_csv(results, output_file):
-    # FIXME: this is reading all in memory
-    results = list(results)
+    write_files(csv_writer(output_file), results)
 
+
+def csv_writer(output_file):
+    """
+    Files writer to write the received file mappings as CSV to
+    ``output_file``.
+
+    The CSV columns are only known once all the files have been received:
+    the flattened rows are first spooled to a temporary file such that the
+    files are never all held in memory.
+    """
     headers = dict([
         ('info', []),
         ('license', []),
@@ -88,29 +104,43 @@ def write_csv(results, output_file):
         ('url', []),
         ('package', []),
     ])
+    seen = set()
 
-    # note: FIXME: headers are collected as a side effect and this is not great
-    rows = list(flatten_scan(results, headers))
+    with tempfile.TemporaryFile(dir=scancode_temp_dir) as rows_file:
+        while True:
+            scanned_file = yield
+            if scanned_file is None:
+                break
+            # note: FIXME: headers are collected as a side effect and this is not great
+            for row in flatten_scan([scanned_file], headers, seen):
+                pickle.dump(row, rows_file, protocol=pickle.HIGHEST_PROTOCOL)
 
-    ordered_headers = []
-    for key_group in headers.values():
-        ordered_headers.extend(key_group)
+        ordered_headers = []
+        for key_group in headers.values():
+            ordered_headers.extend(key_group)
 
-    w = csv.DictWriter(output_file, fieldnames=ordered_headers)
-    w.writeheader()
+        w = csv.DictWriter(output_file, fieldnames=ordered_headers)
+        w.writeheader()
 
-    for r in rows:
-        w.writerow(r)
+        rows_file.seek(0)
+        while True:
+            try:
+                row = pickle.load(rows_file)
+            except EOFError:
+                break
+            w.writerow(row)
 
 
-def flatten_scan(scan, headers):
+def flatten_scan(scan, headers, seen=None):
     """
     Yield ordered dictionaries of key/values flattening the sequence
     data in a single line-separated value and keying always by path,
     given a ScanCode `scan` results list. Update the `headers` mapping
-    sequences with seen keys as a side effect.
+    sequences with seen keys as a side effect. Use the optional `seen` set of
+    keys already in `headers` to flatten a scan in several calls.
     """
-    seen = set()
+    if seen is None:
+        seen = set()
 
     def collect_keys(mapping, key_group):
         """Update the headers with new keys."""
@@ -119,7 +149,7 @@ def flatten_scan(scan, headers):
         seen.update(keys)
 
     for scanned_file in scan:
-        path = scanned_file.pop('path')
+        path = scanned_file['path']
 
         # removing any slash at the begening of the path
         path = path.lstrip('/')
@@ -128,14 +158,14 @@ def flatten_scan(scan, headers):
         if scanned_file.get('type') == 'directory' and not path.endswith('/'):
             path += '/'
 
-        errors = scanned_file.pop('scan_errors', [])
+        errors = scanned_file.get('scan_errors', [])
 
         # FIXME: info are NOT lists: lists are the actual scans
         file_info = dict(path=path)
         file_info.update(
             (
                 (k, v) for k, v in scanned_file.items()
-                if not isinstance(v, (list, dict))
+                if k != 'path' and not isinstance(v, (list, dict))
             )
         )
         # Scan errors are joined in a single multi-line value
@@ -16,6 +16,7 @@ from plugincode.output import output_impl
 from plugincode.output import OutputPlugin
 
 from formattedcode import FileOptionType
+from formattedcode import collect_files
 from licensedcode.detection import get_matches_from_detection_mappings
 from scancode import notice
 
@@ -53,6 +54,17 @@ class DebianCopyrightOutput(OutputPlugin):
             output_file=output_debian,
         )
 
+    def get_files_writer(self, codebase, output_debian, **kwargs):
+
+        def write(files):
+            debian_copyright = build_debian_copyright(codebase, files=files)
+            write_debian_copyright(
+                debian_copyright=debian_copyright,
+                output_file=output_debian,
+            )
+
+        return collect_files(write)
+
 
 def write_debian_copyright(debian_copyright, output_file):
     """
@@ -73,18 +85,20 @@ def write_debian_copyright(debian_copyright, output_file):
             output_file.close()
 
 
-def build_debian_copyright(codebase, **kwargs):
+def build_debian_copyright(codebase, files=None, **kwargs):
     """
     Return a DebianCopyrightobject built from the codebase.
     """
-    paragraphs = list(build_copyright_paragraphs(codebase, **kwargs))
+    paragraphs = list(build_copyright_paragraphs(codebase, files=files, **kwargs))
     return DebianCopyright(paragraphs=paragraphs)
 
 
-def build_copyright_paragraphs(codebase, **kwargs):
+def build_copyright_paragraphs(codebase, files=None, **kwargs):
     """
     Yield paragraphs built from the codebase.
     The codebase is assumed to contains license and copyright detections.
+    Use the optional ``files`` iterable of scanned file mappings instead of
+    the codebase files if provided.
     """
 
     codebase.add_files_count_to_current_header()
@@ -101,7 +115,10 @@ def build_copyright_paragraphs(codebase, **kwargs):
     # TODO: infer files patternsas in decopy
 
     # for now this is dumb and will generate one paragraph per scanned file
-    for scanned_file in OutputPlugin.get_files(codebase, **kwargs):
+    if files is None:
+        files = OutputPlugin.get_files(codebase, **kwargs)
+
+    for scanned_file in files:
         if scanned_file['type'] == 'directory':
             continue
         dfiles = scanned_file['path']
@@ -27,6 +27,8 @@ from commoncode.fileutils import file_name
 from commoncode.fileutils import file_base_name
 from commoncode.fileutils import parent_directory
 from formattedcode import FileOptionType
+from formattedcode import collect_files
+from formattedcode import write_files
 from commoncode.cliutils import PluggableCommandLineOption
 from commoncode.cliutils import OUTPUT_GROUP
 from plugincode.output import output_impl
@@ -78,19 +80,22 @@ class HtmlOutput(OutputPlugin):
 
     def process_codebase(self, codebase, html, **kwargs):
         results = self.get_files(codebase, **kwargs)
+        write_files(self.get_files_writer(codebase, html, **kwargs), results)
+
+    def get_files_writer(self, codebase, html, **kwargs):
         version = codebase.get_or_create_current_header().tool_version
         license_references = []
         if hasattr(codebase.attributes, 'license_references'):
             license_references = codebase.attributes.license_references
         template_loc = join(TEMPLATES_DIR, 'html', 'template.html')
         output_file = html
-        write_templated(
+        return collect_files(lambda results: write_templated(
             output_file=output_file,
             results=results,
             license_references=license_references,
             version=version,
             template_loc=template_loc,
-        )
+        ))
 
 
 @output_impl
@@ -126,19 +131,23 @@ class CustomTemplateOutput(OutputPlugin):
 
     def process_codebase(self, codebase, custom_output, custom_template, **kwargs):
         results = self.get_files(codebase, **kwargs)
+        writer = self.get_files_writer(codebase, custom_output, custom_template, **kwargs)
+        write_files(writer, results)
+
+    def get_files_writer(self, codebase, custom_output, custom_template, **kwargs):
         version = codebase.get_or_create_current_header().tool_version
         license_references = []
         if hasattr(codebase.attributes, 'license_references'):
             license_references = codebase.attributes.license_references
         template_loc = custom_template
         output_file = custom_output
-        write_templated(
+        return collect_files(lambda results: write_templated(
             output_file=output_file,
             results=results,
             license_references=license_references,
             version=version,
-            template_loc=template_loc
-        )
+            template_loc=template_loc,
+        ))
 
 
 def write_templated(output_file, results, license_references, version, template_loc):
@@ -269,10 +278,18 @@ class HtmlAppOutput(OutputPlugin):
 
     def process_codebase(self, codebase, input, html_app, **kwargs):  # NOQA
         results = self.get_files(codebase, **kwargs)
+        writer = self.get_files_writer(codebase, input, html_app, **kwargs)
+        write_files(writer, results)
+
+    def get_files_writer(self, codebase, input, html_app, **kwargs):  # NOQA
         version = codebase.get_or_create_current_header().tool_version
         output_file = html_app
         scanned_path = input
-        create_html_app(output_file, results, version, scanned_path)
+        return html_app_writer(
+            output_file=output_file,
+            version=version,
+            scanned_path=scanned_path,
+        )
 
 
 class HtmlAppAssetCopyWarning(Exception):
@@ -297,6 +314,16 @@ def create_html_app(output_file, results, version, scanned_path):  # NOQA
     Raise HtmlAppAssetCopyWarning if the output_file is <stdout> or
     HtmlAppAssetCopyError if the copy was not possible.
     """
+    writer = html_app_writer(output_file, version, scanned_path)
+    write_files(writer, results)
+
+
+def html_app_writer(output_file, version, scanned_path):  # NOQA
+    """
+    Files writer to create an html-app in output_file as in create_html_app()
+    with a data.js data file where each received file mapping is written as
+    soon as it is received.
+    """
     try:
         if is_stdout(output_file):
             raise HtmlAppAssetCopyWarning()
@@ -334,8 +361,17 @@ def create_html_app(output_file, results, version, scanned_path):  # NOQA
 
         # FIXME: this should a regular JSON scan format
         with io.open(join(target_assets_dir, 'data.js'), 'w') as f:
-            f.write('data=')
-            json.dump(list(results), f)
+            # this is the same as a json.dump() of the list of files
+            f.write('data=[')
+            separator = ''
+            while True:
+                scanned_file = yield
+                if scanned_file is None:
+                    break
+                f.write(separator)
+                f.write(json.dumps(scanned_file))
+                separator = ', '
+            f.write(']')
 
     except HtmlAppAssetCopyWarning as w:
         raise w
@@ -9,10 +9,12 @@
 import jsonstreams
 
 from formattedcode import FileOptionType
+from formattedcode import write_files
 from commoncode.cliutils import PluggableCommandLineOption
 from commoncode.cliutils import OUTPUT_GROUP
 from plugincode.output import output_impl
 from plugincode.output import OutputPlugin
+from scancode import serializers
 
 """
 Output plugins to write scan results as JSON.
@@ -57,6 +59,9 @@ class JsonCompactOutput(OutputPlugin):
     def process_codebase(self, codebase, output_json, **kwargs):
         write_results(codebase, output_file=output_json, pretty=False, **kwargs)
 
+    def get_files_writer(self, codebase, output_json, **kwargs):
+        return results_writer(codebase, output_file=output_json, pretty=False)
+
 
 @output_impl
 class JsonPrettyOutput(OutputPlugin):
@@ -76,28 +81,45 @@ class JsonPrettyOutput(OutputPlugin):
     def process_codebase(self, codebase, output_json_pp, **kwargs):
         write_results(codebase, output_file=output_json_pp, pretty=True, **kwargs)
 
+    def get_files_writer(self, codebase, output_json_pp, **kwargs):
+        return results_writer(codebase, output_file=output_json_pp, pretty=True)
+
 
 def write_results(codebase, output_file, pretty=False, **kwargs):
     """
     Write headers, files, and other attributes from `codebase` to `output_file`
 
+    Enable JSON indentation if `pretty` is True
+    """
+    files = OutputPlugin.get_files(codebase, **kwargs)
+    writer = results_writer(codebase, output_file=output_file, pretty=pretty)
+    write_files(writer, files)
+
+
+def results_writer(codebase, output_file, pretty=False):
+    """
+    Files writer to write headers, files, and other attributes from `codebase`
+    to `output_file`. Each file mapping is written as soon as it is received.
+
     Enable JSON indentation if `pretty` is True
     """
     # Set indentation for JSON output if `pretty` is True
-    # We use a separate dict for jsonstream kwargs since we are passing
-    # this function's kwargs as arguments to OutputPlugin.get_files()
     if pretty:
         jsonstreams_kwargs = dict(indent=2, pretty=True)
     else:
         jsonstreams_kwargs = dict(indent=None, pretty=False)
+    output_serializer = serializers.output_serializer
+    if output_serializer.name != 'json':
+        # only used if selected explicitly, otherwise use the default encoder
+        jsonstreams_kwargs['encoder'] = serializers.get_json_encoder_class(output_serializer)
 
     # If `output_file` is a path string, open the file at path `output_file` and use it as `output_file`
     close_fd = False
     if isinstance(output_file, str):
-        output_file = open(output_file, 'w')
+        output_file = open(output_file, 'w', encoding='utf-8')
         close_fd = True
 
-    # Begin wri'w' JSON to `output_file`
+    # Begin writing JSON to `output_file`
     with jsonstreams.Stream(
         jsonstreams.Type.OBJECT,
         fd=output_file,
@@ -115,10 +137,15 @@ def write_results(codebase, output_file, pretty=False, **kwargs):
                 s.write(attribute_key, attribute_value)
 
         # Write files
-        codebase_files = OutputPlugin.get_files(codebase, **kwargs)
-        # OutputPlugin.get_files() returns a generator, not JSON-serializable
-        codebase_files = list(codebase_files)
-        s.write('files', codebase_files)
+        scanned_file = yield
+        if scanned_file is None:
+            s.write('files', [])
+            return
+
+        with s.subarray('files') as files_array:
+            while scanned_file is not None:
+                files_array.write(scanned_file)
+                scanned_file = yield
 
 
 def get_results(codebase, as_list=False, **kwargs):
@@ -6,13 +6,13 @@
 # See https://github.com/nexB/scancode-toolkit for support or download.
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
-import json
-
 from formattedcode import FileOptionType
+from formattedcode import write_files
 from commoncode.cliutils import OUTPUT_GROUP
 from commoncode.cliutils import PluggableCommandLineOption
 from plugincode.output import OutputPlugin
 from plugincode.output import output_impl
+from scancode import serializers
 
 """
 Output plugin to write scan results as JSON lines.
@@ -36,27 +36,37 @@ class JsonLinesOutput(OutputPlugin):
 
     # TODO: reuse the json output code and merge that in a single plugin
     def process_codebase(self, codebase, output_json_lines, **kwargs):
-        # NOTE: we write as binary, not text
         files = self.get_files(codebase, **kwargs)
+        writer = self.get_files_writer(codebase, output_json_lines, **kwargs)
+        write_files(writer, files)
+
+    def get_files_writer(self, codebase, output_json_lines, **kwargs):
+        return json_lines_writer(codebase, output_json_lines)
+
 
-        codebase.add_files_count_to_current_header()
+def json_lines_writer(codebase, output_file):
+    """
+    Files writer to write the headers and attributes of a ``codebase`` and then
+    each received file mapping as a JSON line to ``output_file``.
+    """
+    codebase.add_files_count_to_current_header()
+    dumps = serializers.output_serializer.dumps
 
-        headers = dict(headers=codebase.get_headers())
+    headers = dict(headers=codebase.get_headers())
 
-        compact_separators = (u',', u':',)
-        output_json_lines.write(
-            json.dumps(headers, separators=compact_separators))
-        output_json_lines.write('\n')
+    output_file.write(dumps(headers))
+    output_file.write('\n')
 
-        for name, value in codebase.attributes.to_dict().items():
-            if value:
-                smry = {name: value}
-                output_json_lines.write(
-                    json.dumps(smry, separators=compact_separators))
-                output_json_lines.write('\n')
+    for name, value in codebase.attributes.to_dict().items():
+        if value:
+            smry = {name: value}
+            output_file.write(dumps(smry))
+            output_file.write('\n')
 
-        for scanned_file in files:
-            scanned_file_line = {'files': [scanned_file]}
-            output_json_lines.write(
-                json.dumps(scanned_file_line, separators=compact_separators))
-            output_json_lines.write('\n')
+    while True:
+        scanned_file = yield
+        if scanned_file is None:
+            break
+        scanned_file_line = {'files': [scanned_file]}
+        output_file.write(dumps(scanned_file_line))
+        output_file.write('\n')
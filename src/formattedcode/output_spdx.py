@@ -10,6 +10,7 @@ import os
 import sys
 import uuid
 from datetime import datetime
+from functools import partial
 from io import BytesIO
 from io import StringIO
 
@@ -37,6 +38,8 @@ from spdx_tools.spdx.model import RelationshipType
 from spdx_tools.spdx.spdx_element_utils import calculate_package_verification_code
 
 from formattedcode import FileOptionType
+from formattedcode import collect_files
+from formattedcode import write_files
 from licensedcode.detection import get_matches_from_detection_mappings
 from plugincode.output import output_impl
 from plugincode.output import OutputPlugin
@@ -82,14 +85,18 @@ class SpdxTvOutput(OutputPlugin):
         return spdx_tv
 
     def process_codebase(self, codebase, spdx_tv, **kwargs):
-        _process_codebase(
-            spdx_plugin=self,
+        files = self.get_files(codebase, **kwargs)
+        writer = self.get_files_writer(codebase, spdx_tv, **kwargs)
+        write_files(writer, files)
+
+    def get_files_writer(self, codebase, spdx_tv, **kwargs):
+        return collect_files(partial(
+            _process_codebase,
             codebase=codebase,
             input_path=kwargs.get('input', ''),
             output_file=spdx_tv,
             as_tagvalue=True,
-            **kwargs
-        )
+        ))
 
 
 @output_impl
@@ -107,26 +114,28 @@ class SpdxRdfOutput(OutputPlugin):
         return spdx_rdf
 
     def process_codebase(self, codebase, spdx_rdf, **kwargs):
-        _process_codebase(
-            spdx_plugin=self,
+        files = self.get_files(codebase, **kwargs)
+        writer = self.get_files_writer(codebase, spdx_rdf, **kwargs)
+        write_files(writer, files)
+
+    def get_files_writer(self, codebase, spdx_rdf, **kwargs):
+        return collect_files(partial(
+            _process_codebase,
             codebase=codebase,
             input_path=kwargs.get('input', ''),
             output_file=spdx_rdf,
             as_tagvalue=False,
-            **kwargs
-        )
+        ))
 
 
 def _process_codebase(
-    spdx_plugin,
+    files,
     codebase,
     input_path,
     output_file,
     as_tagvalue=True,
-    **kwargs,
 ):
     check_sha1(codebase)
-    files = spdx_plugin.get_files(codebase, **kwargs)
     header = codebase.get_or_create_current_header()
     tool_name = header.tool_name
     tool_version = header.tool_version
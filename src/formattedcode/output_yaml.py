@@ -12,6 +12,7 @@ import saneyaml
 from commoncode.cliutils import PluggableCommandLineOption
 from commoncode.cliutils import OUTPUT_GROUP
 from formattedcode import FileOptionType
+from formattedcode import collect_files
 from formattedcode import output_json
 from plugincode.output import output_impl
 from plugincode.output import OutputPlugin
@@ -41,6 +42,15 @@ class YamlOutput(OutputPlugin):
         results = output_json.get_results(codebase, as_list=True, **kwargs)
         write_yaml(results, output_file=output_yaml, pretty=False)
 
+    def get_files_writer(self, codebase, output_yaml, **kwargs):
+        results = output_json.get_results(codebase, **kwargs)
+
+        def write(files):
+            results['files'] = files
+            write_yaml(results, output_file=output_yaml, pretty=False)
+
+        return collect_files(write)
+
 
 def write_yaml(results, output_file, **kwargs):
     """
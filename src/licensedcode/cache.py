@@ -9,10 +9,12 @@
 
 import os
 import pickle
+from hashlib import sha1
 from shutil import rmtree
 
 from commoncode.fileutils import create_dir
 
+from licensedcode import expression_cache
 from scancode_config import licensedcode_cache_dir
 from scancode_config import scancode_cache_dir
 
@@ -21,6 +23,14 @@ An on-disk persistent cache of LicenseIndex and related data structures such as
 the licenses database. The data are pickled and must be regenerated if there
 are any changes in the code or licenses text or rules. Loading and dumping the
 cached pickle is safe to use across multiple processes using lock files.
+
+The large rule-level array-like structures of the LicenseIndex are not pickled:
+they are saved in a side file of flat arrays that is memory-mapped on load. See
+the licensedcode.index_store module for details.
+
+The Rule objects loaded from rule files are also cached with the checksum of
+their rule file. When the index is rebuilt, only the added or changed rule files
+are loaded and parsed again, in parallel, and the other rules are reused.
 """
 
 # This is the Pickle protocol we use, which was added in Python 3.4.
@@ -32,9 +42,15 @@ _LICENSE_CACHE = None
 LICENSE_INDEX_LOCK_TIMEOUT = 60 * 6
 LICENSE_INDEX_DIR = 'license_index'
 LICENSE_INDEX_FILENAME = 'index_cache'
+LICENSE_INDEX_ARRAYS_FILENAME = 'index_arrays'
 LICENSE_LOCKFILE_NAME = 'scancode_license_index_lockfile'
 LICENSE_CHECKSUM_FILE = 'scancode_license_index_tree_checksums'
 
+# number of processes used to load rule files when rebuilding the index with
+# scancode-reindex-licenses. An index built on demand, such as when scanning,
+# uses the number of processes requested by the caller instead.
+LICENSE_INDEX_PROCESSES = os.cpu_count() or 1
+
 
 class LicenseCache:
     """
@@ -50,6 +66,7 @@ class LicenseCache:
         unknown_spdx_symbol=None,
         additional_license_directory=None,
         additional_license_plugins=None,
+        index_arrays_uid=None,
     ):
         # mapping of License objects by key
         self.db = db
@@ -64,6 +81,8 @@ class LicenseCache:
         # Additional licenses from directory and plugins
         self.additional_license_directory = additional_license_directory
         self.additional_license_plugins = additional_license_plugins
+        # unique id of the flat index arrays file saved with this cache
+        self.index_arrays_uid = index_arrays_uid
 
     @staticmethod
     def load_or_build(
@@ -77,6 +96,7 @@ class LicenseCache:
         licenses_data_dir=None,
         rules_data_dir=None,
         additional_directory=None,
+        processes=1,
     ):
         """
         Load or build and save and return a LicenseCache object.
@@ -94,6 +114,8 @@ class LicenseCache:
         - ``additional_directory`` is an optional additional directory
           that contain additional licenses and rules in a /licenses and a /rules
           directories using the same format that we use for licenses and rules.
+        - ``processes`` is the number of processes used to load rule files.
+          Rules loaded from unchanged rule files are reused from a previous build.
         """
         idx_cache_dir = os.path.join(licensedcode_cache_dir, LICENSE_INDEX_DIR)
         if only_builtin:
@@ -161,6 +183,10 @@ class LicenseCache:
                     builtin_license_data_dir=licenses_data_dir,
                 )
 
+                # reuse the rules of unchanged rule files from a previous build
+                rule_files_cache_file = os.path.join(idx_cache_dir, LICENSE_CHECKSUM_FILE)
+                rule_files_cache = RuleFilesCache.load(rule_files_cache_file)
+
                 # create a single merged index containing license data from licenses_data_dir
                 # and data from additional directories
                 index = build_index(
@@ -169,7 +195,10 @@ class LicenseCache:
                     rules_data_dir=rules_data_dir,
                     index_all_languages=index_all_languages,
                     additional_directories=plugin_directories,
+                    processes=processes,
+                    rule_files_cache=rule_files_cache,
                 )
+                rule_files_cache.dump(rule_files_cache_file)
 
                 spdx_symbols = build_spdx_symbols(licenses_db=licenses_db)
                 unknown_spdx_symbol = build_unknown_spdx_symbol(licenses_db=licenses_db)
@@ -186,8 +215,7 @@ class LicenseCache:
                 )
 
                 # save the cache as pickle new tree checksum
-                with open(cache_file, 'wb') as fn:
-                    pickle.dump(license_cache, fn, protocol=PICKLE_PROTOCOL)
+                dump_cache_file(license_cache, cache_file)
 
                 return license_cache
 
@@ -202,12 +230,109 @@ class LicenseCache:
             return True
 
 
+class RuleFilesCache:
+    """
+    A cache of the Rule objects loaded from rule files keyed by rule file
+    location and checksum. Only the added or changed rule files need to be
+    loaded and parsed again when rebuilding the index.
+
+    The cache is saved with a fingerprint of the ScanCode version and of the
+    code that builds Rule objects: the whole cache is discarded on load when
+    this fingerprint has changed.
+    """
+
+    def __init__(self, rules_by_location=None):
+        # mapping of {rule file location: (checksum, pickled Rule)}. Rules are
+        # pickled when cached such that the indexing of a returned rule does not
+        # change the cached rule.
+        self.rules_by_location = rules_by_location or {}
+        # set of rule file locations used by a build: the rules of other rule
+        # files, such as deleted files, are not saved
+        self.used_locations = set()
+
+    @staticmethod
+    def get_checksum(rule_file):
+        """
+        Return a checksum of the content of a ``rule_file``.
+        """
+        with open(rule_file, 'rb') as rf:
+            return sha1(rf.read()).hexdigest()
+
+    @staticmethod
+    def get_fingerprint():
+        """
+        Return a fingerprint of the ScanCode version and of the source code of
+        the licensedcode.models module where Rule objects are defined and loaded.
+        """
+        from licensedcode import models
+        from scancode_config import __version__ as scancode_version
+
+        with open(models.__file__, 'rb') as mf:
+            models_checksum = sha1(mf.read()).hexdigest()
+        return f'{scancode_version}:{models_checksum}'
+
+    def get(self, rule_file, checksum):
+        """
+        Return a Rule cached for ``rule_file`` with ``checksum`` or None.
+        Return None if the cached Rule cannot be loaded.
+        """
+        self.used_locations.add(rule_file)
+        cached = self.rules_by_location.get(rule_file)
+        if cached and cached[0] == checksum:
+            try:
+                return pickle.loads(cached[1])
+            except Exception:
+                return None
+
+    def put(self, rule_file, checksum, rule):
+        """
+        Cache a ``rule`` Rule loaded from ``rule_file`` with ``checksum``.
+        """
+        self.used_locations.add(rule_file)
+        self.rules_by_location[rule_file] = checksum, pickle.dumps(rule, protocol=PICKLE_PROTOCOL)
+
+    @classmethod
+    def load(cls, cache_file):
+        """
+        Return a RuleFilesCache loaded from ``cache_file`` or an empty cache if
+        this file does not exist, cannot be loaded or was saved with a different
+        fingerprint, such as by another ScanCode version.
+        """
+        try:
+            with open(cache_file, 'rb') as cf:
+                fingerprint, rules_by_location = pickle.load(cf)
+        except Exception:
+            return cls()
+
+        if fingerprint != cls.get_fingerprint():
+            return cls()
+        return cls(rules_by_location=rules_by_location)
+
+    def dump(self, cache_file):
+        """
+        Save the rules of the rule files used by a build to ``cache_file``.
+        """
+        rules_by_location = {
+            location: cached
+            for location, cached in self.rules_by_location.items()
+            if location in self.used_locations
+        }
+        with open(cache_file, 'wb') as cf:
+            pickle.dump(
+                (self.get_fingerprint(), rules_by_location),
+                cf,
+                protocol=PICKLE_PROTOCOL,
+            )
+
+
 def build_index(
     licenses_db=None,
     licenses_data_dir=None,
     rules_data_dir=None,
     index_all_languages=False,
     additional_directories=None,
+    processes=1,
+    rule_files_cache=None,
 ):
     """
     Return an index built from rules and licenses directories
@@ -216,6 +341,8 @@ def build_index(
     Otherwise, only include the English license texts and rules (the default)
     If ``additional_directories`` is not None, we will include licenses and rules
     from these additional directories in the returned index.
+    Rule files are loaded using up to ``processes`` processes, reusing the
+    unchanged rules cached in an optional ``rule_files_cache`` RuleFilesCache.
     """
     from licensedcode.index import LicenseIndex
     from licensedcode.models import get_license_dirs
@@ -247,6 +374,8 @@ def build_index(
         licenses_db=licenses_db,
         additional_rules_data_dirs=additional_rule_dirs,
         builtin_rule_data_dir=rules_data_dir,
+        processes=processes,
+        rule_files_cache=rule_files_cache,
     )
 
     legalese = common_license_words
@@ -387,7 +516,8 @@ def get_cache(
     only_builtin=False,
     force=False,
     index_all_languages=False,
-    additional_directory=None
+    additional_directory=None,
+    processes=1,
 ):
     """
     Return a LicenseCache either rebuilt, cached or loaded from disk.
@@ -395,12 +525,14 @@ def get_cache(
     If ``index_all_languages`` is True, include texts in all languages when
     building the license index. Otherwise, only include the English license \
     texts and rules (the default)
+    If the index is built, load rule files using up to ``processes`` processes.
     """
     return populate_cache(
         only_builtin=only_builtin,
         force=force,
         index_all_languages=index_all_languages,
         additional_directory=additional_directory,
+        processes=processes,
     )
 
 
@@ -408,10 +540,12 @@ def populate_cache(
     only_builtin=False,
     force=False,
     index_all_languages=False,
-    additional_directory=None
+    additional_directory=None,
+    processes=1,
 ):
     """
-    Return, load or build and cache a LicenseCache.
+    Return, load or build and cache a LicenseCache. If the index is built,
+    load rule files using up to ``processes`` processes.
     """
     global _LICENSE_CACHE
 
@@ -425,18 +559,63 @@ def populate_cache(
             # used for testing only
             timeout=LICENSE_INDEX_LOCK_TIMEOUT,
             additional_directory=additional_directory,
+            processes=processes,
         )
     return _LICENSE_CACHE
 
 
+def get_index_arrays_file(cache_file):
+    """
+    Return the location of the flat index arrays file that is saved alongside a
+    ``cache_file`` pickled LicenseCache.
+    """
+    return os.path.join(os.path.dirname(cache_file), LICENSE_INDEX_ARRAYS_FILENAME)
+
+
+def dump_cache_file(license_cache, cache_file):
+    """
+    Save a ``license_cache`` LicenseCache to ``cache_file`` as a pickle. The
+    large array-like index structures are saved in a flat arrays side file.
+    """
+    from licensedcode import index_store
+
+    index = license_cache.index
+    arrays_file = get_index_arrays_file(cache_file)
+    # the arrays file is installed before the pickle that references its uid
+    # such that a new pickle is never loaded with the previous arrays file
+    license_cache.index_arrays_uid = uid = index_store.dump(
+        index=index,
+        location=arrays_file,
+    )
+
+    with index_store.detached(index):
+        with index_store.atomic_output(cache_file) as fn:
+            pickle.dump(license_cache, fn, protocol=PICKLE_PROTOCOL)
+
+    # use the memory-mapped arrays from now on such that a freshly built index
+    # shares its memory pages like a loaded index
+    index_store.load(index=index, location=arrays_file, uid=uid)
+
+
 def load_cache_file(cache_file):
     """
     Return a LicenseCache loaded from ``cache_file``.
     """
+    from licensedcode import index_store
+
     with open(cache_file, 'rb') as lfc:
         # Note: weird but read() + loads() is much (twice++???) faster than load()
         try:
-            return pickle.load(lfc)
+            license_cache = pickle.load(lfc)
+            index = license_cache.index
+            # the flat arrays are not pickled and are memory-mapped instead
+            if index.tids_by_rid is None:
+                index_store.load(
+                    index=index,
+                    location=get_index_arrays_file(cache_file),
+                    uid=license_cache.index_arrays_uid,
+                )
+            return license_cache
         except Exception as e:
             msg = (
                 'ERROR: Failed to load license cache (the file may be corrupted ?).\n'
@@ -451,16 +630,19 @@ def get_index(
     only_builtin=False,
     force=False,
     index_all_languages=False,
-    additional_directory=None
+    additional_directory=None,
+    processes=1,
 ):
     """
-    Return and eventually build and cache a LicenseIndex.
+    Return and eventually build and cache a LicenseIndex. If the index is
+    built, load rule files using up to ``processes`` processes.
     """
     return get_cache(
         only_builtin=only_builtin,
         force=force,
         index_all_languages=index_all_languages,
-        additional_directory=additional_directory
+        additional_directory=additional_directory,
+        processes=processes,
     ).index
 
 
@@ -510,6 +692,14 @@ def build_spdx_license_expression(license_expression, licensing=None):
     """
     if not licensing:
         licensing = get_licensing()
+    return expression_cache.memoized(
+        _build_spdx_license_expression,
+        license_expression,
+        licensing,
+    )
+
+
+def _build_spdx_license_expression(license_expression, licensing):
     validate_spdx_license_keys(license_expression=license_expression, licensing=licensing)
     parsed = licensing.parse(license_expression)
     return parsed.render(template='{symbol.wrapped.spdx_license_key}')
@@ -23,6 +23,7 @@ from license_expression import Licensing
 
 from commoncode.resource import clean_path
 from commoncode.text import python_safe_name
+from licensedcode import expression_cache
 from licensedcode.cache import get_index
 from licensedcode.cache import get_cache
 from licensedcode.cache import build_spdx_license_expression
@@ -462,7 +463,7 @@ class LicenseDetection:
 
         elif override_license:
             # Use the match expression
-            license_expression = licensing.parse(match.license_expression)
+            license_expression = expression_cache.parse(match.license_expression, licensing)
             self.license_expression = str(license_expression)
 
     def percentage_license_text_of_file(self, qspans):
@@ -1431,10 +1432,10 @@ def use_referenced_license_expression(referenced_license_expression, license_det
         return True
 
     license_keys = set(
-        licensing.license_keys(expression=license_detection.license_expression)
+        expression_cache.license_keys(license_detection.license_expression, licensing)
     )
     referenced_license_keys = set(
-        licensing.license_keys(expression=referenced_license_expression)
+        expression_cache.license_keys(referenced_license_expression, licensing)
     )
     same_expression = referenced_license_expression == license_detection.license_expression
     same_license_keys = license_keys == referenced_license_keys
@@ -1661,10 +1662,7 @@ def get_license_keys_from_detections(license_detections, licensing=Licensing()):
     matches = get_matches_from_detection_mappings(license_detections)
     for match in matches:
         license_keys.update(
-            licensing.license_keys(
-                expression=match.get('license_expression'),
-                unique=True
-            )
+            expression_cache.license_keys(match.get('license_expression'), licensing)
         )
     return list(license_keys)
 
@@ -1883,7 +1881,7 @@ def process_detections(detections, licensing=Licensing()):
         for detection in detections:
             if detection.license_expression != None:
                 detected_license_keys.update(
-                    licensing.license_keys(expression=detection.license_expression)
+                    expression_cache.license_keys(detection.license_expression, licensing)
                 )
 
         for detection in detections:
@@ -1900,7 +1898,7 @@ def process_detections(detections, licensing=Licensing()):
                     unique=True,
                     licensing=licensing,
                 ))
-                license_keys = licensing.license_keys(expression=license_expression)
+                license_keys = expression_cache.license_keys(license_expression, licensing)
 
                 if all(
                     key in detected_license_keys
@@ -0,0 +1,136 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+from collections import Counter
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+
+"""
+Bounded least recently used caches of the results of operations on license
+expression strings such as parsing, simplification, license keys and SPDX
+rendering.
+
+The same license expressions are parsed over and over for each file, license
+detection and match of a scan, while a large scan has only a few hundred
+distinct expressions. There is one cache for each license_expression.Licensing
+object as the results depend on its known license symbols. A cache is discarded
+with its Licensing.
+
+Only operations on expression strings are cached: expression objects are
+processed without caching. Cached results are shared and must not be modified.
+"""
+
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class LicenseExpressionCache:
+    """
+    A least recently used cache of up to ``max_entries`` results of operations
+    on license expression strings.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        # mapping of {(operation, expression): result}
+        self.results = OrderedDict()
+        # mappings of {operation name: count}
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def get(self, operation, expression, licensing):
+        """
+        Return the cached result of calling ``operation(expression,
+        licensing)`` computing and caching this result if needed.
+        """
+        key = operation, expression
+        results = self.results
+        if key in results:
+            results.move_to_end(key)
+            self.hits[operation.__name__] += 1
+            return results[key]
+
+        self.misses[operation.__name__] += 1
+        result = operation(expression, licensing)
+        results[key] = result
+        if len(results) > self.max_entries:
+            results.popitem(last=False)
+        return result
+
+
+# mapping of {Licensing: LicenseExpressionCache}
+_caches_by_licensing = WeakKeyDictionary()
+
+
+def get_expression_cache(licensing):
+    """
+    Return the LicenseExpressionCache of a ``licensing`` Licensing.
+    """
+    cache = _caches_by_licensing.get(licensing)
+    if cache is None:
+        cache = _caches_by_licensing[licensing] = LicenseExpressionCache()
+    return cache
+
+
+def memoized(operation, expression, licensing):
+    """
+    Return the result of calling ``operation(expression, licensing)`` cached
+    if ``expression`` is a string.
+    """
+    if not isinstance(expression, str):
+        return operation(expression, licensing)
+    return get_expression_cache(licensing).get(operation, expression, licensing)
+
+
+def _parse(expression, licensing):
+    return licensing.parse(expression)
+
+
+def _simplify(expression, licensing):
+    parsed = licensing.parse(expression)
+    if parsed is not None:
+        return parsed.simplify()
+
+
+def _license_keys(expression, licensing):
+    return tuple(licensing.license_keys(expression, unique=True))
+
+
+def parse(expression, licensing):
+    """
+    Return a LicenseExpression parsed from an ``expression`` with
+    ``licensing``.
+    """
+    return memoized(_parse, expression, licensing)
+
+
+def simplify(expression, licensing):
+    """
+    Return a simplified LicenseExpression parsed from an ``expression`` with
+    ``licensing``.
+    """
+    return memoized(_simplify, expression, licensing)
+
+
+def license_keys(expression, licensing):
+    """
+    Return a new list of unique license keys of an ``expression`` with
+    ``licensing``.
+    """
+    return list(memoized(_license_keys, expression, licensing))
+
+
+def get_stats():
+    """
+    Return a tuple of (hits, misses) counts of all the caches.
+    """
+    hits = misses = 0
+    for cache in list(_caches_by_licensing.values()):
+        hits += sum(cache.hits.values())
+        misses += sum(cache.misses.values())
+    return hits, misses
@@ -22,12 +22,16 @@ from intbitset import intbitset
 from licensedcode import SMALL_RULE
 from licensedcode import TINY_RULE
 from licensedcode.legalese import common_license_words
+from licensedcode.models import get_rule_order_key
 from licensedcode import match
 from licensedcode import match_aho
+from licensedcode.match_cache import get_query_run_key
+from licensedcode.match_cache import QueryRunMatchesCache
 from licensedcode import match_hash
 from licensedcode import match_seq
 from licensedcode import match_set
 from licensedcode import match_spdx_lid
+from licensedcode.match_timings import get_timer
 from licensedcode import match_unknown
 from licensedcode.dmp import match_blocks as match_blocks_dmp
 from licensedcode.seq import match_blocks as match_blocks_seq
@@ -139,6 +143,7 @@ class LicenseIndex(object):
 
         'sets_by_rid',
         'msets_by_rid',
+        'high_rids_by_tid',
 
         'rid_by_hash',
         'rules_automaton',
@@ -152,6 +157,8 @@ class LicenseIndex(object):
 
         'optimized',
         'all_languages',
+
+        'query_run_matches_cache',
     )
 
     def __init__(
@@ -209,9 +216,18 @@ class LicenseIndex(object):
         self.sets_by_rid = []
         self.msets_by_rid = []
 
+        # mapping-like of high token id -> sorted array of the rule ids of
+        # approximately matchable rules whose token ids set contains this high
+        # token id. This is the inverted index of the high sets_by_rid.
+        self.high_rids_by_tid = []
+
         # mapping of hash -> single rid for hash match: duplicated rules are not allowed
         self.rid_by_hash = {}
 
+        # LRU cache of the approximate matches of query runs reused across
+        # queries with the same query runs
+        self.query_run_matches_cache = QueryRunMatchesCache()
+
         # Aho-Corasick automatons for regular rules and experimental fragments
         self.rules_automaton = match_aho.get_automaton()
         self.fragments_automaton = USE_AHO_FRAGMENTS and match_aho.get_automaton()
@@ -315,7 +331,7 @@ class LicenseIndex(object):
                 logger_debug('rules_by_rid:', _rid, _rule)
 
         # ensure that rules are sorted
-        rules_by_rid.sort()
+        rules_by_rid.sort(key=get_rule_order_key)
         len_rules = len(rules_by_rid)
 
         # create index data structures
@@ -552,6 +568,15 @@ class LicenseIndex(object):
         self.digit_only_tids = intbitset([
             i for i, s in enumerate(self.tokens_by_tid) if s.isdigit()])
 
+        # Create the inverted index of high tid -> rids used for approximate
+        # matching
+        ########################################################################
+        self.high_rids_by_tid = match_set.build_high_rids_by_tid(
+            sets_by_rid=sets_by_rid,
+            rids=self.approx_matchable_rids,
+            len_legalese=len_legalese,
+        )
+
         # Finalize automatons
         ########################################################################
         self.rules_automaton.make_automaton()
@@ -668,7 +693,7 @@ class LicenseIndex(object):
 
         return matches
 
-    def get_exact_matches(self, query, deadline=sys.maxsize, **kwargs):
+    def get_exact_matches(self, query, deadline=sys.maxsize, timings=None, **kwargs):
         """
         Exact matching strategy using an automaton for multimatching many rules
         at once.
@@ -687,6 +712,7 @@ class LicenseIndex(object):
             query=query,
             filter_false_positive=False,
             merge=False,
+            timings=timings,
         )
         return matches
 
@@ -716,11 +742,12 @@ class LicenseIndex(object):
         return matches
 
     def get_approximate_matches(self, query, matched_qspans, existing_matches,
-                                deadline=sys.maxsize, **kwargs):
+                                deadline=sys.maxsize, timings=None, **kwargs):
         """
         Approximate matching strategy breaking a query in query_runs and using
         multiple local alignments (aka. diff). Return a list of matches.
         """
+        timed = get_timer(timings)
         matches = []
         matchable_rids = self.approx_matchable_rids
 
@@ -730,14 +757,15 @@ class LicenseIndex(object):
 
         # first check if the whole file may be close, near-dupe match
         whole_query_run = query.whole_query_run()
-        near_dupe_candidates = match_set.compute_candidates(
-            query_run=whole_query_run,
-            idx=self,
-            matchable_rids=matchable_rids,
-            top=MAX_NEAR_DUPE_CANDIDATES,
-            high_resemblance=True,
-            _use_bigrams=USE_BIGRAM_MULTISETS,
-        )
+        with timed('candidates'):
+            near_dupe_candidates = match_set.compute_candidates(
+                query_run=whole_query_run,
+                idx=self,
+                matchable_rids=matchable_rids,
+                top=MAX_NEAR_DUPE_CANDIDATES,
+                high_resemblance=True,
+                _use_bigrams=USE_BIGRAM_MULTISETS,
+            )
 
         # if near duplicates, we only match the whole file at once against these
         # candidates
@@ -772,16 +800,30 @@ class LicenseIndex(object):
             logger_debug('get_approximate_matches: len(query.query_runs):', len(query.query_runs))
 
         MAX_CANDIDATES = 70
+        matches_cache = self.query_run_matches_cache
         for query_run in query.query_runs:
+            # we cannot do a sequence match in query run without some high token left
+            if not query_run.is_matchable(include_low=False, qspans=matched_qspans):
+                continue
+
+            # reuse the matches of an identical query run if any
+            cache_key = get_query_run_key(query_run)
+            if cache_key:
+                cached = matches_cache.get(cache_key, query_run)
+                if cached is not None:
+                    matches.extend(cached)
+                    continue
+
             # inverted index match and ranking, query run-level
-            candidates = match_set.compute_candidates(
-                query_run=query_run,
-                idx=self,
-                matchable_rids=matchable_rids,
-                top=MAX_CANDIDATES,
-                high_resemblance=False,
-                _use_bigrams=USE_BIGRAM_MULTISETS,
-            )
+            with timed('candidates'):
+                candidates = match_set.compute_candidates(
+                    query_run=query_run,
+                    idx=self,
+                    matchable_rids=matchable_rids,
+                    top=MAX_CANDIDATES,
+                    high_resemblance=False,
+                    _use_bigrams=USE_BIGRAM_MULTISETS,
+                )
 
             if TRACE_APPROX_CANDIDATES:
                 logger_debug('get_query_run_approximate_matches: candidates:')
@@ -797,6 +839,10 @@ class LicenseIndex(object):
             if time() > deadline:
                 break
 
+            # only complete results are cached
+            if cache_key:
+                matches_cache.put(cache_key, query_run, matched)
+
         return matches
 
     def get_query_run_approximate_matches(
@@ -893,6 +939,7 @@ class LicenseIndex(object):
         approximate=True,
         unknown_licenses=False,
         deadline=sys.maxsize,
+        timings=None,
         _skip_hash_match=False,
         **kwargs,
     ):
@@ -918,6 +965,9 @@ class LicenseIndex(object):
         ``deadline`` is a time.time() value in seconds by which the processing
         should stop and return whatever was matched so far.
 
+        If ``timings`` is a MatchTimings, collect in it the execution time and
+        number of calls of each matching stage.
+
         ``_skip_hash_match`` is used only for testing.
         """
         assert 0 <= min_score <= 100
@@ -925,13 +975,14 @@ class LicenseIndex(object):
         if not location and not query_string:
             return []
 
-        qry = query.build_query(
-            location=location,
-            query_string=query_string,
-            idx=self,
-            text_line_threshold=15,
-            bin_line_threshold=50,
-        )
+        with get_timer(timings)('query'):
+            qry = query.build_query(
+                location=location,
+                query_string=query_string,
+                idx=self,
+                text_line_threshold=15,
+                bin_line_threshold=50,
+            )
 
         if TRACE:
             logger_debug('Index.match: for:', location, 'query:', qry)
@@ -947,6 +998,7 @@ class LicenseIndex(object):
             approximate=approximate,
             unknown_licenses=unknown_licenses,
             deadline=deadline,
+            timings=timings,
             _skip_hash_match=_skip_hash_match,
             **kwargs,
         )
@@ -960,6 +1012,7 @@ class LicenseIndex(object):
         approximate=True,
         unknown_licenses=False,
         deadline=sys.maxsize,
+        timings=None,
         _skip_hash_match=False,
         **kwargs,
     ):
@@ -967,13 +1020,15 @@ class LicenseIndex(object):
         Return a sequence of LicenseMatch by matching the ``qry`` Query against
         this index. See Index.match() for arguments documentation.
         """
+        timed = get_timer(timings)
 
         whole_query_run = qry.whole_query_run()
         if not whole_query_run or not whole_query_run.matchables:
             return []
 
         if not _skip_hash_match:
-            matches = match_hash.hash_match(self, whole_query_run)
+            with timed('hash'):
+                matches = match_hash.hash_match(self, whole_query_run)
             if matches:
                 match.set_matched_lines(matches, qry.line_by_pos)
                 return matches
@@ -984,7 +1039,8 @@ class LicenseIndex(object):
         )
 
         if as_expression:
-            matches = get_spdx_id_matches(qry, from_spdx_id_lines=False)
+            with timed('spdx_lid'):
+                matches = get_spdx_id_matches(qry, from_spdx_id_lines=False)
             match.set_matched_lines(matches, qry.line_by_pos)
             return matches
 
@@ -1010,12 +1066,14 @@ class LicenseIndex(object):
                 logger_debug()
                 logger_debug('match_query: matching with matcher:', matcher_name)
 
-            matched = matcher(
-                qry,
-                matched_qspans=already_matched_qspans,
-                existing_matches=matches,
-                deadline=deadline,
-            )
+            with timed(matcher_name):
+                matched = matcher(
+                    qry,
+                    matched_qspans=already_matched_qspans,
+                    existing_matches=matches,
+                    deadline=deadline,
+                    timings=timings,
+                )
 
             if TRACE:
                 self.debug_matches(
@@ -1063,6 +1121,7 @@ class LicenseIndex(object):
             min_score=min_score,
             filter_false_positive=False,
             merge=True,
+            timings=timings,
         )
 
         if unknown_licenses:
@@ -1085,11 +1144,12 @@ class LicenseIndex(object):
                     end=unspan.end,
                 )
 
-                unknown_match = match_unknown.match_unknowns(
-                    idx=self,
-                    query_run=unquery_run,
-                    automaton=self.unknown_automaton,
-                )
+                with timed('unknown'):
+                    unknown_match = match_unknown.match_unknowns(
+                        idx=self,
+                        query_run=unquery_run,
+                        automaton=self.unknown_automaton,
+                    )
 
                 if unknown_match:
                     unknown_matches.append(unknown_match)
@@ -1120,6 +1180,7 @@ class LicenseIndex(object):
             min_score=min_score,
             filter_false_positive=True,
             merge=True,
+            timings=timings,
         )
 
         matches.sort()
@@ -1156,6 +1217,7 @@ class LicenseIndex(object):
 
             'sets_by_rid',
             'msets_by_rid',
+            'high_rids_by_tid',
 
             'regular_rids',
             'approx_matchable_rids',
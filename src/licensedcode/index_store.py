@@ -0,0 +1,409 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import json
+import mmap
+import os
+import sys
+import tempfile
+import uuid
+from abc import abstractmethod
+from array import array
+from collections import defaultdict
+from collections.abc import Sequence
+from contextlib import contextmanager
+
+from intbitset import intbitset
+
+"""
+Flat, memory-mappable on-disk storage for the large array-like structures of a
+LicenseIndex.
+
+Unpickling a LicenseIndex rebuilds millions of small Python objects (arrays,
+dicts and intbitsets) for the rule-level token ids, high token postings, sets
+and multisets and for the high token-level inverted index of rule ids. Instead
+we store these as a few flat arrays of integers in a single file that is
+memory-mapped read-only when loaded. Each rule-level structure is then a
+lightweight view over this buffer that is created on access.
+
+Because the file is mapped read-only, its pages are loaded on demand and are
+shared by all the processes that use the same index, such as scan workers.
+
+The file layout is:
+
+- an 8 bytes MAGIC marker,
+- an 8 bytes little endian length of the JSON header that follows,
+- a JSON header with a unique id, the number of rules, the byte order and a
+  mapping of {section name: [array typecode, offset, number of items]},
+- the sections data: each section is a flat array aligned on 8 bytes.
+"""
+
+MAGIC = b'SCLIDXA1'
+
+ALIGNMENT = 8
+
+# these LicenseIndex attributes are stored in flat arrays rather than pickled
+FLAT_ATTRIBUTES = (
+    'tids_by_rid',
+    'high_postings_by_rid',
+    'sets_by_rid',
+    'msets_by_rid',
+    'high_rids_by_tid',
+)
+
+
+class IndexStoreError(Exception):
+    pass
+
+
+def build_sections(index):
+    """
+    Return a mapping of {section name: array} built from the rule-level
+    structures of a LicenseIndex ``index``.
+    """
+    len_rules = len(index.rules_by_rid)
+
+    sections = {}
+
+    # rid -> sequence of token ids
+    tids_offsets = array('q', [0])
+    tids = array('h')
+    for rule_tids in index.tids_by_rid:
+        tids.extend(rule_tids)
+        tids_offsets.append(len(tids))
+    sections['tids_offsets'] = tids_offsets
+    sections['tids'] = tids
+
+    # rid -> {high token id: positions} or None
+    postings_present = array('b')
+    postings_offsets = array('q', [0])
+    postings_tids = array('h')
+    positions_offsets = array('q', [0])
+    positions = array('h')
+    for rule_postings in index.high_postings_by_rid:
+        postings_present.append(rule_postings is not None)
+        if rule_postings:
+            for tid in sorted(rule_postings):
+                postings_tids.append(tid)
+                positions.extend(rule_postings[tid])
+                positions_offsets.append(len(positions))
+        postings_offsets.append(len(postings_tids))
+    sections['postings_present'] = postings_present
+    sections['postings_offsets'] = postings_offsets
+    sections['postings_tids'] = postings_tids
+    sections['positions_offsets'] = positions_offsets
+    sections['positions'] = positions
+
+    # rid -> intbitset of token ids or None
+    sets_present = array('b')
+    sets_offsets = array('q', [0])
+    sets_tids = array('h')
+    for tids_set in index.sets_by_rid:
+        sets_present.append(tids_set is not None)
+        if tids_set:
+            sets_tids.extend(tids_set)
+        sets_offsets.append(len(sets_tids))
+    sections['sets_present'] = sets_present
+    sections['sets_offsets'] = sets_offsets
+    sections['sets_tids'] = sets_tids
+
+    # rid -> {token id: count} or None
+    msets_present = array('b')
+    msets_offsets = array('q', [0])
+    msets_tids = array('h')
+    msets_counts = array('i')
+    for mset in index.msets_by_rid:
+        msets_present.append(mset is not None)
+        if mset:
+            for tid in sorted(mset):
+                msets_tids.append(tid)
+                msets_counts.append(mset[tid])
+        msets_offsets.append(len(msets_tids))
+    sections['msets_present'] = msets_present
+    sections['msets_offsets'] = msets_offsets
+    sections['msets_tids'] = msets_tids
+    sections['msets_counts'] = msets_counts
+
+    # high tid -> sequence of rule ids
+    rids_offsets = array('q', [0])
+    rids = array('i')
+    for tid_rids in index.high_rids_by_tid:
+        rids.extend(tid_rids)
+        rids_offsets.append(len(rids))
+    sections['rids_offsets'] = rids_offsets
+    sections['rids'] = rids
+
+    for name, values in sections.items():
+        if name.endswith('_present'):
+            assert len(values) == len_rules, f'Inconsistent {name} length'
+
+    return sections
+
+
+def dump(index, location):
+    """
+    Write the flat array sections of a LicenseIndex ``index`` to the file at
+    ``location``. Return a unique id string for this file. An existing file is
+    atomically replaced and never modified in place.
+    """
+    if any(isinstance(k, tuple) for mset in index.msets_by_rid if mset for k in mset):
+        raise IndexStoreError('Bigram multisets cannot be stored in flat arrays.')
+
+    uid = uuid.uuid4().hex
+    sections = build_sections(index)
+
+    layout = {}
+    offset = 0
+    for name, values in sections.items():
+        layout[name] = [values.typecode, offset, len(values)]
+        offset += _aligned(len(values) * values.itemsize)
+
+    header = dict(
+        uid=uid,
+        len_rules=len(index.rules_by_rid),
+        byteorder=sys.byteorder,
+        sections=layout,
+    )
+    header = json.dumps(header).encode('utf-8')
+    header += b' ' * (_aligned(len(header)) - len(header))
+
+    with atomic_output(location) as out:
+        out.write(MAGIC)
+        out.write(len(header).to_bytes(8, 'little'))
+        out.write(header)
+        for values in sections.values():
+            data = values.tobytes()
+            out.write(data)
+            out.write(b'\x00' * (_aligned(len(data)) - len(data)))
+
+    return uid
+
+
+@contextmanager
+def atomic_output(location):
+    """
+    Context manager yielding a binary file opened for writing that replaces
+    the file at ``location`` only once completely written.
+
+    The file at ``location`` may be memory-mapped by other processes: it is
+    never truncated nor modified in place. Instead a temporary file is written
+    in the same directory and atomically renamed over ``location``. Processes
+    that mapped the previous file keep using its unchanged content.
+    """
+    dir_name, file_name = os.path.split(location)
+    fd, temp_location = tempfile.mkstemp(
+        prefix=f'{file_name}-',
+        suffix='.tmp',
+        dir=dir_name or None,
+    )
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            yield out
+        os.replace(temp_location, location)
+    except BaseException:
+        if os.path.exists(temp_location):
+            os.remove(temp_location)
+        raise
+
+
+def _aligned(size):
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class IndexArrays:
+    """
+    A read-only memory-mapped file of flat index arrays.
+    """
+
+    def __init__(self, location):
+        self.location = location
+        with open(location, 'rb') as inp:
+            self.mmap = mmap.mmap(inp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        buf = memoryview(self.mmap)
+        if bytes(buf[:8]) != MAGIC:
+            raise IndexStoreError(f'Invalid license index arrays file: {location!r}')
+
+        header_len = int.from_bytes(buf[8:16], 'little')
+        data_start = 16 + header_len
+        header = json.loads(bytes(buf[16:data_start]).decode('utf-8'))
+
+        if header['byteorder'] != sys.byteorder:
+            raise IndexStoreError(f'Incompatible byte order for: {location!r}')
+
+        self.uid = header['uid']
+        self.len_rules = header['len_rules']
+
+        self.sections = {}
+        for name, (typecode, offset, length) in header['sections'].items():
+            start = data_start + offset
+            end = start + length * array(typecode).itemsize
+            self.sections[name] = buf[start:end].cast(typecode)
+
+    def __getitem__(self, name):
+        return self.sections[name]
+
+    def __reduce__(self):
+        return IndexArrays, (self.location,)
+
+
+class FlatSequence(Sequence):
+    """
+    Base class for a mapping-like sequence of rid -> rule-level data (or tid ->
+    token-level data) backed by the ``name`` sections of an IndexArrays.
+    """
+    name = None
+
+    def __init__(self, store):
+        self.store = store
+        self.offsets = store[self.name + '_offsets']
+        self.present = store.sections.get(self.name + '_present')
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, rid):
+        if rid < 0:
+            rid += len(self)
+        if self.present is not None and not self.present[rid]:
+            return None
+        return self.get(self.offsets[rid], self.offsets[rid + 1])
+
+    @abstractmethod
+    def get(self, start, end):
+        """
+        Return the data stored between the ``start`` and ``end`` offsets.
+        """
+
+    def __reduce__(self):
+        return self.__class__, (self.store,)
+
+
+class TokenIdsByRid(FlatSequence):
+    """
+    Sequence of rid -> read-only array-like of token ids.
+    """
+    name = 'tids'
+
+    def __init__(self, store):
+        super().__init__(store)
+        self.tids = store['tids']
+
+    def get(self, start, end):
+        return self.tids[start:end]
+
+
+class HighPostingsByRid(FlatSequence):
+    """
+    Sequence of rid -> mapping of {high token id: array-like of positions}.
+    """
+    name = 'postings'
+
+    def __init__(self, store):
+        super().__init__(store)
+        self.tids = store['postings_tids']
+        self.positions_offsets = store['positions_offsets']
+        self.positions = store['positions']
+
+    def get(self, start, end):
+        tids = self.tids
+        positions = self.positions
+        positions_offsets = self.positions_offsets
+        return {
+            tids[i]: positions[positions_offsets[i]:positions_offsets[i + 1]]
+            for i in range(start, end)
+        }
+
+
+class SetsByRid(FlatSequence):
+    """
+    Sequence of rid -> intbitset of token ids. The intbitsets are built on
+    first access and kept in memory.
+    """
+    name = 'sets'
+
+    def __init__(self, store):
+        super().__init__(store)
+        self.tids = store['sets_tids']
+        self._sets = [None] * len(self)
+
+    def __getitem__(self, rid):
+        tids_set = self._sets[rid]
+        if tids_set is None:
+            tids_set = self._sets[rid] = super().__getitem__(rid)
+        return tids_set
+
+    def get(self, start, end):
+        return intbitset(self.tids[start:end].tolist())
+
+
+class MultisetsByRid(FlatSequence):
+    """
+    Sequence of rid -> multiset mapping of {token id: count}.
+    """
+    name = 'msets'
+
+    def __init__(self, store):
+        super().__init__(store)
+        self.tids = store['msets_tids']
+        self.counts = store['msets_counts']
+
+    def get(self, start, end):
+        return defaultdict(int, zip(self.tids[start:end], self.counts[start:end]))
+
+
+class RidsByTid(FlatSequence):
+    """
+    Sequence of high token id -> read-only array-like of rule ids.
+    """
+    name = 'rids'
+
+    def __init__(self, store):
+        super().__init__(store)
+        self.rids = store['rids']
+
+    def get(self, start, end):
+        return self.rids[start:end]
+
+
+def load(index, location, uid=None):
+    """
+    Attach the flat arrays from the file at ``location`` to a LicenseIndex
+    ``index``. Raise an IndexStoreError if the file does not match the index
+    or the optional ``uid`` unique id.
+    """
+    store = IndexArrays(location)
+    if uid and store.uid != uid:
+        raise IndexStoreError(f'License index arrays file is stale: {location!r}')
+
+    if store.len_rules != len(index.rules_by_rid):
+        raise IndexStoreError(f'Inconsistent license index arrays file: {location!r}')
+
+    index.tids_by_rid = TokenIdsByRid(store)
+    index.high_postings_by_rid = HighPostingsByRid(store)
+    index.sets_by_rid = SetsByRid(store)
+    index.msets_by_rid = MultisetsByRid(store)
+    index.high_rids_by_tid = RidsByTid(store)
+    return index
+
+
+@contextmanager
+def detached(index):
+    """
+    Context manager to temporarily remove the flat array attributes from a
+    LicenseIndex ``index`` such that it can be pickled without these.
+    """
+    saved = {name: getattr(index, name) for name in FLAT_ATTRIBUTES}
+    try:
+        for name in FLAT_ATTRIBUTES:
+            setattr(index, name, None)
+        yield index
+    finally:
+        for name, value in saved.items():
+            setattr(index, name, value)
@@ -17,6 +17,7 @@ from attr import validators
 from licensedcode import MAX_DIST
 from licensedcode import SMALL_RULE
 from licensedcode import query
+from licensedcode.match_timings import get_timer
 from licensedcode.spans import Span
 from licensedcode.stopwords import STOPWORDS
 from licensedcode.tokenize import index_tokenizer
@@ -738,8 +739,6 @@ class LicenseMatch(object):
         if itokens:
             return index_hash(itokens)
 
-    # FIXME: this should be done for all the matches found in a given scanned
-    # location at once to avoid reprocessing many times the original text
     def matched_text(
         self,
         whole_lines=False,
@@ -773,6 +772,7 @@ class LicenseMatch(object):
             location=query.location,
             query_string=query.query_string,
             idx=query.idx,
+            query=query,
             whole_lines=whole_lines,
             highlight=highlight,
             highlight_matched=highlight_matched,
@@ -1058,6 +1058,103 @@ def merge_matches(matches, max_dist=None, trace=TRACE_MERGE):
 # does not make sense
 
 
+def get_match_intervals(matches):
+    """
+    Return a list of (qstart, qend, qlen, hilen, match) interval tuples given a
+    ``matches`` list of LicenseMatch, sorted on start, longer high, longer
+    match and matcher type.
+
+    The filters sweep over these intervals from left to right: the query start,
+    end and lengths of each match are computed only once and we can compare
+    most matches with these bounds alone without Span set operations.
+    """
+    intervals = []
+    intervals_append = intervals.append
+    for match in matches:
+        qspan = match.qspan
+        intervals_append((qspan.start, qspan.end, len(qspan), match.hilen(), match))
+    # NOTE: the sort is stable such that the order of ties is the original order
+    intervals.sort(key=lambda i: (i[0], -i[3], -i[2], i[4].matcher_order))
+    return intervals
+
+
+def interval_overlap(current, other):
+    """
+    Return the number of overlapping query positions between the matches of a
+    ``current`` and ``other`` tuple of (qstart, qend, qlen, hilen, match).
+
+    For example:
+    >>> from licensedcode.spans import Span
+    >>> class M:
+    ...     def __init__(self, qspan):
+    ...         self.qspan = qspan
+    >>> def iv(qspan):
+    ...     return qspan.start, qspan.end, len(qspan), 0, M(qspan)
+    >>> interval_overlap(iv(Span(1, 5)), iv(Span(4, 10)))
+    2
+    >>> interval_overlap(iv(Span(1, 5)), iv(Span(6, 10)))
+    0
+    >>> interval_overlap(iv(Span([1, 2, 8, 9])), iv(Span(4, 7)))
+    0
+    >>> interval_overlap(iv(Span([1, 2, 8, 9])), iv(Span(2, 8)))
+    2
+    """
+    cstart, cend, clen, _, cmatch = current
+    ostart, oend, olen, _, omatch = other
+    if ostart > cend or cstart > oend:
+        return 0
+    if clen == cend - cstart + 1 and olen == oend - ostart + 1:
+        # both spans are contiguous: this is the overlap of two intervals
+        return min(cend, oend) - max(cstart, ostart) + 1
+    return cmatch.qspan.overlap(omatch.qspan)
+
+
+def interval_contains(current, other):
+    """
+    Return True if the query span of the match of a ``current`` tuple of
+    (qstart, qend, qlen, hilen, match) contains the query span of the match of
+    an ``other`` tuple.
+
+    For example:
+    >>> from licensedcode.spans import Span
+    >>> class M:
+    ...     def __init__(self, qspan):
+    ...         self.qspan = qspan
+    >>> def iv(qspan):
+    ...     return qspan.start, qspan.end, len(qspan), 0, M(qspan)
+    >>> interval_contains(iv(Span(1, 5)), iv(Span(2, 5)))
+    True
+    >>> interval_contains(iv(Span(2, 5)), iv(Span(1, 5)))
+    False
+    >>> interval_contains(iv(Span([1, 2, 4, 5])), iv(Span(2, 4)))
+    False
+    >>> interval_contains(iv(Span([1, 2, 4, 5])), iv(Span([2, 4])))
+    True
+    """
+    cstart, cend, clen, _, cmatch = current
+    ostart, oend, olen, _, omatch = other
+    if ostart < cstart or oend > cend or olen > clen:
+        return False
+    if clen == cend - cstart + 1:
+        # a contiguous span contains every span within its bounds
+        return True
+    return omatch.qspan in cmatch.qspan
+
+
+def interval_equals(current, other):
+    """
+    Return True if the matches of a ``current`` and ``other`` tuple of
+    (qstart, qend, qlen, hilen, match) have the same query span.
+    """
+    cstart, cend, clen, _, cmatch = current
+    ostart, oend, olen, _, omatch = other
+    if cstart != ostart or cend != oend or clen != olen:
+        return False
+    if clen == cend - cstart + 1:
+        return True
+    return cmatch.qspan == omatch.qspan
+
+
 def filter_contained_matches(
     matches,
     trace=TRACE_FILTER_CONTAINED,
@@ -1080,26 +1177,28 @@ def filter_contained_matches(
     discarded = []
     discarded_append = discarded.append
 
-    # NOTE: we do not filter matches in place: sorted creates a copy
+    # NOTE: we do not filter matches in place: this is a new sorted list of
+    # (qstart, qend, qlen, hilen, match) intervals
     # sort on start, longer high, longer match, matcher type
-    sorter = lambda m: (m.qspan.start, -m.hilen(), -m.len(), m.matcher_order)
-    matches = sorted(matches, key=sorter)
-    matches_pop = matches.pop
+    intervals = get_match_intervals(matches)
+    intervals_pop = intervals.pop
 
     if trace:
-        print('filter_contained_matches: number of matches to process:', len(matches))
+        print('filter_contained_matches: number of matches to process:', len(intervals))
         print('filter_contained_matches: initial matches')
-        for m in matches:
-            print(m)
+        for interval in intervals:
+            print(interval[-1])
 
     # compare two matches in the sorted sequence: current and next match we
     # progressively compare a pair and remove next or current
     i = 0
-    while i < len(matches) - 1:
+    while i < len(intervals) - 1:
         j = i + 1
-        while j < len(matches):
-            current_match = matches[i]
-            next_match = matches[j]
+        while j < len(intervals):
+            current_interval = intervals[i]
+            next_interval = intervals[j]
+            current_match = current_interval[-1]
+            next_match = next_interval[-1]
             if trace:
                 logger_debug('---> filter_contained_matches: current: i=', i, current_match)
                 logger_debug('---> filter_contained_matches: next:    j=', j, next_match)
@@ -1109,7 +1208,7 @@ def filter_contained_matches(
             # is possible. Based on sorting order if no overlap is possible,
             # then no future overlap will be possible with the current match.
             # Note that touching and overlapping matches have a zero distance.
-            if next_match.qend > current_match.qend:
+            if next_interval[1] > current_interval[1]:
                 if trace:
                     logger_debug(
                         '    ---> ###filter_contained_matches: matches have a distance: '
@@ -1120,44 +1219,44 @@ def filter_contained_matches(
                 break
 
             # equals matched spans
-            if current_match.qspan == next_match.qspan:
+            if interval_equals(current_interval, next_interval):
                 if current_match.coverage() >= next_match.coverage():
                     if trace:
                         logger_debug(
                             '    ---> ###filter_contained_matches: '
                             'next EQUALS current, '
-                            'removed next with lower or equal coverage', matches[j])
+                            'removed next with lower or equal coverage', next_match)
 
-                    discarded_append(matches_pop(j))
+                    discarded_append(intervals_pop(j)[-1])
                     continue
                 else:
                     if trace:
                         logger_debug(
                             '    ---> ###filter_contained_matches: '
                             'next EQUALS current, '
-                            'removed current with lower coverage', matches[i])
-                    discarded_append(matches_pop(i))
+                            'removed current with lower coverage', current_match)
+                    discarded_append(intervals_pop(i)[-1])
                     i -= 1
                     break
 
             # remove contained matched spans
-            if current_match.qcontains(next_match):
+            if interval_contains(current_interval, next_interval):
                 if trace:
                     logger_debug(
                         '    ---> ###filter_contained_matches: '
                         'next CONTAINED in current, '
-                        'removed next', matches[j])
-                discarded_append(matches_pop(j))
+                        'removed next', next_match)
+                discarded_append(intervals_pop(j)[-1])
                 continue
 
             # remove contained matches the other way
-            if next_match.qcontains(current_match):
+            if interval_contains(next_interval, current_interval):
                 if trace:
                     logger_debug(
                         '    ---> ###filter_contained_matches: '
                         'current CONTAINED in next, '
-                        'removed current', matches[i])
-                discarded_append(matches_pop(i))
+                        'removed current', current_match)
+                discarded_append(intervals_pop(i)[-1])
                 i -= 1
                 break
 
@@ -1167,7 +1266,7 @@ def filter_contained_matches(
     for disc in discarded:
         disc.discard_reason = reason
 
-    return matches, discarded
+    return [interval[-1] for interval in intervals], discarded
 
 
 def filter_overlapping_matches(
@@ -1201,18 +1300,18 @@ def filter_overlapping_matches(
     OVERLAP_LARGE = 0.70
     OVERLAP_EXTRA_LARGE = 0.90
 
-    # NOTE: we do not filter matches in place: sorted creates a copy
+    # NOTE: we do not filter matches in place: this is a new sorted list of
+    # (qstart, qend, qlen, hilen, match) intervals
     # sort on start, longer high, longer match, matcher type
-    sorter = lambda m: (m.qspan.start, -m.hilen(), -m.len(), m.matcher_order)
-    matches = sorted(matches, key=sorter)
-    matches_pop = matches.pop
+    intervals = get_match_intervals(matches)
+    intervals_pop = intervals.pop
 
     if trace:
         logger_debug(
             'filter_overlapping_matches: '
-            'number of matches to process:', len(matches))
+            'number of matches to process:', len(intervals))
         logger_debug('filter_overlapping_matches: initial matches')
-        for m in matches:
+        for m in (interval[-1] for interval in intervals):
             logger_debug('  ', m,)
             print('========================')
             print(m.matched_text())
@@ -1221,11 +1320,13 @@ def filter_overlapping_matches(
     # compare two matches in the sorted sequence: current and next match we
     # progressively compare a pair and remove next or current
     i = 0
-    while i < len(matches) - 1:
+    while i < len(intervals) - 1:
         j = i + 1
-        while j < len(matches):
-            current_match = matches[i]
-            next_match = matches[j]
+        while j < len(intervals):
+            current_interval = intervals[i]
+            next_interval = intervals[j]
+            current_qstart, current_qend, current_len, current_hilen, current_match = current_interval
+            next_qstart, next_qend, next_len, next_hilen, next_match = next_interval
 
             if trace:
                 logger_debug(
@@ -1238,7 +1339,7 @@ def filter_overlapping_matches(
             # BREAK/shortcircuit rather than continue since continuing looking
             # next matches will yield no new findings. e.g. stop when no overlap
             # is possible.
-            if next_match.qstart > current_match.qend:
+            if next_qstart > current_qend:
                 if trace:
                     logger_debug(
                         '    ---> ###filter_overlapping_matches: matches disjoint: '
@@ -1248,7 +1349,7 @@ def filter_overlapping_matches(
                 j += 1
                 break
 
-            overlap = current_match.overlap(next_match)
+            overlap = interval_overlap(current_interval, next_interval)
             if not overlap:
                 if trace:
                     logger_debug(
@@ -1273,7 +1374,7 @@ def filter_overlapping_matches(
 
             # next match overlaps with current, so we handle overlapping
             # matches: determine overlap and containment relationships
-            overlap_ratio_to_next = overlap / next_match.len()
+            overlap_ratio_to_next = overlap / next_len
 
             extra_large_next = overlap_ratio_to_next >= OVERLAP_EXTRA_LARGE
             large_next = overlap_ratio_to_next >= OVERLAP_LARGE
@@ -1281,7 +1382,7 @@ def filter_overlapping_matches(
             small_next = overlap_ratio_to_next >= OVERLAP_SMALL
 
             # current match overlap to next
-            overlap_ratio_to_current = overlap / current_match.len()
+            overlap_ratio_to_current = overlap / current_len
 
             extra_large_current = overlap_ratio_to_current >= OVERLAP_EXTRA_LARGE
             large_current = overlap_ratio_to_current >= OVERLAP_LARGE
@@ -1309,45 +1410,45 @@ def filter_overlapping_matches(
                         or 'NOT CONTAINED',
                 )
 
-            if extra_large_next and current_match.len() >= next_match.len():
+            if extra_large_next and current_len >= next_len:
                 if trace:
                     logger_debug(
                         '      ---> ###filter_overlapping_matches: '
                         'EXTRA_LARGE next included, '
-                        'removed shorter next', matches[j])
+                        'removed shorter next', next_match)
 
-                discarded_append(matches_pop(j))
+                discarded_append(intervals_pop(j)[-1])
                 continue
 
-            if extra_large_current and current_match.len() <= next_match.len():
+            if extra_large_current and current_len <= next_len:
                 if trace:
                     logger_debug(
                         '      ---> ###filter_overlapping_matches: '
                         'EXTRA_LARGE next includes current, '
-                        'removed shorter current', matches[i])
+                        'removed shorter current', current_match)
 
-                discarded_append(matches_pop(i))
+                discarded_append(intervals_pop(i)[-1])
                 i -= 1
                 break
 
-            if large_next and current_match.len() >= next_match.len() and current_match.hilen() >= next_match.hilen():
+            if large_next and current_len >= next_len and current_hilen >= next_hilen:
                 if trace:
                     logger_debug(
                         '      ---> ###filter_overlapping_matches: '
                         'LARGE next included, '
-                        'removed shorter next', matches[j])
+                        'removed shorter next', next_match)
 
-                discarded_append(matches_pop(j))
+                discarded_append(intervals_pop(j)[-1])
                 continue
 
-            if large_current and current_match.len() <= next_match.len() and current_match.hilen() <= next_match.hilen():
+            if large_current and current_len <= next_len and current_hilen <= next_hilen:
                 if trace:
                     logger_debug(
                         '      ---> ###filter_overlapping_matches: '
                         'LARGE next includes '
-                        'current, removed shorter current', matches[i])
+                        'current, removed shorter current', current_match)
 
-                discarded_append(matches_pop(i))
+                discarded_append(intervals_pop(i)[-1])
                 i -= 1
                 break
 
@@ -1358,22 +1459,22 @@ def filter_overlapping_matches(
                         'MEDIUM NEXT')
 
                 if (current_match.licensing_contains(next_match)
-                    and current_match.len() >= next_match.len()
-                    and current_match.hilen() >= next_match.hilen()
+                    and current_len >= next_len
+                    and current_hilen >= next_hilen
                 ):
                     if trace:
                         logger_debug(
                             '      ---> ###filter_overlapping_matches: '
                             'MEDIUM next included with next licensing contained, '
-                            'removed next', matches[j],)
+                            'removed next', next_match,)
 
-                    discarded_append(matches_pop(j))
+                    discarded_append(intervals_pop(j)[-1])
                     continue
 
                 # case of a single trailing "license foo" nex match overlapping on "license" only
-                if (next_match.len() == 2
-                    and current_match.len() >= next_match.len() + 2
-                    and current_match.hilen() >= next_match.hilen()
+                if (next_len == 2
+                    and current_len >= next_len + 2
+                    and current_hilen >= next_hilen
                     and current_match.rule.ends_with_license
                     and next_match.rule.starts_with_license
                 ):
@@ -1382,22 +1483,22 @@ def filter_overlapping_matches(
                             '      ---> ###filter_overlapping_matches: '
                             'MEDIUM next starts_with_license '
                             'and current ends_with_license, '
-                            'removed next', matches[j],)
+                            'removed next', next_match,)
 
-                    discarded_append(matches_pop(j))
+                    discarded_append(intervals_pop(j)[-1])
                     continue
 
                 if (next_match.licensing_contains(current_match)
-                    and current_match.len() <= next_match.len()
-                    and current_match.hilen() <= next_match.hilen()
+                    and current_len <= next_len
+                    and current_hilen <= next_hilen
                 ):
                     if trace:
                         logger_debug(
                             '      ---> ###filter_overlapping_matches: '
                             'MEDIUM next includes current with current licensing contained, '
-                            'removed current', matches[i])
+                            'removed current', current_match)
 
-                    discarded_append(matches_pop(i))
+                    discarded_append(intervals_pop(i)[-1])
                     i -= 1
                     break
 
@@ -1408,60 +1509,60 @@ def filter_overlapping_matches(
                         'MEDIUM CURRENT')
 
                 if (current_match.licensing_contains(next_match)
-                    and current_match.len() >= next_match.len()
-                    and current_match.hilen() >= next_match.hilen()
+                    and current_len >= next_len
+                    and current_hilen >= next_hilen
                 ):
                     if trace:
                         logger_debug(
                             '      ---> ###filter_overlapping_matches: '
                             'MEDIUM current, bigger current with next licensing contained, '
-                            'removed next', matches[j])
+                            'removed next', next_match)
 
-                    discarded_append(matches_pop(j))
+                    discarded_append(intervals_pop(j)[-1])
                     continue
 
                 if (next_match.licensing_contains(current_match)
-                    and current_match.len() <= next_match.len()
-                    and current_match.hilen() <= next_match.hilen()
+                    and current_len <= next_len
+                    and current_hilen <= next_hilen
                 ):
                     if trace:
                         logger_debug(
                             '      ---> ###filter_overlapping_matches: '
                             'MEDIUM current, bigger next current with current licensing contained, '
-                            'removed current', matches[i])
+                            'removed current', current_match)
 
-                    discarded_append(matches_pop(i))
+                    discarded_append(intervals_pop(i)[-1])
                     i -= 1
                     break
 
             if (small_next
-                and current_match.surround(next_match)
+                and current_qstart <= next_qstart and current_qend >= next_qend
                 and current_match.licensing_contains(next_match)
-                and current_match.len() >= next_match.len()
-                and current_match.hilen() >= next_match.hilen()
+                and current_len >= next_len
+                and current_hilen >= next_hilen
             ):
                 if trace:
                     logger_debug(
                         '      ---> ###filter_overlapping_matches: '
                         'SMALL next surrounded, '
-                        'removed next', matches[j])
+                        'removed next', next_match)
 
-                discarded_append(matches_pop(j))
+                discarded_append(intervals_pop(j)[-1])
                 continue
 
             if (small_current
-                and next_match.surround(current_match)
+                and next_qstart <= current_qstart and next_qend >= current_qend
                 and next_match.licensing_contains(current_match)
-                and current_match.len() <= next_match.len()
-                and current_match.hilen() <= next_match.hilen()
+                and current_len <= next_len
+                and current_hilen <= next_hilen
             ):
                 if trace:
                     logger_debug(
                         '      ---> ###filter_overlapping_matches: '
                         'SMALL current surrounded, '
-                        'removed current', matches[i])
+                        'removed current', current_match)
 
-                discarded_append(matches_pop(i))
+                discarded_append(intervals_pop(i)[-1])
                 i -= 1
                 break
 
@@ -1471,24 +1572,24 @@ def filter_overlapping_matches(
 
             # ensure that we have a previous
             if i:
-                previous_match = matches[i - 1]
+                previous_interval = intervals[i - 1]
                 # ensure previous and next do not overlap
-                if not previous_match.overlap(next_match):
+                if not interval_overlap(previous_interval, next_interval):
                     # ensure most of current is contained in the previous and next overlap
-                    cpo = current_match.overlap(previous_match)
-                    cno = current_match.overlap(next_match)
+                    cpo = interval_overlap(current_interval, previous_interval)
+                    cno = overlap
                     if cpo and cno:
                         overlap_len = cno + cpo
-                        clen = current_match.len()
+                        clen = current_len
                         # we want at least 90% of the current that is in the overlap
                         if overlap_len >= (clen * 0.9):
                             if trace:
                                 logger_debug(
                                     '      ---> ###filter_overlapping_matches: '
                                     'current mostly contained in previous and next, '
-                                    'removed current', matches[i])
+                                    'removed current', current_match)
 
-                            discarded_append(matches_pop(i))
+                            discarded_append(intervals_pop(i)[-1])
                             i -= 1
                             break
 
@@ -1497,7 +1598,7 @@ def filter_overlapping_matches(
 
     if trace:
         print('filter_overlapping_matches: final  matches')
-        for m in matches:
+        for m in (interval[-1] for interval in intervals):
             print('  ', m)
         print('filter_overlapping_matches: final  discarded')
         for m in discarded:
@@ -1506,7 +1607,7 @@ def filter_overlapping_matches(
     for disc in discarded:
         disc.discard_reason = reason
 
-    return matches, discarded
+    return [interval[-1] for interval in intervals], discarded
 
 
 def restore_non_overlapping(matches, discarded):
@@ -2662,12 +2763,17 @@ def refine_matches(
     merge=True,
     trace_basic=TRACE,
     trace=TRACE_REFINE,
+    timings=None,
 ):
     """
     Return a filtered list of kept LicenseMatch matches and a list of
     discardable matches given a `matches` list of LicenseMatch by removing
     matches that do not mee certain criteria as defined in multiple filters.
+
+    If ``timings`` is a MatchTimings, collect in it the execution time of the
+    merging and filtering steps.
     """
+    timed = get_timer(timings)
 
     if trace_basic:
         logger_debug()
@@ -2682,7 +2788,8 @@ def refine_matches(
     all_discarded_extend = all_discarded.extend
 
     if merge:
-        matches = merge_matches(matches)
+        with timed('refine:merge'):
+            matches = merge_matches(matches)
 
         if trace_basic:
             logger_debug('     ##### refine_matches: STARTING MERGED_matches#:', len(matches))
@@ -2707,36 +2814,38 @@ def refine_matches(
     # FIXME: we should have only a single loop on all the matches at once!!
     # and not 10's of loops!!!
 
-    matches, discarded = filter_matches_missing_key_phrases(matches)
-    all_discarded_extend(discarded)
-    _log(matches, discarded, 'HAS KEY PHRASES')
+    with timed('refine:filter_invalid'):
+        matches, discarded = filter_matches_missing_key_phrases(matches)
+        all_discarded_extend(discarded)
+        _log(matches, discarded, 'HAS KEY PHRASES')
 
-    matches, discarded = filter_spurious_matches(matches)
-    all_discarded_extend(discarded)
-    _log(matches, discarded, 'GOOD')
+        matches, discarded = filter_spurious_matches(matches)
+        all_discarded_extend(discarded)
+        _log(matches, discarded, 'GOOD')
 
-    matches, discarded = filter_below_rule_minimum_coverage(matches)
-    all_discarded_extend(discarded)
-    _log(matches, discarded, 'ABOVE MIN COVERAGE')
+        matches, discarded = filter_below_rule_minimum_coverage(matches)
+        all_discarded_extend(discarded)
+        _log(matches, discarded, 'ABOVE MIN COVERAGE')
 
-    matches, discarded = filter_matches_to_spurious_single_token(matches, query)
-    all_discarded_extend(discarded)
-    _log(matches, discarded, 'MORE THAN ONE NON SPURIOUS TOKEN')
+        matches, discarded = filter_matches_to_spurious_single_token(matches, query)
+        all_discarded_extend(discarded)
+        _log(matches, discarded, 'MORE THAN ONE NON SPURIOUS TOKEN')
 
-    matches, discarded = filter_too_short_matches(matches)
-    all_discarded_extend(discarded)
-    _log(matches, discarded, 'LONG ENOUGH')
+        matches, discarded = filter_too_short_matches(matches)
+        all_discarded_extend(discarded)
+        _log(matches, discarded, 'LONG ENOUGH')
 
-    matches, discarded = filter_short_matches_scattered_on_too_many_lines(matches)
-    all_discarded_extend(discarded)
-    _log(matches, discarded, 'ACCEPTABLE IF NOT SHORT SCATTERED')
+        matches, discarded = filter_short_matches_scattered_on_too_many_lines(matches)
+        all_discarded_extend(discarded)
+        _log(matches, discarded, 'ACCEPTABLE IF NOT SHORT SCATTERED')
 
-    matches, discarded = filter_invalid_matches_to_single_word_gibberish(matches)
-    all_discarded_extend(discarded)
-    _log(matches, discarded, 'MORE THAN ONE NON INVALID GIBBERISH TOKEN')
+        matches, discarded = filter_invalid_matches_to_single_word_gibberish(matches)
+        all_discarded_extend(discarded)
+        _log(matches, discarded, 'MORE THAN ONE NON INVALID GIBBERISH TOKEN')
 
     # TODO: we seem to be always merging?
-    matches = merge_matches(matches)
+    with timed('refine:merge'):
+        matches = merge_matches(matches)
 
     if trace_basic:
         logger_debug(' #####refine_matches: before FILTER matches#', len(matches))
@@ -2744,7 +2853,8 @@ def refine_matches(
         for m in matches:
             logger_debug(m)
 
-    matches, discarded_contained = filter_contained_matches(matches)
+    with timed('refine:filter_contained'):
+        matches, discarded_contained = filter_contained_matches(matches)
     _log(matches, discarded_contained, 'NON CONTAINED')
 
     if trace_basic:
@@ -2753,34 +2863,37 @@ def refine_matches(
         for m in matches:
             logger_debug(m)
 
-    matches, discarded_overlapping = filter_overlapping_matches(matches)
-    _log(matches, discarded_overlapping, 'NON OVERLAPPING')
+    with timed('refine:filter_overlapping'):
+        matches, discarded_overlapping = filter_overlapping_matches(matches)
+        _log(matches, discarded_overlapping, 'NON OVERLAPPING')
 
-    if discarded_contained:
-        to_keep, discarded_contained = restore_non_overlapping(matches, discarded_contained)
-        matches.extend(to_keep)
-        all_discarded_extend(discarded_contained)
-        _log(to_keep, discarded_contained, 'NON CONTAINED REFINED')
+        if discarded_contained:
+            to_keep, discarded_contained = restore_non_overlapping(matches, discarded_contained)
+            matches.extend(to_keep)
+            all_discarded_extend(discarded_contained)
+            _log(to_keep, discarded_contained, 'NON CONTAINED REFINED')
 
-    if discarded_overlapping:
-        to_keep, discarded_overlapping = restore_non_overlapping(matches, discarded_overlapping)
-        matches.extend(to_keep)
-        all_discarded_extend(discarded_overlapping)
-        _log(to_keep, discarded_overlapping, 'NON OVERLAPPING REFINED')
+        if discarded_overlapping:
+            to_keep, discarded_overlapping = restore_non_overlapping(matches, discarded_overlapping)
+            matches.extend(to_keep)
+            all_discarded_extend(discarded_overlapping)
+            _log(to_keep, discarded_overlapping, 'NON OVERLAPPING REFINED')
 
-    matches, discarded_contained = filter_contained_matches(matches)
+    with timed('refine:filter_contained'):
+        matches, discarded_contained = filter_contained_matches(matches)
     all_discarded_extend(discarded_contained)
     _log(matches, discarded_contained, 'NON CONTAINED')
 
     if filter_false_positive:
-        matches, discarded = filter_false_positive_matches(matches)
-        all_discarded_extend(discarded)
-        _log(matches, discarded, 'TRUE POSITIVE')
+        with timed('refine:filter_false_positive'):
+            matches, discarded = filter_false_positive_matches(matches)
+            all_discarded_extend(discarded)
+            _log(matches, discarded, 'TRUE POSITIVE')
 
-        # license listings are false positive-like
-        matches, discarded = filter_false_positive_license_lists_matches(matches)
-        all_discarded_extend(discarded)
-        _log(matches, discarded, 'NOT A LICENSE LIST')
+            # license listings are false positive-like
+            matches, discarded = filter_false_positive_license_lists_matches(matches)
+            all_discarded_extend(discarded)
+            _log(matches, discarded, 'NOT A LICENSE LIST')
 
     if min_score:
         matches, discarded = filter_matches_below_minimum_score(matches, min_score=min_score)
@@ -2788,7 +2901,8 @@ def refine_matches(
         _log(matches, discarded, 'HIGH ENOUGH SCORE')
 
     if merge:
-        matches = merge_matches(matches)
+        with timed('refine:merge'):
+            matches = merge_matches(matches)
 
     if trace:
         logger_debug('   ##### refine_matches: FINAL MERGED_matches#:', len(matches))
@@ -2909,25 +3023,53 @@ def tokenize_matched_text(
     return result
 
 
+def get_query_matched_text_tokens(qry):
+    """
+    Return a list of Token objects with pos and line number for the whole text
+    of a ``qry`` Query. The tokens are built once for all the matches of a query
+    from the text lines kept in this query, without reading its file again.
+    """
+    tokens = qry.matched_text_tokens
+    if tokens is None:
+        qry.matched_text_tokens = tokens = list(
+            _tokenize_matched_text(
+                location=qry.location,
+                query_string=qry.query_string,
+                dictionary=qry.idx.dictionary,
+                start_line=qry.start_line,
+                lines=qry.text_lines or None,
+            )
+        )
+    return tokens
+
+
 def _tokenize_matched_text(
     location,
     query_string,
     dictionary,
     start_line=1,
+    lines=None,
     trace=TRACE_MATCHED_TEXT_DETAILS,
 ):
     """
     Yield Token objects with pos and line number collected from the file at
     `location` or the `query_string` string. `dictionary` is the index mapping
     of tokens to token ids.
+
+    If ``lines`` is provided, use this list of (line number, unstripped text
+    line) instead of reading the text lines from `location` or the
+    `query_string`.
     """
     pos = 0
-    qls = query.query_lines(
-        location=location,
-        query_string=query_string,
-        strip=False,
-        start_line=start_line,
-    )
+    if lines is not None:
+        qls = lines
+    else:
+        qls = query.query_lines(
+            location=location,
+            query_string=query_string,
+            strip=False,
+            start_line=start_line,
+        )
     for line_num, line in qls:
         if trace:
             logger_debug('  _tokenize_matched_text:',
@@ -3135,6 +3277,7 @@ def get_full_matched_text(
     location=None,
     query_string=None,
     idx=None,
+    query=None,
     whole_lines=False,
     highlight=True,
     highlight_matched='{}',
@@ -3162,6 +3305,7 @@ def get_full_matched_text(
         location=location,
         query_string=query_string,
         idx=idx,
+        query=query,
         whole_lines=whole_lines,
         highlight=highlight,
         highlight_matched=highlight_matched,
@@ -3181,6 +3325,7 @@ def get_full_qspan_matched_text(
     location=None,
     query_string=None,
     idx=None,
+    query=None,
     whole_lines=False,
     highlight=True,
     highlight_matched='{}',
@@ -3217,6 +3362,8 @@ def get_full_qspan_matched_text(
     by a "dot".
 
     If ``_usecache`` is True, the tokenized text is cached for efficiency.
+    If a ``query`` Query of this match is provided, the tokenized text is built
+    once from the text lines of this query and reused for all its matches.
     """
     if trace:
         logger_debug('get_full_qspan_matched_text:  match_qspan:', match_qspan)
@@ -3235,7 +3382,9 @@ def get_full_qspan_matched_text(
         highlight = True
 
     # Create and process a stream of Tokens
-    if not _usecache:
+    if query is not None and _usecache:
+        tokens = get_query_matched_text_tokens(query)
+    elif not _usecache:
         # for testing only, reset cache on each call
         tokens = tokenize_matched_text(
             location=location,
@@ -3300,13 +3449,7 @@ def get_highlighted_lines(
     """
     Yield highlighted text lines (with line returns) for the whole of the matched and unmatched text of a ``query``.
     """
-    tokens = tokenize_matched_text(
-        location=query.location,
-        query_string=query.query_string,
-        dictionary=query.idx.dictionary,
-        start_line=match.query.start_line,
-        _cache={},
-    )
+    tokens = get_query_matched_text_tokens(query)
     tokens = tag_matched_tokens(tokens=tokens, match_qspan=match.qspan)
 
     if trace:
@@ -10,6 +10,7 @@
 from itertools import groupby
 
 import ahocorasick
+from intbitset import intbitset
 
 from licensedcode import SMALL_RULE
 from licensedcode.match import LicenseMatch
@@ -146,7 +147,7 @@ def get_matched_spans(positions, matchables):
     """
     for rid, match_qstart, match_qend, istart, iend in positions:
 
-        qspan = Span(list(range(match_qstart, match_qend)))
+        qspan = Span(range(match_qstart, match_qend))
         # TODO: this should be optimized?
         # e.g. with not qspan.set.issubset(matchables):
         if any(p not in matchables for p in qspan):
@@ -155,7 +156,7 @@ def get_matched_spans(positions, matchables):
                 'any(p not in matchables for p in qspan)',
                 'discarding rule:', rid)
             continue
-        ispan = Span(list(range(istart, iend)))
+        ispan = Span(range(istart, iend))
         yield rid, qspan, ispan
 
 
@@ -281,9 +282,10 @@ def filter_already_matched_overlapping_matches(matches, query):
 
     matched_pos = query.matched
     for match in matches:
-        # FIXME: do not use internals!!!
-        match_qspan_set = match.qspan._set
-        if match_qspan_set & matched_pos:
+        if any(
+            not matched_pos.isdisjoint(intbitset(range(start, end + 1)))
+            for start, end in match.qspan.runs
+        ):
             # discard any match that has any position already matched
             if TRACE_FRAG: logger_debug('    ==> DISCARDING ALREADY MATCHED:', match)
             discarded.append(match)
@@ -0,0 +1,121 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+from array import array
+from collections import OrderedDict
+from hashlib import sha1
+
+from licensedcode.match import LicenseMatch
+from licensedcode.spans import Span
+
+"""
+A bounded least recently used cache of the approximate matches of query runs.
+
+Many files share the same license header or notice with a different body, such
+as the files of a vendored project. Their whole file hash does not match, but
+they have query runs with the same sequence of matchable token ids. The
+approximate matches of a query run depend only on this sequence: we cache these
+matches with positions relative to the query run start keyed by a checksum of
+this sequence. On a cache hit, the matches are replayed at the positions of the
+new query run instead of computing candidates and sequence alignments again.
+"""
+
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def get_query_run_key(query_run):
+    """
+    Return a cache key bytes string for a ``query_run`` QueryRun computed from
+    its sequence of matchable token ids or None if it has no high matchable
+    token.
+    """
+    tokens = query_run.matchable_tokens()
+    if not tokens:
+        return None
+    # -1 is used for non-matchable positions: token ids are signed shorts
+    return sha1(array('h', tokens).tobytes()).digest()
+
+
+def shift_span(span, offset):
+    """
+    Return a new Span with the positions of ``span`` shifted by ``offset``.
+    """
+    return Span([pos + offset for pos in span])
+
+
+class QueryRunMatchesCache:
+    """
+    A least recently used cache of up to ``max_entries`` lists of approximate
+    LicenseMatch for query runs keyed by get_query_run_key().
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        # mapping of {key: list of relative matches tuples}
+        self.matches_by_key = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, query_run):
+        """
+        Return a list of LicenseMatch cached for ``key`` positioned for the
+        ``query_run`` QueryRun or None if there are no cached matches.
+        """
+        cached = self.matches_by_key.get(key)
+        if cached is None:
+            self.misses += 1
+            return None
+
+        self.matches_by_key.move_to_end(key)
+        self.hits += 1
+
+        start = query_run.start
+        query = query_run.query
+        return [
+            LicenseMatch(
+                rule=rule,
+                qspan=shift_span(qspan, start),
+                ispan=ispan,
+                hispan=hispan,
+                query_run_start=query_run_start + start,
+                matcher=matcher,
+                matcher_order=matcher_order,
+                query=query,
+            )
+            for rule, qspan, ispan, hispan, query_run_start, matcher, matcher_order
+            in cached
+        ]
+
+    def put(self, key, query_run, matches):
+        """
+        Cache the ``matches`` list of LicenseMatch of the ``query_run``
+        QueryRun for ``key``. Evict the least recently used entry if the cache
+        is full.
+        """
+        start = query_run.start
+        self.matches_by_key[key] = [
+            (
+                match.rule,
+                shift_span(match.qspan, -start),
+                match.ispan,
+                match.hispan,
+                match.query_run_start - start,
+                match.matcher,
+                match.matcher_order,
+            )
+            for match in matches
+        ]
+        if len(self.matches_by_key) > self.max_entries:
+            self.matches_by_key.popitem(last=False)
+
+    def get_stats(self):
+        """
+        Return a tuple of (hits, misses) counts.
+        """
+        return self.hits, self.misses
@@ -7,9 +7,13 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+from array import array
+from collections import Counter
 from collections import defaultdict
 from collections import namedtuple
 from functools import partial
+from heapq import nlargest
+from itertools import chain
 from itertools import groupby
 
 from intbitset import intbitset
@@ -59,6 +63,16 @@ The length of the intersection of a query and rule bitmap tells us the count of
 shared tokens. We can skip rules based on thresholds and we then rank and keep
 the top rules.
 
+Rather than intersecting the query bitmap with each rule bitmap in turn, we
+first compute the high intersection lengths for all the rules at once with an
+inverted index of high token id -> rule ids (e.g. the transposed term occurrence
+matrix restricted to legalese tokens): we count the occurrences of each rule id
+in the rule ids of the query high token ids. This counting is done in batch in
+C. Rules that share no high token with the query are never considered and only
+the rules that meet the high length threshold are intersected with the query
+bitmap and further scored and ranked in Python. Since the high tokens are rare,
+this skips most rules for a query with little or no license text.
+
 
 Tokens ids multisets aka. frequency counters aka. term vectors
 ==============================================================
@@ -235,6 +249,32 @@ def build_set_and_mset(token_ids, _use_bigrams=False):
     else:
         return build_set_and_tids_mset(token_ids)
 
+def build_high_rids_by_tid(sets_by_rid, rids, len_legalese):
+    """
+    Return an inverted index as a list of high (legalese) token id -> sorted
+    array of rule ids given a ``sets_by_rid`` mapping-like of rule id -> token
+    ids set, a set of ``rids`` rule ids to index and the ``len_legalese`` number
+    of high token ids.
+    """
+    high_rids_by_tid = [array('i') for _ in range(len_legalese)]
+    for rid in sorted(rids):
+        for tid in high_tids_set_subset(sets_by_rid[rid], len_legalese):
+            high_rids_by_tid[tid].append(rid)
+    return high_rids_by_tid
+
+
+def count_high_matched_lengths(qset, high_rids_by_tid, len_legalese):
+    """
+    Return a Counter of {rule id: number of high token ids shared with the
+    query} given a ``qset`` query token ids set and a ``high_rids_by_tid``
+    inverted index. Rules without any high token in common with the query are
+    not present in the Counter.
+    """
+    high_tids = high_tids_set_subset(qset, len_legalese)
+    # NOTE: Counters count an iterable in C, using a single chained iterable of
+    # the rule ids postings of all the query high tokens
+    return Counter(chain.from_iterable(map(high_rids_by_tid.__getitem__, high_tids)))
+
 # FIXME: we should consider more aggressively the thresholds and what a match
 # filters would discard when we compute candidates to eventually discard many or
 # all candidates: we compute too many candidates that may waste time in seq
@@ -273,20 +313,41 @@ def compute_candidates(query_run, idx, matchable_rids, top=50,
     sortable_candidates_append = sortable_candidates.append
 
     sets_by_rid = idx.sets_by_rid
+    rules_by_rid = idx.rules_by_rid
+
+    # the high intersection lengths of the query set with all the rules sets
+    # are computed at once from the high tokens postings: rules without high
+    # tokens in common with the query are never considered.
+    high_matched_lengths = count_high_matched_lengths(
+        qset=qset,
+        high_rids_by_tid=idx.high_rids_by_tid,
+        len_legalese=len_legalese,
+    )
+    if not high_matched_lengths:
+        return sortable_candidates
+
+    qset_len = tids_set_counter(qset)
 
-    for rid, rule in enumerate(idx.rules_by_rid):
+    for rid, high_matched_length in high_matched_lengths.items():
         if rid not in matchable_rids:
             continue
 
-        scores_vectors, high_set_intersection = compare_token_sets(
-            qset=qset,
-            iset=sets_by_rid[rid],
-            intersector=tids_sets_intersector,
-            counter=tids_set_counter,
-            high_intersection_filter=high_tids_set_subset,
-            len_legalese=len_legalese,
-            unique=True,
-            rule=rule,
+        rule = rules_by_rid[rid]
+        # need some high match above min high
+        if high_matched_length < rule.get_min_high_matched_length(unique=True):
+            continue
+
+        # the full intersection is computed only for the few rules that pass
+        # the high tokens threshold
+        matched_length = tids_set_counter(qset & sets_by_rid[rid])
+        if matched_length < rule.get_min_matched_length(unique=True):
+            continue
+
+        scores_vectors = compute_scores_vectors(
+            matched_length=matched_length,
+            qset_len=qset_len,
+            iset_len=rule.get_length(unique=True),
+            minimum_containment=rule._minimum_containment,
             filter_non_matching=True,
             high_resemblance_threshold=high_resemblance_threshold)
 
@@ -294,12 +355,19 @@ def compute_candidates(query_run, idx, matchable_rids, top=50,
             svr, svf = scores_vectors
             if (not high_resemblance
             or (high_resemblance and svr.is_highly_resemblant and svf.is_highly_resemblant)):
-                sortable_candidates_append((scores_vectors, rid, rule, high_set_intersection))
+                # the high set intersection is computed later for the top
+                # candidates only
+                sortable_candidates_append((scores_vectors, rid, rule, None))
 
     if not sortable_candidates:
         return sortable_candidates
 
-    sortable_candidates.sort(reverse=True)
+    if TRACE_CANDIDATES_SET:
+        logger_debug('compute_candidates: sets: all candidates:', len(sortable_candidates))
+
+    # keep only the 10 x top candidates: this is the same as a reversed sort
+    # and slice, but faster
+    sortable_candidates = nlargest(top * 10, sortable_candidates)
 
     if TRACE_CANDIDATES_SET:
         logger_debug('\n\n\ncompute_candidates: sets: sortable_candidates:', len(sortable_candidates))
@@ -311,8 +379,7 @@ def compute_candidates(query_run, idx, matchable_rids, top=50,
     ####################################################################
     # step 2 is on tids multisets
     ####################################################################
-    # keep only the 10 x top candidates
-    candidates = sortable_candidates[:top * 10]
+    candidates = sortable_candidates
     sortable_candidates = []
     sortable_candidates_append = sortable_candidates.append
 
@@ -325,7 +392,8 @@ def compute_candidates(query_run, idx, matchable_rids, top=50,
 
     high_intersection_filter = partial(high_multiset_subset, _use_bigrams=_use_bigrams)
 
-    for _score_vectors, rid, rule, high_set_intersection in candidates:
+    for _score_vectors, rid, rule, _ in candidates:
+        high_set_intersection = high_tids_set_subset(qset & sets_by_rid[rid], len_legalese)
 
         scores_vectors, _intersection = compare_token_sets(
             qset=qmset,
@@ -403,6 +471,35 @@ def compare_token_sets(qset, iset,
     if filter_non_matching and matched_length < min_matched_length:
         return None, None
 
+    scores = compute_scores_vectors(
+        matched_length=matched_length,
+        qset_len=counter(qset),
+        iset_len=rule.get_length(unique),
+        minimum_containment=rule._minimum_containment,
+        filter_non_matching=filter_non_matching,
+        high_resemblance_threshold=high_resemblance_threshold,
+    )
+    if not scores:
+        return None, None
+
+    return scores, high_intersection
+
+
+def compute_scores_vectors(
+    matched_length,
+    qset_len,
+    iset_len,
+    minimum_containment,
+    filter_non_matching=True,
+    high_resemblance_threshold=0.8,
+):
+    """
+    Return a tuple of (rounded ScoresVector, full ScoresVector) given the
+    ``matched_length`` length of the intersection of a query set of
+    ``qset_len`` length and a rule set of ``iset_len`` length. Return None if
+    ``filter_non_matching`` is True and the containment is below the
+    ``minimum_containment`` of a rule.
+    """
     # Compute resemblance and containment: note we are interested in the index-
     # side containment of a rule in the query and not how much of a query is
     # contained in a rule. In practice we have three main cases:
@@ -414,8 +511,6 @@ def compare_token_sets(qset, iset,
     # Containment first and resemblance second also helps with case 3. which is
     # mixed and gives the best rankings in practice, as we want to further
     # process first rules that are highly contained in the query.
-    iset_len = rule.get_length(unique)
-    qset_len = counter(qset)
     union_len = qset_len + iset_len - matched_length
     resemblance = matched_length / union_len
     containment = matched_length / iset_len
@@ -426,11 +521,9 @@ def compare_token_sets(qset, iset,
     # seen as a form of "smoothing"
     amplified_resemblance = resemblance ** 2
 
-    minimum_containment = rule._minimum_containment
-
     # FIXME: we should not recompute this /100 ... it should be cached in the index
     if filter_non_matching and minimum_containment and containment < minimum_containment:
-        return None, None
+        return None
 
     scores = (
         ScoresVector(
@@ -446,7 +539,7 @@ def compare_token_sets(qset, iset,
             matched_length=matched_length,
         )
     )
-    return scores, high_intersection
+    return scores
 
 
 _scores_vector_fields = [
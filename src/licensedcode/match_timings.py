@@ -0,0 +1,109 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextlib import nullcontext
+from time import time
+
+"""
+Collect the execution time and the number of calls of each stage of license
+matching for a query, such as hash, exact and approximate matching and the
+refinement of matches.
+
+Stages can be nested: the time of a stage excludes the time spent in the
+stages nested in it. For instance the time of the approximate matching "seq"
+stage does not include the time spent computing candidates or refining matches.
+The sum of the stages timings is therefore the total time spent matching.
+"""
+
+# The names of the matching stages in the order in which they run
+MATCH_STAGES = (
+    'query',
+    'hash',
+    'aho',
+    'spdx_lid',
+    'candidates',
+    'seq',
+    'unknown',
+    'refine:merge',
+    'refine:filter_invalid',
+    'refine:filter_contained',
+    'refine:filter_overlapping',
+    'refine:filter_false_positive',
+)
+
+
+class MatchTimings:
+    """
+    Collect the execution time in seconds and the number of calls for each
+    named license matching stage.
+    """
+
+    def __init__(self):
+        # mapping of {stage: execution time in seconds}
+        self.durations = defaultdict(float)
+        # mapping of {stage: number of calls}
+        self.counts = defaultdict(int)
+        # stack of [stage, start time] of the stages being timed
+        self._stack = []
+
+    @contextmanager
+    def timed(self, stage):
+        """
+        Context manager to time a ``stage`` execution, excluding the time of
+        other stages timed while this stage runs.
+        """
+        stack = self._stack
+        now = time()
+        if stack:
+            parent = stack[-1]
+            self.durations[parent[0]] += now - parent[1]
+
+        current = [stage, now]
+        stack.append(current)
+        try:
+            yield
+        finally:
+            now = time()
+            stack.pop()
+            self.durations[stage] += now - current[1]
+            self.counts[stage] += 1
+            if stack:
+                # restart the timer of the parent stage
+                stack[-1][1] = now
+
+    def to_dict(self, prefix=''):
+        """
+        Return a mapping of {``prefix`` + stage: execution time in seconds} and
+        {``prefix`` + stage + ':count': number of calls} for each timed stage.
+        """
+        timings = {}
+        for stage, duration in self.durations.items():
+            timings[prefix + stage] = duration
+            timings[prefix + stage + ':count'] = self.counts[stage]
+        return timings
+
+
+def not_timed(stage):
+    """
+    Context manager doing nothing used in place of MatchTimings.timed() when
+    timings are not collected.
+    """
+    return nullcontext()
+
+
+def get_timer(timings=None):
+    """
+    Return a ``timed(stage)`` context manager function to time a matching
+    stage using a ``timings`` MatchTimings or a no-op if ``timings`` is None.
+    """
+    if timings is None:
+        return not_timed
+    return timings.timed
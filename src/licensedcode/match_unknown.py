@@ -7,9 +7,10 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+from itertools import accumulate
+
 import ahocorasick
 
-from licensedcode import tokenize
 from licensedcode.models import UnknownRule
 from licensedcode.match import get_full_qspan_matched_text
 from licensedcode.match import LicenseMatch
@@ -68,13 +69,16 @@ def add_ngrams(
     Add the `tids` sequence of token ids to an unknown ngram automaton.
     """
     if rule_length >= unknown_ngram_length:
-        tids_ngrams = tokenize.ngrams(tids, ngram_length=unknown_ngram_length)
-        toks_ngrams = tokenize.ngrams(tokens, ngram_length=unknown_ngram_length)
-        for tids_ngram, toks_ngram in zip(tids_ngrams, toks_ngrams):
-            if is_good_tokens_ngram(toks_ngram, tids_ngram, len_legalese):
-                # note that we do not store positions as values, only the ngram
-                # since we do not keep the rule origin of an ngram
-                automaton.add_word(tids_ngram)
+        tids_ngrams = get_good_tids_ngrams(
+            tids=tids,
+            tokens=tokens,
+            len_legalese=len_legalese,
+            ngram_length=unknown_ngram_length,
+        )
+        for tids_ngram in tids_ngrams:
+            # note that we do not store positions as values, only the ngram
+            # since we do not keep the rule origin of an ngram
+            automaton.add_word(tids_ngram)
 
 
 markers = frozenset([
@@ -129,6 +133,70 @@ def is_good_tokens_ngram(
     return True
 
 
+def get_good_tids_ngrams(
+    tids,
+    tokens,
+    len_legalese,
+    ngram_length=UNKNOWN_NGRAM_LENGTH,
+    markers=markers,
+):
+    """
+    Return a list of "good" ngrams tuples of ``ngram_length`` token ids from a
+    ``tids`` sequence of token ids and the corresponding ``tokens`` sequence of
+    token strings.
+
+    This returns the same ngrams as checking each ngram with
+    is_good_tokens_ngram() but the token criteria are computed once for each
+    token and summed over a sliding window rather than once for each ngram that
+    contains this token.
+    """
+    min_good = 3
+
+    digits = [t.isdigit() for t in tokens]
+    singles = [len(t) == 1 for t in tokens]
+    # a year or a copyright marker disqualify any ngram they are part of
+    excluded = [
+        (is_digit and len(t) == 4) or t in markers
+        for t, is_digit in zip(tokens, digits)
+    ]
+    highs = [tid < len_legalese for tid in tids]
+
+    windows = zip(
+        get_window_sums(highs, ngram_length),
+        get_window_sums(excluded, ngram_length),
+        get_window_sums(digits, ngram_length),
+        get_window_sums(singles, ngram_length),
+    )
+    starts = [
+        start for start, (high, excl, digit, single) in enumerate(windows)
+        if high and not excl and digit < min_good and single < min_good
+    ]
+
+    good_ngrams = []
+    good_ngrams_append = good_ngrams.append
+    for start in starts:
+        tids_ngram = tuple(tids[start:start + ngram_length])
+        # too little token diversity, e.g. this is a repeat
+        if len(set(tids_ngram)) > 2:
+            good_ngrams_append(tids_ngram)
+    return good_ngrams
+
+
+def get_window_sums(flags, window_length):
+    """
+    Return a list of the sums of ``flags`` booleans over each sliding window of
+    ``window_length``.
+
+    For example:
+    >>> get_window_sums([True, False, True, True], 2)
+    [1, 1, 2]
+    >>> get_window_sums([True, False], 3)
+    []
+    """
+    cumulated = list(accumulate(flags, initial=0))
+    return [end - start for start, end in zip(cumulated, cumulated[window_length:])]
+
+
 def match_unknowns(
     idx,
     query_run,
@@ -200,6 +268,7 @@ def match_unknowns(
         location=query.location,
         query_string=query.query_string,
         idx=idx,
+        query=query,
         only_matched=True,
     ))
 
@@ -14,6 +14,7 @@ from collections import Counter
 from collections import defaultdict
 from hashlib import sha1
 from itertools import chain
+from multiprocessing import current_process
 from operator import itemgetter
 from os.path import abspath
 from os.path import dirname
@@ -846,6 +847,8 @@ def get_rules(
     validate=False,
     validate_thorough=False,
     is_builtin=True,
+    processes=1,
+    rule_files_cache=None,
 ):
     """
     Yield Rule objects loaded from a ``licenses_db`` and license files found in
@@ -856,6 +859,9 @@ def get_rules(
     and if ``validate_thorough`` is True we perform additional validation tests
     (like whether it would produce valid YAML) which is skipped normally because these
     are expensive operations.
+
+    Rule files are loaded using up to ``processes`` processes and an optional
+    ``rule_files_cache`` RuleFilesCache as in ``load_rules()``.
     """
     licenses_db = licenses_db or load_licenses(
         licenses_data_dir=licenses_data_dir,
@@ -864,6 +870,8 @@ def get_rules(
     rules = list(load_rules(
         rules_data_dir=rules_data_dir,
         is_builtin=is_builtin,
+        processes=processes,
+        rule_files_cache=rule_files_cache,
     ))
 
     if validate:
@@ -959,17 +967,24 @@ def get_rules_from_multiple_dirs(
     licenses_db,
     builtin_rule_data_dir,
     additional_rules_data_dirs,
+    processes=1,
+    rule_files_cache=None,
 ):
     """
     Yield Rule(s) built from:
     - A ``license_db`` mapping of {key: License}
     - The ``builtin_rule_data_dir`` of builtin license rules
     - The list of ``additional_rules_data_dirs`` containing additional rules.
+
+    Rule files are loaded using up to ``processes`` processes and an optional
+    ``rule_files_cache`` RuleFilesCache as in ``load_rules()``.
     """
     # first load all builtin
     combined_rules = list(get_rules(
         licenses_db=licenses_db,
         rules_data_dir=builtin_rule_data_dir,
+        processes=processes,
+        rule_files_cache=rule_files_cache,
     ))
 
     # load additional rules
@@ -977,6 +992,8 @@ def get_rules_from_multiple_dirs(
         combined_rules.extend(load_rules(
             rules_data_dir=rules_dir,
             is_builtin=False,
+            processes=processes,
+            rule_files_cache=rule_files_cache,
         ))
 
     validate_rules(rules=combined_rules, licenses_by_key=licenses_db, thorough=False)
@@ -1195,10 +1212,16 @@ def load_rules(
     with_checks=True,
     is_builtin=True,
     with_depreacted=False,
+    processes=1,
+    rule_files_cache=None,
 ):
     """
     Return an iterable of rules loaded from rule files in ``rules_data_dir``.
     Optionally check for consistency if ``with_checks`` is True.
+
+    Load and parse the rule files using up to ``processes`` processes. Reuse the
+    rules of unchanged rule files cached in an optional ``rule_files_cache``
+    RuleFilesCache, and cache the rules of added or changed rule files there.
     """
     # TODO: OPTIMIZE: create a graph of rules to account for containment and
     # similarity clusters?
@@ -1209,6 +1232,7 @@ def load_rules(
     space_problems = []
     model_errors = []
 
+    rule_files = []
     for rule_file in resource_iter(location=rules_data_dir, with_dirs=False):
         if rule_file.endswith('.RULE'):
             base_name = file_base_name(rule_file)
@@ -1216,16 +1240,7 @@ def load_rules(
             if with_checks and ' ' in base_name:
                 space_problems.append(rule_file)
 
-            try:
-                rule = Rule.from_file(rule_file=rule_file)
-                if not with_depreacted and rule.is_deprecated:
-                    continue 
-                else:
-                    yield rule
-
-            except Exception as re:
-                if with_checks:
-                    model_errors.append(str(re))
+            rule_files.append(rule_file)
 
             if with_checks:
                 # accumulate sets to ensures we do not have illegal names or extra
@@ -1241,6 +1256,22 @@ def load_rules(
         if with_checks and not rule_file.endswith('~'):
             seen_files.add(rule_file)
 
+    loaded_rules = load_rule_files(
+        rule_files=rule_files,
+        processes=processes,
+        rule_files_cache=rule_files_cache,
+    )
+    for rule, error in loaded_rules:
+        if error:
+            if with_checks:
+                model_errors.append(error)
+            continue
+
+        if not with_depreacted and rule.is_deprecated:
+            continue
+
+        yield rule
+
     if with_checks:
         unknown_files = seen_files - processed_files
         if unknown_files or case_problems or model_errors or space_problems:
@@ -1281,6 +1312,71 @@ def load_rules(
             raise InvalidRule(msg)
 
 
+def load_rule_file(rule_file):
+    """
+    Return a tuple of (Rule object, None) loaded from a ``rule_file`` or a tuple
+    of (None, error message) if the rule file is not valid.
+    """
+    try:
+        return Rule.from_file(rule_file=rule_file), None
+    except Exception as e:
+        return None, str(e)
+
+
+def load_rule_files(rule_files, processes=1, rule_files_cache=None):
+    """
+    Return a list of (Rule object, error message) tuples loaded from a list of
+    ``rule_files`` locations, in the same order, as returned by
+    ``load_rule_file()``.
+
+    Load the rule files in parallel if ``processes`` is more than one. Reuse
+    the rules of unchanged rule files cached in an optional
+    ``rule_files_cache`` RuleFilesCache and cache the newly loaded rules there.
+    """
+    loaded_by_file = {}
+    checksums_by_file = {}
+    if rule_files_cache is not None:
+        for rule_file in rule_files:
+            checksum = rule_files_cache.get_checksum(rule_file)
+            checksums_by_file[rule_file] = checksum
+            rule = rule_files_cache.get(rule_file, checksum)
+            if rule is not None:
+                loaded_by_file[rule_file] = rule, None
+
+    to_load = [rf for rf in rule_files if rf not in loaded_by_file]
+
+    # daemonic processes, such as scan workers, cannot have children
+    if processes > 1 and len(to_load) > 1 and not current_process().daemon:
+        from scancode.pool import get_pool
+        pool = get_pool(processes=processes)
+        try:
+            loaded = pool.map(load_rule_file, to_load, chunksize=100)
+        finally:
+            pool.terminate()
+    else:
+        loaded = map(load_rule_file, to_load)
+
+    for rule_file, (rule, error) in zip(to_load, loaded):
+        loaded_by_file[rule_file] = rule, error
+        if rule_files_cache is not None and rule is not None:
+            rule_files_cache.put(rule_file, checksums_by_file[rule_file], rule)
+
+    return [loaded_by_file[rule_file] for rule_file in rule_files]
+
+
+def get_rule_order_key(rule):
+    """
+    Return a key to sort a ``rule`` Rule object in the same order as the
+    attrs-generated ordering of Rule objects. Sorting with this key builds the
+    tuple of the rule attributes once rather than for every comparison.
+    """
+    return tuple(
+        a.order_key(getattr(rule, a.name)) if a.order_key else getattr(rule, a.name)
+        for a in attr.fields(rule.__class__)
+        if a.order
+    )
+
+
 @attr.s(slots=True)
 class BasicRule:
     """
@@ -144,13 +144,14 @@ class LicenseScanner(ScanPlugin):
     def is_enabled(self, license, **kwargs):  # NOQA
         return license
 
-    def setup(self, **kwargs):
+    def setup(self, processes=1, **kwargs):
         """
         This is a cache warmup such that child process inherit from the
-        loaded index.
+        loaded index. If the index is built, use up to the requested number of
+        scan ``processes``.
         """
         from licensedcode.cache import populate_cache
-        populate_cache()
+        populate_cache(processes=max(processes or 1, 1))
 
     def get_scanner(
         self,
@@ -10,6 +10,7 @@
 
 import re
 
+from array import array
 from collections import defaultdict
 from collections import deque
 from functools import partial
@@ -107,6 +108,10 @@ MAX_TOKEN_PER_LINE = 25
 # or non-legalese/junk lines
 LINES_THRESHOLD = 4
 
+# Marker used in place of a token id for stopwords when tokenizing a query line.
+# Stopwords are not tracked as tokens, only their positions are.
+STOPWORD_TID = -1
+
 
 def build_query(
     location=None,
@@ -181,13 +186,15 @@ class Query(object):
         'unknowns_by_pos',
         'unknowns_span',
         'stopwords_by_pos',
-        'shorts_and_digits_pos',
+        '_shorts_and_digits_pos',
         'query_runs',
         '_whole_query_run',
         'high_matchables',
         'low_matchables',
         'spdx_lid_token_ids',
         'spdx_lines',
+        'text_lines',
+        'matched_text_tokens',
         'has_long_lines',
         'is_binary',
         'start_line',
@@ -224,11 +231,11 @@ class Query(object):
         # True if the query is binary
         self.is_binary = False
 
-        # known token ids array
-        self.tokens = []
+        # known token ids array of signed shorts, like the index rules token ids
+        self.tokens = array('h')
 
-        # index of known position -> line number where the pos is the list index
-        self.line_by_pos = []
+        # index of known position -> line number where the pos is the array index
+        self.line_by_pos = array('i')
 
         # index of "known positions" (yes really!) to a number of unknown tokens
         # after that known position. For unknowns at the start, the position is
@@ -244,9 +251,8 @@ class Query(object):
         self.stopwords_by_pos = {}
 
         # set of known positions were there is a short, single letter token or
-        # digits-only token
-        # TODO: consider using an intbitset
-        self.shorts_and_digits_pos = set()
+        # digits-only token. Computed lazily from the tokens
+        self._shorts_and_digits_pos = None
 
         # list of the three SPDX-License-Identifier tokens to identify to detect
         # a line for SPDX id matching.
@@ -276,6 +282,16 @@ class Query(object):
         # SPDX id matching
         self.spdx_lines = []
 
+        # list of (line number, text line) of the original text lines of this
+        # query, including their leading and trailing spaces. These are kept to
+        # build the matched texts without reading and extracting the query text
+        # again. Chunks of very long lines share the same line number.
+        self.text_lines = []
+
+        # list of matched text Token built from the text_lines on demand, once
+        # for all the matches of this query
+        self.matched_text_tokens = None
+
         self._whole_query_run = None
 
         # list of QueryRun objects. Does not include SPDX-related query runs
@@ -348,6 +364,20 @@ class Query(object):
         """
         return self.low_matchables | self.high_matchables
 
+    @property
+    def shorts_and_digits_pos(self):
+        """
+        Return a set of known token positions where there is a short, single
+        letter token or a digits-only token.
+        """
+        if self._shorts_and_digits_pos is None:
+            tokens_by_tid = self.idx.tokens_by_tid
+            self._shorts_and_digits_pos = set([
+                pos for pos, tid in enumerate(self.tokens)
+                if len(tokens_by_tid[tid]) == 1 or tokens_by_tid[tid].isdigit()
+            ])
+        return self._shorts_and_digits_pos
+
     @property
     def matched(self):
         """
@@ -368,7 +398,7 @@ class Query(object):
         Line numbers start at ``start_line`` which is 1-based by default.
 
         SIDE EFFECT: This populates the query `line_by_pos`, `unknowns_by_pos`,
-        `unknowns_span`, `stopwords_by_pos`, `shorts_and_digits_pos` and `spdx_lines` .
+        `unknowns_span`, `stopwords_by_pos`, `spdx_lines` and `text_lines`.
         """
         from licensedcode.match_spdx_lid import split_spdx_lid
         from licensedcode.stopwords import STOPWORDS
@@ -377,34 +407,30 @@ class Query(object):
         query_string = query_string or self.query_string
 
         # bind frequently called functions to local scope
-        line_by_pos_append = self.line_by_pos.append
+        line_by_pos_extend = self.line_by_pos.extend
+        text_lines_append = self.text_lines.append
 
         # we use a defaultdict as a convenience at construction time
         unknowns_by_pos = defaultdict(int)
-        unknowns_pos = set()
-        unknowns_pos_add = unknowns_pos.add
 
         # we use a defaultdict as a convenience at construction time
         stopwords_by_pos = defaultdict(int)
-        stopwords_pos = set()
-        stopwords_pos_add = stopwords_pos.add
 
-        self_shorts_and_digits_pos_add = self.shorts_and_digits_pos.add
         dic_get = self.idx.dictionary.get
+        stopwords_isdisjoint = STOPWORDS.isdisjoint
 
         # note: positions start at zero
-        # absolute position in a query, including only known tokens
+        # absolute position in a query, including only known tokens. Unknown
+        # tokens and stopwords that precede the first known token are counted
+        # in the magic "-1" position.
         known_pos = -1
 
-        # flag ifset to True when we have found the first known token globally
-        # across all query lines
-        started = False
-
         spdx_lid_token_ids = self.spdx_lid_token_ids
 
         qlines = query_lines(
             location=location,
             query_string=query_string,
+            strip=False,
             start_line=start_line,
         )
         if TRACE or TRACE_STOP_AND_UNKNOWN:
@@ -414,79 +440,51 @@ class Query(object):
                 logger_debug(' ', line_num, ':', line)
 
         for line_num, line in qlines:
+            text_lines_append((line_num, line))
+            line = line.strip()
+
             if TRACE_STOP_AND_UNKNOWN:
                 logger_debug(f'  line: {line_num}: {line!r}')
 
-            # keep track of tokens in a line
-            line_tokens = []
-            line_tokens_append = line_tokens.append
-            line_first_known_pos = None
-
-            for token in query_tokenizer(line):
-                tid = dic_get(token)
-                is_stopword = token in STOPWORDS
-
-                if TRACE_STOP_AND_UNKNOWN:
-                    logger_debug(
-                        f'    token: {token!r}, tid: {tid}, is_stopword: {is_stopword}')
-
-                if tid is not None and not is_stopword:
-                    # this is a known token
-                    known_pos += 1
-                    started = True
-                    line_by_pos_append(line_num)
-                    if len(token) == 1 or token.isdigit():
-                        self_shorts_and_digits_pos_add(known_pos)
-                    if line_first_known_pos is None:
-                        line_first_known_pos = known_pos
-
-                    if TRACE_STOP_AND_UNKNOWN:
-                        logger_debug(
-                            f'      KNOWN token: known_pos: {known_pos}')
-
-                else:
-                    # process STOPWORDS and unknown words
-                    if is_stopword:
-                        if not started:
-                            # If we have not yet started globally, then all tokens
-                            # seen so far are stopwords and we keep a count of them
-                            # in the magic "-1" position.
-                            stopwords_by_pos[-1] += 1
-
-                            if TRACE_STOP_AND_UNKNOWN:
-                                logger_debug(f'      STOPWORD token: known_pos: -1')
-                        else:
-                            # here we have a new unknwon token positioned right after
-                            # the current known_pos
-                            stopwords_by_pos[known_pos] += 1
-                            stopwords_pos_add(known_pos)
-
-                            if TRACE_STOP_AND_UNKNOWN:
-                                logger_debug(f'      STOPWORD token: known_pos: {known_pos}')
-
-                        # we do not track stopwords, only their position
-                        continue
+            # tokenize and lookup the token ids of a whole line at once: a
+            # token id is None for an unknown token
+            line_words = list(query_tokenizer(line))
+            line_tokens = list(map(dic_get, line_words))
+
+            if not stopwords_isdisjoint(line_words):
+                line_tokens = [
+                    STOPWORD_TID if word in STOPWORDS else tid
+                    for word, tid in zip(line_words, line_tokens)
+                ]
+
+            line_first_known_pos = known_pos + 1
+
+            if None in line_tokens or STOPWORD_TID in line_tokens:
+                # count the unknown tokens and stopwords positioned right
+                # after the current known_pos
+                for tid in line_tokens:
+                    if tid is None:
+                        unknowns_by_pos[known_pos] += 1
+                    elif tid == STOPWORD_TID:
+                        stopwords_by_pos[known_pos] += 1
                     else:
-                        # this is an UNKNOWN word
-                        if not started:
-                            # If we have not yet started globally, then all tokens
-                            # seen so far are unknowns and we keep a count of them
-                            # in the magic "-1" position.
-                            unknowns_by_pos[-1] += 1
+                        known_pos += 1
 
-                            if TRACE_STOP_AND_UNKNOWN:
-                                logger_debug(f'      UNKNOWN token: known_pos: -1')
+                # we do not track stopwords, only their position
+                line_tokens = [tid for tid in line_tokens if tid != STOPWORD_TID]
 
-                        else:
-                            # here we have a new unknwon token positioned right after
-                            # the current known_pos
-                            unknowns_by_pos[known_pos] += 1
-                            unknowns_pos_add(known_pos)
+            else:
+                # the common case of a line with only known tokens
+                known_pos += len(line_tokens)
 
-                            if TRACE_STOP_AND_UNKNOWN:
-                                logger_debug(f'      UNKNOWN token: known_pos: {known_pos}')
+            if TRACE_STOP_AND_UNKNOWN:
+                logger_debug(f'    tokens: {line_tokens}, known_pos: {known_pos}')
 
-                line_tokens_append(tid)
+            line_known_count = known_pos + 1 - line_first_known_pos
+            if line_known_count:
+                line_by_pos_extend([line_num] * line_known_count)
+            else:
+                line_first_known_pos = None
 
             # last known token position in the current line
             line_last_known_pos = known_pos
@@ -516,9 +514,9 @@ class Query(object):
             yield line_tokens
 
         # finally update the attributes and create a Span of positions followed
-        # by unkwnons and another for positions followed by stopwords used for
-        # intersection with the query span to do the scoring matches correctly
-        self.unknowns_span = Span(unknowns_pos)
+        # by unkwnons used for intersection with the query span to do the
+        # scoring matches correctly
+        self.unknowns_span = Span(pos for pos in unknowns_by_pos if pos >= 0)
         # also convert the defaultdicts back to plain discts
         self.unknowns_by_pos = dict(unknowns_by_pos)
         self.stopwords_by_pos = dict(stopwords_by_pos)
@@ -584,7 +582,7 @@ class Query(object):
         pos = 0
 
         # bind frequently called functions to local scope
-        tokens_append = self.tokens.append
+        tokens_extend = self.tokens.extend
         query_runs_append = self.query_runs.append
 
         if self.location:
@@ -610,31 +608,25 @@ class Query(object):
                 empty_lines += 1
                 continue
 
-            line_has_known_tokens = False
-            line_has_good_tokens = False
-            line_is_all_digit = all([
-                tid is None or tid in digit_only_tids for tid in tokens
-            ])
-
-            for token_id in tokens:
-                if token_id is not None:
-                    tokens_append(token_id)
-                    line_has_known_tokens = True
-                    if token_id < len_legalese:
-                        line_has_good_tokens = True
-                    query_run.end = pos
-                    pos += 1
+            if None in tokens:
+                tokens = [tid for tid in tokens if tid is not None]
 
-            if line_is_all_digit:
-                # close current run and start new query run
+            if not tokens:
+                # a line with only unknown tokens
                 empty_lines += 1
                 continue
 
-            if not line_has_known_tokens:
+            tokens_extend(tokens)
+            pos += len(tokens)
+            query_run.end = pos - 1
+
+            if all(map(digit_only_tids.__contains__, tokens)):
+                # close current run and start new query run
                 empty_lines += 1
                 continue
 
-            if line_has_good_tokens:
+            if min(tokens) < len_legalese:
+                # the line has good tokens
                 empty_lines = 0
             else:
                 empty_lines += 1
@@ -797,7 +789,8 @@ class QueryRun(object):
         Return True if this query run contains only digit tokens.
         """
         # FIXME: this should be cached
-        return intbitset(self.tokens).issubset(self.digit_only_tids)
+        # note: an intbitset built from an array is loaded from its bytes
+        return intbitset(list(self.tokens)).issubset(self.digit_only_tids)
 
     def is_matchable(self, include_low=False, qspans=None):
         """
@@ -816,9 +809,9 @@ class QueryRun(object):
         if not qspans:
             return matchables
 
-        matched = intbitset.union(*[q._set for q in qspans])
+        matched = Span().union(*qspans)
         matchables = intbitset(matchables)
-        matchables.difference_update(matched)
+        matchables.difference_update(matched.set)
         return matchables
 
     @property
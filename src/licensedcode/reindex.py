@@ -58,6 +58,7 @@ def reindex_licenses(
     """Reindex scancode licenses and exit"""
 
     from licensedcode.cache import get_index
+    from licensedcode.cache import LICENSE_INDEX_PROCESSES
     click.echo('Rebuilding the license index...')
     if load_dump:
         load_dump_licenses()
@@ -65,7 +66,8 @@ def reindex_licenses(
         only_builtin=only_builtin,
         force=True,
         index_all_languages=bool(all_languages),
-        additional_directory=additional_directory
+        additional_directory=additional_directory,
+        processes=LICENSE_INDEX_PROCESSES,
     )
     click.echo('Done.')
 
@@ -27,14 +27,15 @@
 # those of the authors and should not be interpreted as representing official
 # policies, either expressed or implied, of Matt Chaput.
 
+from bisect import bisect_right
 from collections.abc import Set
-from itertools import count
-from itertools import groupby
+from itertools import chain
+from sys import maxsize
 
 from intbitset import intbitset
 
 """
-Ranges and intervals of integers using bitmaps.
+Ranges and intervals of integers stored as runs of contiguous integers.
 Used as a compact and faster data structure for token and position sets.
 """
 
@@ -44,9 +45,15 @@ class Span(Set):
     Represent ranges of integers (such as tokens positions) as a set of integers.
     A Span is hashable and not meant to be modified once created, like a frozenset.
     It is equivalent to a sparse closed interval.
+
+    A Span is stored as a sorted tuple of (start, end) closed runs of contiguous
+    integers. Most spans are made of a few runs and their operations run in
+    proportion of the number of runs rather than the number of integers.
     Originally derived and heavily modified from Whoosh Span.
     """
 
+    __slots__ = ('_runs', '_len', '_set',)
+
     def __init__(self, *args):
         """
         Create a new Span from a start and end ints or an iterable of ints.
@@ -95,50 +102,93 @@ class Span(Set):
         True
         >>> hash(Span([5, 6, 7, 8, 9, 10 ,11, 12])) == hash(Span(5, 12))
         True
+        >>> Span(range(3, 7)) == Span(3, 6)
+        True
+        >>> len(Span(5, 4))
+        0
         """
         len_args = len(args)
 
         if len_args == 0:
-            self._set = intbitset()
+            runs = ()
 
         elif len_args == 1:
             # args0 is a single int or an iterable of ints
-            if isinstance(args[0], int):
-                self._set = intbitset(args)
+            arg = args[0]
+            if isinstance(arg, int):
+                runs = ((arg, arg),)
+            elif isinstance(arg, Span):
+                runs = arg._runs
+            elif isinstance(arg, range) and arg.step == 1:
+                runs = ((arg.start, arg.stop - 1),) if arg else ()
             else:
                 # some sequence or iterable
-                self._set = intbitset(list(args[0]))
+                runs = runs_from_ints(arg)
 
         elif len_args == 2:
             # args0 and args1 describe a start and end closed range
-            self._set = intbitset(range(args[0], args[1] + 1))
+            start, end = args
+            runs = ((start, end),) if start <= end else ()
 
         else:
-            # args0 is a single int or args is an iterable of ints
             # args is an iterable of ints
-            self._set = intbitset(list(args))
+            runs = runs_from_ints(args)
+
+        self._runs = runs
+        self._len = runs_length(runs)
+        self._set = None
+
+    @classmethod
+    def _from_runs(cls, runs):
+        """
+        Return a new Span from a ``runs`` tuple of sorted and non-touching
+        (start, end) runs.
+        """
+        span = cls.__new__(cls)
+        span._runs = runs
+        span._len = runs_length(runs)
+        span._set = None
+        return span
 
     @classmethod
     def _from_iterable(cls, it):
         return cls(list(it))
 
+    def __getstate__(self):
+        return self._runs
+
+    def __setstate__(self, runs):
+        if not isinstance(runs, tuple):
+            # such as a Span pickled in a cache by a previous version
+            raise TypeError(f'Invalid Span state: {runs!r}')
+        self._runs = runs
+        self._len = runs_length(runs)
+        self._set = None
+
     def __len__(self):
-        return len(self._set)
+        return self._len
 
     def __iter__(self):
-        return iter(self._set)
+        runs = self._runs
+        if len(runs) == 1:
+            start, end = runs[0]
+            return iter(range(start, end + 1))
+        return chain.from_iterable(range(start, end + 1) for start, end in runs)
 
     def __hash__(self):
-        return hash(tuple(self._set))
+        return hash(self._runs)
 
     def __eq__(self, other):
-        return isinstance(other, Span) and self._set == other._set
+        return isinstance(other, Span) and self._runs == other._runs
 
     def __and__(self, *others):
-        return Span(self._set.intersection(*[o._set for o in others]))
+        runs = self._runs
+        for other in others:
+            runs = intersection_runs(runs, other._runs)
+        return Span._from_runs(runs)
 
     def __or__(self, *others):
-        return Span(self._set.union(*[o._set for o in others]))
+        return Span._from_runs(union_runs(self._runs, *[o._runs for o in others]))
 
     def union(self, *others):
         """
@@ -151,8 +201,15 @@ class Span(Set):
         """
         Return the difference of two or more spans as a new span.
         (i.e. all positions that are in this span but not the others.)
+
+        For example:
+        >>> Span(1, 10).difference(Span(3, 4), Span([6, 9, 12]))
+        Span(1, 2)|Span(5)|Span(7, 8)|Span(10)
         """
-        return Span(self._set.difference(*[o._set for o in others]))
+        runs = self._runs
+        for other in others:
+            runs = difference_runs(runs, other._runs)
+        return Span._from_runs(runs)
 
     def __repr__(self):
         """
@@ -164,14 +221,11 @@ class Span(Set):
         Span(1, 5)|Span(7, 10)
         """
         subspans_repr = []
-        for subs in  self.subspans():
-            ls = len(subs)
-            if not ls:
-                subspans_repr.append('Span()')
-            elif ls == 1:
-                subspans_repr.append('Span(%d)' % subs.start)
+        for start, end in self._runs:
+            if start == end:
+                subspans_repr.append('Span(%d)' % start)
             else:
-                subspans_repr.append('Span(%d, %d)' % (subs.start, subs.end))
+                subspans_repr.append('Span(%d, %d)' % (start, end))
         return '|'.join(subspans_repr)
 
     def __contains__(self, other):
@@ -196,40 +250,57 @@ class Span(Set):
         True
         >>> set([9]) in Span([4, 8])
         False
+        >>> Span([2, 3, 7]) in Span([1, 2, 3, 4, 7])
+        True
+        >>> Span([2, 3, 6]) in Span([1, 2, 3, 4, 7])
+        False
         """
-        if isinstance(other, Span):
-            return self._set.issuperset(other._set)
-
         if isinstance(other, int):
-            return self._set.__contains__(other)
+            return contains_int(self._runs, other)
 
-        if isinstance(other, (set, frozenset)):
-            return self._set.issuperset(intbitset(other))
+        if isinstance(other, Span):
+            return contains_runs(self._runs, other._runs)
 
-        if isinstance(other, intbitset):
-            return self._set.issuperset(other)
+        if isinstance(other, (set, frozenset, intbitset)):
+            runs = self._runs
+            return all(contains_int(runs, i) for i in other)
 
     @property
     def set(self):
-        return self._set
+        """
+        Return an intbitset of the integers of this span. This intbitset is
+        built once on first access and is shared: it must not be modified.
+        """
+        ints = self._set
+        if ints is None:
+            ints = self._set = intbitset(list(self))
+        return ints
+
+    @property
+    def runs(self):
+        """
+        Return a tuple of (start, end) closed runs of contiguous integers of
+        this span.
+        """
+        return self._runs
 
     def issubset(self, other):
-        return self._set.issubset(other._set)
+        return contains_runs(other._runs, self._runs)
 
     def issuperset(self, other):
-        return self._set.issuperset(other._set)
+        return contains_runs(self._runs, other._runs)
 
     @property
     def start(self):
-        if not self._set:
+        if not self._runs:
             raise TypeError('Empty Span has no start.')
-        return self._set[0]
+        return self._runs[0][0]
 
     @property
     def end(self):
-        if not self._set:
+        if not self._runs:
             raise TypeError('Empty Span has no end.')
-        return self._set[-1]
+        return self._runs[-1][1]
 
     @classmethod
     def sort(cls, spans):
@@ -284,9 +355,10 @@ class Span(Set):
         >>> Span([0]).magnitude()
         1
         """
-        if not self._set:
+        runs = self._runs
+        if not runs:
             return 0
-        return self.end - self.start + 1
+        return runs[-1][1] - runs[0][0] + 1
 
     def density(self):
         """
@@ -305,9 +377,9 @@ class Span(Set):
         >>> Span().density()
         0
         """
-        if not self._set:
+        if not self._runs:
             return 0
-        return len(self) / self.magnitude()
+        return self._len / self.magnitude()
 
     def overlap(self, other):
         """
@@ -326,19 +398,22 @@ class Span(Set):
         1
         >>> Span([4, 5]).overlap(Span([6, 7]))
         0
+        >>> Span([1, 2, 3, 7, 8, 9]).overlap(Span([2, 3, 4, 5, 6, 7, 8]))
+        4
         """
-        return len(self & other)
+        return overlap_runs(self._runs, other._runs)
 
     def resemblance(self, other):
         """
         Return a resemblance coefficient as a float between 0 and 1.
         0 means the spans are completely different and 1 identical.
         """
-        if self._set.isdisjoint(other._set):
+        overlap = self.overlap(other)
+        if not overlap:
             return 0
-        if self._set == other._set:
+        if self._runs == other._runs:
             return 1
-        resemblance = self.overlap(other) / len(self | other)
+        resemblance = overlap / len(self | other)
         return resemblance
 
     def containment(self, other):
@@ -348,11 +423,12 @@ class Span(Set):
             - 1 means the other span is entirely contained in this span.
             - 0 means that the other span is not contained at all this span.
         """
-        if self._set.isdisjoint(other._set):
+        overlap = self.overlap(other)
+        if not overlap:
             return 0
-        if self._set == other._set:
+        if self._runs == other._runs:
             return 1
-        containment = self.overlap(other) / len(other)
+        containment = overlap / len(other)
         return containment
 
     def surround(self, other):
@@ -423,16 +499,22 @@ class Span(Set):
         >>> Span([1, 2]).distance_to(Span(range(4, 52)))
         2
         """
+        start = self.start
+        end = self.end
+        other_start = other.start
+        other_end = other.end
+
+        # disjoint bounds: touching spans have a distance of one
+        if end < other_start:
+            return other_start - end
+        if other_end < start:
+            return start - other_end
+
         if self.overlap(other):
             return 0
 
-        if self.touch(other):
-            return 1
-
-        if self.is_before(other):
-            return other.start - self.end
-        else:
-            return self.start - other.end
+        # interleaved spans without common positions
+        return start - other_end
 
     @staticmethod
     def from_ints(ints):
@@ -447,9 +529,7 @@ class Span(Set):
         >>> Span.from_ints([0, 2, 3, 5, 6, 7, 8, 9, 10, 11, 13])
         [Span(0), Span(2, 3), Span(5, 11), Span(13)]
         """
-        ints = sorted(set(ints))
-        groups = (group for _, group in groupby(ints, lambda group, c=count(): next(c) - group))
-        return [Span(g) for g in groups]
+        return [Span._from_runs((run,)) for run in runs_from_ints(ints)]
 
     def subspans(self):
         """
@@ -471,4 +551,205 @@ class Span(Set):
         >>> span.subspans()
         [Span(12), Span(15, 17), Span(24), Span(35), Span(58), Span(63, 64)]
         """
-        return Span.from_ints(self)
+        return [Span._from_runs((run,)) for run in self._runs]
+
+
+def runs_length(runs):
+    """
+    Return the number of integers in a ``runs`` sequence of (start, end) runs.
+    """
+    if len(runs) == 1:
+        start, end = runs[0]
+        return end - start + 1
+    return sum(end - start + 1 for start, end in runs)
+
+
+def runs_from_ints(ints):
+    """
+    Return a tuple of sorted and non-touching (start, end) runs of contiguous
+    integers from an iterable of ``ints``.
+
+    For example:
+    >>> runs_from_ints([1, 2, 3, 5, 7, 8])
+    ((1, 3), (5, 5), (7, 8))
+    >>> runs_from_ints([8, 7, 5, 1, 3, 2, 3])
+    ((1, 3), (5, 5), (7, 8))
+    >>> runs_from_ints([])
+    ()
+    """
+    runs = []
+    runs_append = runs.append
+    ints = iter(ints)
+    start = end = None
+    for i in ints:
+        if end is None:
+            start = end = i
+        elif i == end + 1:
+            end = i
+        elif i > end:
+            runs_append((start, end))
+            start = end = i
+        else:
+            # not sorted or with duplicates: sort all the items
+            items = set(chain.from_iterable(range(s, e + 1) for s, e in runs))
+            items.update(range(start, end + 1))
+            items.add(i)
+            items.update(ints)
+            return runs_from_ints(sorted(items))
+
+    if end is not None:
+        runs_append((start, end))
+    return tuple(runs)
+
+
+def union_runs(*runs_seqs):
+    """
+    Return a tuple of runs that is the union of ``runs_seqs`` sequences of runs.
+
+    For example:
+    >>> union_runs(((1, 3), (8, 9)), ((4, 5),), ((7, 7), (12, 12)))
+    ((1, 5), (7, 9), (12, 12))
+    """
+    if len(runs_seqs) == 1:
+        return tuple(runs_seqs[0])
+
+    merged = []
+    merged_append = merged.append
+    current_start = current_end = None
+    for start, end in sorted(chain.from_iterable(runs_seqs)):
+        if current_end is not None and start <= current_end + 1:
+            if end > current_end:
+                current_end = end
+        else:
+            if current_end is not None:
+                merged_append((current_start, current_end))
+            current_start = start
+            current_end = end
+
+    if current_end is not None:
+        merged_append((current_start, current_end))
+    return tuple(merged)
+
+
+def intersection_runs(runs1, runs2):
+    """
+    Return a tuple of runs that is the intersection of the ``runs1`` and
+    ``runs2`` sequences of runs.
+
+    For example:
+    >>> intersection_runs(((1, 5), (7, 9)), ((3, 8),))
+    ((3, 5), (7, 8))
+    """
+    result = []
+    result_append = result.append
+    i = j = 0
+    len1 = len(runs1)
+    len2 = len(runs2)
+    while i < len1 and j < len2:
+        start1, end1 = runs1[i]
+        start2, end2 = runs2[j]
+        start = start1 if start1 > start2 else start2
+        end = end1 if end1 < end2 else end2
+        if start <= end:
+            result_append((start, end))
+        if end1 < end2:
+            i += 1
+        else:
+            j += 1
+    return tuple(result)
+
+
+def overlap_runs(runs1, runs2):
+    """
+    Return the number of integers common to the ``runs1`` and ``runs2``
+    sequences of runs.
+    """
+    overlap = 0
+    i = j = 0
+    len1 = len(runs1)
+    len2 = len(runs2)
+    while i < len1 and j < len2:
+        start1, end1 = runs1[i]
+        start2, end2 = runs2[j]
+        start = start1 if start1 > start2 else start2
+        end = end1 if end1 < end2 else end2
+        if start <= end:
+            overlap += end - start + 1
+        if end1 < end2:
+            i += 1
+        else:
+            j += 1
+    return overlap
+
+
+def difference_runs(runs1, runs2):
+    """
+    Return a tuple of runs with the integers of the ``runs1`` sequence of runs
+    that are not in the ``runs2`` sequence of runs.
+
+    For example:
+    >>> difference_runs(((1, 10), (12, 15)), ((3, 4), (8, 13)))
+    ((1, 2), (5, 7), (14, 15))
+    """
+    result = []
+    result_append = result.append
+    j = 0
+    len2 = len(runs2)
+    for start, end in runs1:
+        # skip the runs ending before this run
+        while j < len2 and runs2[j][1] < start:
+            j += 1
+
+        current = start
+        k = j
+        while k < len2:
+            start2, end2 = runs2[k]
+            if start2 > end:
+                break
+            if start2 > current:
+                result_append((current, start2 - 1))
+            if end2 + 1 > current:
+                current = end2 + 1
+            if end2 >= end:
+                break
+            k += 1
+
+        if current <= end:
+            result_append((current, end))
+    return tuple(result)
+
+
+def contains_int(runs, i):
+    """
+    Return True if the ``i`` integer is in the ``runs`` sequence of runs.
+    """
+    if len(runs) == 1:
+        start, end = runs[0]
+        return start <= i <= end
+    index = bisect_right(runs, (i, maxsize)) - 1
+    return index >= 0 and runs[index][1] >= i
+
+
+def contains_runs(runs1, runs2):
+    """
+    Return True if all the integers of the ``runs2`` sequence of runs are in the
+    ``runs1`` sequence of runs.
+
+    For example:
+    >>> contains_runs(((1, 5), (7, 9)), ((2, 3), (7, 7)))
+    True
+    >>> contains_runs(((1, 5), (7, 9)), ((2, 3), (6, 7)))
+    False
+    """
+    i = 0
+    len1 = len(runs1)
+    for start2, end2 in runs2:
+        # skip the runs ending before this run
+        while i < len1 and runs1[i][1] < start2:
+            i += 1
+        if i == len1:
+            return False
+        start1, end1 = runs1[i]
+        if start2 < start1 or end2 > end1:
+            return False
+    return True
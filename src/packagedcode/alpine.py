@@ -27,6 +27,7 @@ from packagedcode.licensing import get_declared_license_expression_spdx
 from packagedcode.licensing import get_license_detections_and_expression
 from packagedcode.utils import combine_expressions
 from packagedcode.utils import get_ancestor
+from packagedcode.utils import get_descendants
 from textcode.analysis import as_unicode
 
 
@@ -97,11 +98,7 @@ class AlpineInstalledDatabaseHandler(models.DatafileHandler):
         }
 
         resources = []
-        for res in root_resource.walk(codebase):
-            ref = file_references_by_path.get(res.path)
-            if not ref:
-                continue
-
+        for res in get_descendants(file_references_by_path, root_resource, codebase):
             # path is found and processed: remove it, so we can check if we
             # found all of them
             del file_references_by_path[res.path]
@@ -21,6 +21,8 @@ from packageurl import PackageURL
 
 from packagedcode import models
 from packagedcode.utils import get_ancestor
+from packagedcode.utils import get_descendants
+from packagedcode.utils import get_descendants_with_suffix
 from packagedcode.utils import parse_maintainer_name_email
 
 """
@@ -311,11 +313,9 @@ class DebianInstalledStatusDatabaseHandler(models.DatafileHandler):
         ]))
         resources = []
         # TODO: keep track of missing files
-        for res in root_resource.walk(codebase):
+        for res in get_descendants_with_suffix(assemblable_paths, root_resource, codebase):
             if TRACE:
                 logger_debug(f'   debian: assemble: root_walk: res: {res}')
-            if not res.path.endswith(assemblable_paths):
-                continue
 
             for pkgdt in res.package_data:
                 package_data = models.PackageData.from_dict(pkgdt)
@@ -368,11 +368,7 @@ class DebianInstalledStatusDatabaseHandler(models.DatafileHandler):
             else:
                 file_references_by_path[ref_path] = ref
 
-        for res in root_resource.walk(codebase):
-            ref = file_references_by_path.get(res.path)
-            if not ref:
-                continue
-
+        for res in get_descendants(file_references_by_path, root_resource, codebase):
             # path is found and processed: remove it, so we can check if we found all of them
             del file_references_by_path[res.path]
             package_adder(package_uid, res, codebase)
@@ -442,10 +438,7 @@ class DebianDistrolessInstalledDatabaseHandler(models.DatafileHandler):
         )
         resources = []
         if package_uid:
-            for res in root_resource.walk(codebase):
-                if not res.path.endswith(assemblable_paths):
-                    continue
-
+            for res in get_descendants_with_suffix(assemblable_paths, root_resource, codebase):
                 for pkgdt in res.package_data:
                     package.update(
                         package_data=pkgdt,
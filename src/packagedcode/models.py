@@ -10,6 +10,7 @@
 import os
 import uuid
 from fnmatch import fnmatchcase
+from functools import lru_cache
 import logging
 import sys
 
@@ -799,36 +800,7 @@ class PackageData(IdentifiablePackageData):
         if not self.copyright:
             return
 
-        from cluecode.copyrights import CopyrightDetector
-
-        numbered_lines = list(enumerate(self.copyright.split("\n"), start=1))
-        detector = CopyrightDetector()
-        holders = list(
-            detector.detect(
-                numbered_lines,
-                include_copyrights=False,
-                include_holders=True,
-                include_authors=False,
-            )
-        )
-        # If no holder detected, prefix each copyright statement with `Copyright`
-        if not holders:
-            numbered_lines = [
-                (count, f"Copyright {value}") for count, value in numbered_lines
-            ]
-            holders = list(
-                detector.detect(
-                    numbered_lines,
-                    include_copyrights=False,
-                    include_holders=True,
-                    include_authors=False,
-                )
-            )
-        # If still no holder, then populate holder with copyright field
-        self.holder = (
-            "\n".join([holder_detection.holder for holder_detection in holders])
-            or self.copyright
-        )
+        self.holder = get_holder_from_copyright(self.copyright)
 
     def populate_license_fields(self):
         """
@@ -976,6 +948,46 @@ class PackageData(IdentifiablePackageData):
         )
 
 
+@lru_cache(maxsize=10000)
+def get_holder_from_copyright(copyright):
+    """
+    Return a holder string detected in a ``copyright`` string or the
+    ``copyright`` itself if no holder is detected. Results are cached as the
+    same copyright statements recur across the packages of a system package
+    database.
+    """
+    from cluecode.copyrights import get_detector
+
+    detector = get_detector()
+    numbered_lines = list(enumerate(copyright.split("\n"), start=1))
+    holders = list(
+        detector.detect(
+            numbered_lines,
+            include_copyrights=False,
+            include_holders=True,
+            include_authors=False,
+        )
+    )
+    # If no holder detected, prefix each copyright statement with `Copyright`
+    if not holders:
+        numbered_lines = [
+            (count, f"Copyright {value}") for count, value in numbered_lines
+        ]
+        holders = list(
+            detector.detect(
+                numbered_lines,
+                include_copyrights=False,
+                include_holders=True,
+                include_authors=False,
+            )
+        )
+    # If still no holder, then populate holder with copyright field
+    return (
+        "\n".join([holder_detection.holder for holder_detection in holders])
+        or copyright
+    )
+
+
 def get_default_relation_license(datasource_id):
     from packagedcode import HANDLER_BY_DATASOURCE_ID
     handler = HANDLER_BY_DATASOURCE_ID.get(datasource_id, None)
@@ -36,6 +36,7 @@ from packagedcode.models import Dependency
 from packagedcode.models import Package
 from packagedcode.models import PackageData
 from packagedcode.models import PackageWithResources
+from packagedcode.utils import resource_index
 
 TRACE = os.environ.get('SCANCODE_DEBUG_PACKAGE_API', False)
 TRACE_ASSEMBLY = os.environ.get('SCANCODE_DEBUG_PACKAGE_ASSEMBLY', False)
@@ -378,77 +379,80 @@ def get_package_and_deps(codebase, package_adder=add_to_package, strip_root=Fals
 
     seen_resource_paths = set()
 
-    has_single_resource = codebase.has_single_resource
-    # track resource ids that have been already processed
-    for resource in codebase.walk(topdown=False):
-        if not resource.package_data:
-            continue
-
-        if resource.path in seen_resource_paths:
-            continue
-
-        if TRACE_ASSEMBLY:
-            logger_debug('get_package_and_deps: location:', resource.location)
+    # index the codebase paths once for all the handlers that look up the
+    # resources of file references or of known paths
+    with resource_index(codebase):
+        has_single_resource = codebase.has_single_resource
+        # track resource ids that have been already processed
+        for resource in codebase.walk(topdown=False):
+            if not resource.package_data:
+                continue
 
-        for package_data in resource.package_data:
-            try:
-                package_data = PackageData.from_dict(mapping=package_data)
+            if resource.path in seen_resource_paths:
+                continue
 
-                if TRACE_ASSEMBLY:
-                    logger_debug('  get_package_and_deps: package_data:', package_data)
+            if TRACE_ASSEMBLY:
+                logger_debug('get_package_and_deps: location:', resource.location)
 
-                # Find a handler for this package datasource to assemble collect
-                # packages and deps
-                handler = get_package_handler(package_data)
-                if TRACE_ASSEMBLY:
-                    logger_debug('  get_package_and_deps: handler:', handler)
+            for package_data in resource.package_data:
+                try:
+                    package_data = PackageData.from_dict(mapping=package_data)
 
-                items = handler.assemble(
-                    package_data=package_data,
-                    resource=resource,
-                    codebase=codebase,
-                    package_adder=package_adder,
-                )
+                    if TRACE_ASSEMBLY:
+                        logger_debug('  get_package_and_deps: package_data:', package_data)
 
-                for item in items:
+                    # Find a handler for this package datasource to assemble collect
+                    # packages and deps
+                    handler = get_package_handler(package_data)
                     if TRACE_ASSEMBLY:
-                        logger_debug('    get_package_and_deps: item:', item)
-
-                    if isinstance(item, Package):
-                        if strip_root and not has_single_resource:
-                            item.datafile_paths = [
-                                strip_first_path_segment(dfp)
-                                for dfp in item.datafile_paths
-                            ]
-                        packages.append(item)
-                        if TRACE:
-                            logger_debug('    get_package_and_deps: Package:', item.purl)
-
-                    elif isinstance(item, Dependency):
-                        if strip_root and not has_single_resource:
-                            item.datafile_path = strip_first_path_segment(item.datafile_path)
-                        dependencies.append(item)
-
-                    elif isinstance(item, Resource):
-                        seen_resource_paths.add(item.path)
+                        logger_debug('  get_package_and_deps: handler:', handler)
+
+                    items = handler.assemble(
+                        package_data=package_data,
+                        resource=resource,
+                        codebase=codebase,
+                        package_adder=package_adder,
+                    )
 
+                    for item in items:
                         if TRACE_ASSEMBLY:
-                            logger_debug(
-                                '    get_package_and_deps: seen_resource_path:',
-                                seen_resource_paths,
-                            )
-
-                    else:
-                        raise Exception(f'Unknown package assembly item type: {item!r}')
-
-            except Exception as e:
-                import traceback
-                msg = f'get_package_and_deps: Failed to assemble PackageData: {package_data}:\n'
-                msg += traceback.format_exc()
-                resource.scan_errors.append(msg)
-                resource.save(codebase)
-
-                if TRACE:
-                    raise Exception(msg) from e
+                            logger_debug('    get_package_and_deps: item:', item)
+
+                        if isinstance(item, Package):
+                            if strip_root and not has_single_resource:
+                                item.datafile_paths = [
+                                    strip_first_path_segment(dfp)
+                                    for dfp in item.datafile_paths
+                                ]
+                            packages.append(item)
+                            if TRACE:
+                                logger_debug('    get_package_and_deps: Package:', item.purl)
+
+                        elif isinstance(item, Dependency):
+                            if strip_root and not has_single_resource:
+                                item.datafile_path = strip_first_path_segment(item.datafile_path)
+                            dependencies.append(item)
+
+                        elif isinstance(item, Resource):
+                            seen_resource_paths.add(item.path)
+
+                            if TRACE_ASSEMBLY:
+                                logger_debug(
+                                    '    get_package_and_deps: seen_resource_path:',
+                                    seen_resource_paths,
+                                )
+
+                        else:
+                            raise Exception(f'Unknown package assembly item type: {item!r}')
+
+                except Exception as e:
+                    import traceback
+                    msg = f'get_package_and_deps: Failed to assemble PackageData: {package_data}:\n'
+                    msg += traceback.format_exc()
+                    resource.scan_errors.append(msg)
+                    resource.save(codebase)
+
+                    if TRACE:
+                        raise Exception(msg) from e
 
     return packages, dependencies
@@ -440,48 +440,16 @@ class PythonInstalledWheelMetadataFile(models.DatafileHandler):
 def get_resource_for_path(path, root, codebase):
     """
     Return a resource in ``codebase`` that has a ``path`` relative to the
-    ``root` Resource
-
-    For example, say we start from this:
-        path: this/is/that therefore segments [this, is, that]
-        root: /usr/foo
-
-    We would have these iterations:
-    iteration1
-        root = /usr/foo
-        segments = [this, is, that]
-        seg  this
-        segments = [is, that]
-        children = [/usr/foo/this]
-        root = /usr/foo/this
-
-    iteration2
-        root = /usr/foo/this
-        segments = [is, that]
-        seg  is
-        segments = [that]
-        children = [/usr/foo/this/is]
-        root = /usr/foo/this/is
-
-    iteration3
-        root = /usr/foo/this/is
-        segments = [that]
-        seg  that
-        segments = []
-        children = [/usr/foo/this/is/that]
-        root = /usr/foo/this/is/that
+    ``root` Resource or None.
 
-    finally return root as /usr/foo/this/is/that
+    For example, with a path of `this/is/that` and a root of `/usr/foo`, return
+    the `/usr/foo/this/is/that` resource.
     """
-    segments = path.strip('/').split('/')
-    while segments:
-        seg = segments.pop(0)
-        children = [c for c in root.children(codebase) if c.name == seg]
-        if len(children) != 1:
-            return
-        else:
-            root = children[0]
-    return root
+    path = path.strip('/')
+    segments = path.split('/')
+    if not path or '.' in segments or '..' in segments or '' in segments:
+        return
+    return codebase.get_resource(path=f'{root.path}/{path}')
 
 
 class PyprojectTomlHandler(BaseExtractedPythonLayout):
@@ -7,8 +7,12 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+from contextlib import contextmanager
+
 from packageurl import PackageURL
 
+from licensedcode.expression_cache import get_expression_cache
+
 try:
     from license_expression import Licensing
     from license_expression import combine_expressions as le_combine_expressions
@@ -145,7 +149,21 @@ def combine_expressions(
     """
     if not licensing:
         raise Exception('combine_expressions: cannot combine combine_expressions without license_expression package.')
-    return expressions and str(le_combine_expressions(expressions, relation, unique, licensing)) or None
+    if not expressions:
+        return None
+
+    expressions = list(expressions)
+    if all(isinstance(expression, str) for expression in expressions):
+        cache = get_expression_cache(licensing)
+        key = tuple(expressions), relation, unique
+        return cache.get(_combine_expressions, key, licensing)
+
+    return str(le_combine_expressions(expressions, relation, unique, licensing)) or None
+
+
+def _combine_expressions(key, licensing):
+    expressions, relation, unique = key
+    return str(le_combine_expressions(list(expressions), relation, unique, licensing)) or None
 
 
 def get_ancestor(levels_up, resource, codebase):
@@ -194,6 +212,163 @@ def find_root_resource(path, resource, codebase):
     return resource
 
 
+class ResourceIndex:
+    """
+    An index of the Resource paths of a ``codebase`` to find the Resources of
+    known paths or file names without walking the codebase tree.
+
+    The index is built with a codebase walk on its first use and only contains
+    paths. The Resources are always fetched from the codebase such that they
+    reflect any change saved since the index was built. Resources must not be
+    added or removed from the codebase while an index is in use.
+    """
+
+    def __init__(self, codebase):
+        self.codebase = codebase
+        # mapping of {path: position in a top-down codebase walk}
+        self._rank_by_path = None
+        # mapping of {file name: [list of paths in walk order]}
+        self._paths_by_name = None
+
+    def _build(self):
+        rank_by_path = self._rank_by_path = {}
+        paths_by_name = self._paths_by_name = {}
+        for rank, resource in enumerate(self.codebase.walk(topdown=True)):
+            path = resource.path
+            rank_by_path[path] = rank
+            paths = paths_by_name.get(resource.name)
+            if paths is None:
+                paths_by_name[resource.name] = [path]
+            else:
+                paths.append(path)
+
+    @property
+    def rank_by_path(self):
+        if self._rank_by_path is None:
+            self._build()
+        return self._rank_by_path
+
+    @property
+    def paths_by_name(self):
+        if self._paths_by_name is None:
+            self._build()
+        return self._paths_by_name
+
+    @property
+    def is_built(self):
+        return self._rank_by_path is not None
+
+    def __contains__(self, path):
+        return path in self.rank_by_path
+
+    def get_descendants(self, paths, root):
+        """
+        Return a list of the Resources for the ``paths`` iterable of paths that
+        exist in the codebase and are descendants of the ``root`` Resource, in
+        the same order as a top-down ``root`` walk.
+        """
+        rank_by_path = self.rank_by_path
+        root_prefix = f'{root.path}/'
+        paths = set(
+            p for p in paths
+            if p in rank_by_path and p.startswith(root_prefix)
+        )
+        get_resource = self.codebase.get_resource
+        return [get_resource(path=p) for p in sorted(paths, key=rank_by_path.get)]
+
+    def get_descendants_with_suffix(self, suffixes, root):
+        """
+        Return a list of the Resources that are descendants of the ``root``
+        Resource and have a path that ends with one of the ``suffixes`` path
+        strings, in the same order as a top-down ``root`` walk.
+        """
+        paths = []
+        for suffix in suffixes:
+            _, _, name = suffix.rpartition('/')
+            paths.extend(p for p in self.paths_by_name.get(name, []) if p.endswith(suffix))
+        return self.get_descendants(paths, root)
+
+
+_resource_index = None
+
+
+@contextmanager
+def resource_index(codebase):
+    """
+    Context manager yielding a ResourceIndex for ``codebase``. This index is
+    returned by get_resource_index() for this ``codebase`` for the duration of
+    the ``with`` block and is built only if used. An enclosing ``with`` block
+    index for the same codebase is reused.
+    """
+    global _resource_index
+    previous = _resource_index
+    if not (previous and previous.codebase is codebase):
+        _resource_index = ResourceIndex(codebase)
+    try:
+        yield _resource_index
+    finally:
+        _resource_index = previous
+
+
+def get_resource_index(codebase):
+    """
+    Return the current ResourceIndex for ``codebase``. Raise an Exception if
+    this is not called in a resource_index() ``with`` block for this
+    ``codebase``, as building an index for a single lookup is slower than a
+    codebase walk.
+    """
+    index = _get_active_resource_index(codebase)
+    if not index:
+        raise Exception(
+            'get_resource_index: must be called in a resource_index(codebase) block.'
+        )
+    return index
+
+
+def _get_active_resource_index(codebase):
+    """
+    Return the ResourceIndex of the current resource_index() ``with`` block for
+    ``codebase`` or None.
+    """
+    index = _resource_index
+    if index and index.codebase is codebase:
+        return index
+
+
+def get_descendants(paths, root, codebase):
+    """
+    Return a list of the Resources for the ``paths`` iterable of paths that
+    exist in the ``codebase`` and are descendants of the ``root`` Resource, in
+    the same order as a top-down ``root`` walk.
+
+    Use the current ResourceIndex in a resource_index() ``with`` block for this
+    ``codebase`` and walk the ``root`` otherwise.
+    """
+    index = _get_active_resource_index(codebase)
+    if index:
+        return index.get_descendants(paths, root)
+
+    paths = set(paths)
+    return [res for res in root.walk(codebase) if res.path in paths]
+
+
+def get_descendants_with_suffix(suffixes, root, codebase):
+    """
+    Return a list of the Resources that are descendants of the ``root``
+    Resource and have a path that ends with one of the ``suffixes`` path
+    strings, in the same order as a top-down ``root`` walk.
+
+    Use the current ResourceIndex in a resource_index() ``with`` block for this
+    ``codebase`` and walk the ``root`` otherwise.
+    """
+    index = _get_active_resource_index(codebase)
+    if index:
+        return index.get_descendants_with_suffix(suffixes, root)
+
+    suffixes = tuple(suffixes)
+    return [res for res in root.walk(codebase) if res.path.endswith(suffixes)]
+
+
 def yield_dependencies_from_package_data(package_data, datafile_path, package_uid):
     """
     Yield a Dependency for each dependency from ``package_data.dependencies``
@@ -23,6 +23,7 @@ except ImportError:
     pass
 
 from packagedcode import models
+from packagedcode.utils import get_descendants
 
 # TODO: Find "boilerplate" files, what are the things that we do not care about, e.g. thumbs.db
 # TODO: check for chocolatey
@@ -414,11 +415,7 @@ class BaseRegInstalledProgramHandler(models.DatafileHandler):
             # a file ref extends from the root of the Windows filesystem
             refs_by_path[str(root_path / ref_path)] = ref
 
-        for res in root.walk(codebase):
-            ref = refs_by_path.get(res.path)
-            if not ref:
-                continue
-
+        for res in get_descendants(refs_by_path, root, codebase):
             if package_uid:
                 # path is found and processed: remove it, so we can check if we
                 # found all of them
@@ -85,6 +85,7 @@ def get_emails(
     threshold=50,
     test_slow_mode=False,
     test_error_mode=False,
+    clue_keys=('emails',),
     **kwargs,
 ):
     """
@@ -92,6 +93,9 @@ def get_emails(
     mappings for emails detected in the file at `location`.
     Return only up to `threshold` values. Return all values if `threshold` is 0.
 
+    Search the file at once for all the `clue_keys` clues such as "emails"
+    and "urls" when other clues are scanned too. See cluecode.finder.find_clues().
+
     If test_mode is True, the scan will be slow for testing purpose and pause
     for one second.
     """
@@ -105,7 +109,10 @@ def get_emails(
     from cluecode.finder import find_emails
     results = []
 
-    found_emails = ((em, ln) for (em, ln) in find_emails(location) if em)
+    found_emails = (
+        (em, ln) for (em, ln)
+        in find_emails(location, clue_keys=clue_keys) if em
+    )
     if threshold:
         found_emails = islice(found_emails, threshold)
 
@@ -118,16 +125,22 @@ def get_emails(
     return dict(emails=results)
 
 
-def get_urls(location, threshold=50, **kwargs):
+def get_urls(location, threshold=50, clue_keys=('urls',), **kwargs):
     """
     Return a mapping with a single 'urls' key with a value that is a list of
     mappings for urls detected in the file at `location`.
     Return only up to `threshold` values. Return all values if `threshold` is 0.
+
+    Search the file at once for all the `clue_keys` clues such as "emails"
+    and "urls" when other clues are scanned too. See cluecode.finder.find_clues().
     """
     from cluecode.finder import find_urls
     results = []
 
-    found_urls = ((u, ln) for (u, ln) in find_urls(location) if u)
+    found_urls = (
+        (u, ln) for (u, ln)
+        in find_urls(location, clue_keys=clue_keys) if u
+    )
     if threshold:
         found_urls = islice(found_urls, threshold)
 
@@ -155,6 +168,7 @@ def get_licenses(
     license_diagnostics=False,
     deadline=sys.maxsize,
     unknown_licenses=False,
+    file_context=None,
     **kwargs,
 ):
     """
@@ -175,10 +189,17 @@ def get_licenses(
     This is used to determine if a file contains mostly licensing.
 
     If ``unknown_licenses`` is True, also detect unknown licenses.
+
+    Use the optional textcode.analysis.FileContext `file_context` to report
+    the license matches and license expressions caches statistics and the
+    license matching stages timings if it collects timings.
     """
+    from licensedcode import expression_cache
     from licensedcode.cache import build_spdx_license_expression
     from licensedcode.cache import get_cache
+    from licensedcode.cache import get_index
     from licensedcode.detection import detect_licenses
+    from licensedcode.match_timings import MatchTimings
     from packagedcode.utils import combine_expressions
 
     license_clues = []
@@ -187,11 +208,20 @@ def get_licenses(
     detected_license_expression = None
     detected_license_expression_spdx = None
 
+    timings = None
+    if file_context and file_context.timings is not None:
+        timings = MatchTimings()
+
+    matches_cache = get_index().query_run_matches_cache
+    hits, misses = matches_cache.get_stats()
+    expressions_hits, expressions_misses = expression_cache.get_stats()
+
     detections = detect_licenses(
         location=location,
         min_score=min_score,
         deadline=deadline,
         unknown_licenses=unknown_licenses,
+        timings=timings,
         **kwargs,
     )
 
@@ -217,6 +247,15 @@ def get_licenses(
                 )
             )
 
+    if file_context:
+        new_hits, new_misses = matches_cache.get_stats()
+        counters = file_context.counters
+        counters['license_matches_cache_hits'] = new_hits - hits
+        counters['license_matches_cache_misses'] = new_misses - misses
+
+    if timings:
+        file_context.timings.update(timings.to_dict(prefix='licenses:'))
+
     if TRACE:
         logger_debug(f"api: get_licenses: license_detections: {license_detections}")
         logger_debug(f"api: get_licenses: license_clues: {license_clues}")
@@ -232,6 +271,12 @@ def get_licenses(
             licensing=get_cache().licensing
         ))
 
+    if file_context:
+        new_hits, new_misses = expression_cache.get_stats()
+        counters = file_context.counters
+        counters['license_expressions_cache_hits'] = new_hits - expressions_hits
+        counters['license_expressions_cache_misses'] = new_misses - expressions_misses
+
     percentage_of_license_text = 0
     if detection:
         percentage_of_license_text = detection.percentage_license_text_of_file(all_qspans)
@@ -312,9 +357,11 @@ def get_package_data(location, application=True, system=False, package_only=Fals
     return dict(package_data=[pd.to_dict() for pd in package_datas])
 
 
-def get_file_info(location, **kwargs):
+def get_file_info(location, file_context=None, **kwargs):
     """
     Return a mapping of file information collected for the file at `location`.
+    Use the optional textcode.analysis.FileContext `file_context` to reuse the
+    file content and type already collected for this file.
     """
     result = {}
 
@@ -322,12 +369,17 @@ def get_file_info(location, **kwargs):
     result['date'] = get_last_modified_date(location) or None
     result['size'] = getsize(location) or 0
 
-    sha1, md5, sha256 = multi_checksums(location, ('sha1', 'md5', 'sha256')).values()
-    result['sha1'] = sha1
-    result['md5'] = md5
-    result['sha256'] = sha256
+    if file_context:
+        checksums = file_context.checksums(('sha1', 'md5', 'sha256'))
+        collector = file_context.file_type
+    else:
+        checksums = multi_checksums(location, ('sha1', 'md5', 'sha256'))
+        collector = get_type(location)
+
+    result['sha1'] = checksums['sha1']
+    result['md5'] = checksums['md5']
+    result['sha256'] = checksums['sha256']
 
-    collector = get_type(location)
     result['mime_type'] = collector.mimetype_file or None
     result['file_type'] = collector.filetype_file or None
     result['programming_language'] = collector.programming_language or None
@@ -9,6 +9,8 @@
 
 # Import first because this import has monkey-patching side effects
 from scancode.pool import get_pool
+from scancode.pool import freeze_heap
+from scancode.pool import unfreeze_heap
 
 # Import early because of the side effects
 import scancode_config
@@ -20,7 +22,9 @@ import platform
 import sys
 import traceback
 
+from bisect import bisect_right
 from collections import defaultdict
+from collections import deque
 from functools import partial
 from multiprocessing import TimeoutError
 from time import sleep
@@ -52,6 +56,8 @@ from commoncode.resource import Codebase
 from commoncode.resource import VirtualCodebase
 from commoncode.system import on_windows
 
+from formattedcode import close_files_writer
+
 # these are important to register plugin managers
 from plugincode import PluginManager
 from plugincode import pre_scan
@@ -59,23 +65,45 @@ from plugincode import scan
 from plugincode import post_scan
 from plugincode import output_filter
 from plugincode import output
+from plugincode.output import OutputPlugin
 
 from scancode import ScancodeError
 from scancode import ScancodeCliUsageError
 from scancode import notice
 from scancode import print_about
 from scancode import Scanner
+from scancode import serializers
 from scancode.help import epilog_text
 from scancode.help import examples_text
 from scancode.interrupt import DEFAULT_TIMEOUT
 from scancode.interrupt import fake_interruptible
 from scancode.interrupt import interruptible
+from scancode.pool import DEFAULT_WAIT_TIMEOUT as POOL_WAIT_TIMEOUT
 from scancode.pool import ScanCodeTimeoutError
+from scancode.result_cache import DEFAULT_MAX_ENTRIES as DEFAULT_RESULT_CACHE_MAX_ENTRIES
+from scancode.result_cache import is_cacheable_scanner
+from scancode.result_cache import ResultCache
 
 # Tracing flags
 TRACE = False
 TRACE_DEEP = False
 
+# Maximum number of small files sent at once to a scan process
+DEFAULT_BATCH_SIZE = 50
+
+# Minimum number of batches for each scan process
+BATCHES_PER_PROCESS = 4
+
+# Files larger than this size in bytes are always sent alone to a scan process
+MAX_BATCHED_FILE_SIZE = 64 * 1024
+
+# Maximum cumulative size in bytes of the files of a batch
+MAX_BATCH_BYTES = 1024 * 1024
+
+# Upper bounds in seconds of the buckets of the per-file timings histograms.
+# The last bucket is for longer timings.
+TIMINGS_HISTOGRAM_BUCKETS = (0.01, 0.1, 1, 10)
+
 
 def logger_debug(*args):
     pass
@@ -244,6 +272,17 @@ def validate_input_path(ctx, param, value):
          f'[default: {DEFAULT_TIMEOUT} seconds]',
     help_group=cliutils.CORE_GROUP, sort_order=10, cls=PluggableCommandLineOption)
 
+@click.option('--batch-size',
+    type=int,
+    default=DEFAULT_BATCH_SIZE,
+    metavar='INT',
+    hidden=True,
+    help='Set the maximum number of small files sent at once to a process for '
+         'scanning. The actual number is adapted to the number of files and '
+         'processes. Use 1 to send files one at a time. '
+         f'[default: {DEFAULT_BATCH_SIZE}]',
+    help_group=cliutils.CORE_GROUP, sort_order=10, cls=PluggableCommandLineOption)
+
 @click.option('-q', '--quiet',
     is_flag=True,
     conflicting_options=['verbose'],
@@ -288,6 +327,22 @@ def validate_input_path(ctx, param, value):
         'the starting directory. Use 0 for no scan depth limit.',
     help_group=cliutils.CORE_GROUP, sort_order=301, cls=PluggableCommandLineOption)
 
+@click.option('--result-cache',
+    is_flag=True,
+    help='Cache the scan results of each file in a persistent on-disk cache. '
+         'Reuse these results in later scans of the same file content at the '
+         'same path with the same scan options.',
+    help_group=cliutils.CORE_GROUP, sort_order=310, cls=PluggableCommandLineOption)
+
+@click.option('--result-cache-max-entries',
+    type=int, default=DEFAULT_RESULT_CACHE_MAX_ENTRIES,
+    show_default=True,
+    metavar='INT',
+    required_options=['result_cache'],
+    help='Maximum number of file scan results kept in the persistent result '
+         'cache. The least recently used results are evicted first.',
+    help_group=cliutils.CORE_GROUP, sort_order=311, cls=PluggableCommandLineOption)
+
 @click.help_option('-h', '--help',
     help_group=cliutils.DOC_GROUP, sort_order=10, cls=PluggableCommandLineOption)
 
@@ -380,12 +435,15 @@ def scancode(
     full_root,
     processes,
     timeout,
+    batch_size,
     quiet,
     verbose,
     max_depth,
     from_json,
     timing,
     max_in_memory,
+    result_cache,
+    result_cache_max_entries,
     test_mode,
     test_slow_mode,
     test_error_mode,
@@ -489,11 +547,14 @@ def scancode(
             full_root=full_root,
             processes=processes,
             timeout=timeout,
+            batch_size=batch_size,
             quiet=quiet,
             verbose=verbose,
             max_depth=max_depth,
             timing=timing,
             max_in_memory=max_in_memory,
+            result_cache=result_cache,
+            result_cache_max_entries=result_cache_max_entries,
             test_mode=test_mode,
             test_slow_mode=test_slow_mode,
             test_error_mode=test_error_mode,
@@ -531,6 +592,9 @@ def run_scan(
     max_in_memory=10000,
     processes=1,
     timeout=120,
+    batch_size=DEFAULT_BATCH_SIZE,
+    result_cache=False,
+    result_cache_max_entries=DEFAULT_RESULT_CACHE_MAX_ENTRIES,
     quiet=True,
     verbose=False,
     max_depth=0,
@@ -638,11 +702,14 @@ def run_scan(
         full_root=full_root,
         processes=processes,
         timeout=timeout,
+        batch_size=batch_size,
         quiet=quiet,
         verbose=verbose,
         from_json=from_json,
         timing=timing,
         max_in_memory=max_in_memory,
+        result_cache=result_cache,
+        result_cache_max_entries=result_cache_max_entries,
         test_mode=test_mode,
         test_slow_mode=test_slow_mode,
         test_error_mode=test_error_mode,
@@ -945,7 +1012,10 @@ def run_scan(
             codebase=codebase,
             processes=processes,
             timeout=timeout,
-            timing=timeout,
+            batch_size=batch_size,
+            timing=timing,
+            result_cache=result_cache,
+            result_cache_max_entries=result_cache_max_entries,
             quiet=quiet,
             verbose=verbose,
             kwargs=requested_options,
@@ -1010,7 +1080,7 @@ def run_scan(
         # any output plugin
         if output_plugins:
             # TODO: add progress indicator
-            output_success = run_codebase_plugins(
+            output_success = run_output_plugins(
                 stage='output',
                 plugins=output_plugins,
                 codebase=codebase,
@@ -1131,6 +1201,128 @@ def run_codebase_plugins(
     return success
 
 
+def run_output_plugins(
+    stage,
+    plugins,
+    codebase,
+    stage_msg='',
+    plugin_msg='',
+    quiet=False,
+    verbose=False,
+    kwargs=None,
+    echo_func=echo_stderr,
+):
+    """
+    Run the list of output `plugins` on `codebase` and return True on success
+    and False otherwise. Arguments are the same as for run_codebase_plugins().
+
+    The output plugins that provide a files writer with a `get_files_writer()`
+    method share a single walk of the codebase: each Resource is serialized
+    once and its mapping is sent to every files writer. Other output plugins
+    are run first with run_codebase_plugins().
+    """
+    kwargs = kwargs or {}
+
+    writer_plugins = [p for p in plugins if hasattr(p, 'get_files_writer')]
+    # interleaving the outputs of several writers to stdout would be garbled
+    stdout_outputs = [
+        value for value in kwargs.values()
+        if getattr(value, 'name', None) == '<stdout>'
+    ]
+    if len(writer_plugins) < 2 or len(stdout_outputs) > 1:
+        return run_codebase_plugins(
+            stage=stage,
+            plugins=plugins,
+            codebase=codebase,
+            stage_msg=stage_msg,
+            plugin_msg=plugin_msg,
+            quiet=quiet,
+            verbose=verbose,
+            kwargs=kwargs,
+            echo_func=echo_func,
+        )
+
+    stage_start = time()
+    other_plugins = [p for p in plugins if not hasattr(p, 'get_files_writer')]
+    success = run_codebase_plugins(
+        stage=stage,
+        plugins=other_plugins,
+        codebase=codebase,
+        stage_msg=stage_msg,
+        plugin_msg=plugin_msg,
+        quiet=quiet,
+        verbose=verbose,
+        kwargs=kwargs,
+        echo_func=echo_func,
+    )
+    if verbose and not other_plugins:
+        echo_func(stage_msg % locals(), fg='green')
+
+    timings = codebase.timings
+
+    def report_error(name):
+        msg = 'ERROR: failed to run %(stage)s plugin: %(name)s:' % dict(stage=stage, name=name)
+        echo_func(msg, fg='red')
+        tb = traceback.format_exc()
+        echo_func(tb)
+        codebase.errors.append(msg + '\n' + tb)
+
+    # list of [plugin, files writer] for the writers that have not failed
+    writers = []
+    for plugin in sorted(writer_plugins, key=lambda x: x.run_order):
+        name = plugin.name
+        plugin_start = time()
+
+        if verbose:
+            echo_func(plugin_msg % locals(), fg='green')
+
+        try:
+            writer = plugin.get_files_writer(codebase, **kwargs)
+            next(writer)
+            writers.append([plugin, writer])
+        except Exception as _e:
+            report_error(name)
+            success = False
+
+        timing_key = '%(stage)s:%(name)s' % locals()
+        timings[timing_key] = time() - plugin_start
+
+    def send_to_writers(scanned_file):
+        """
+        Send `scanned_file` to all the writers and return True if all
+        succeeded. Drop the writers that fail.
+        """
+        all_succeeded = True
+        for plugin_writer in list(writers):
+            plugin, writer = plugin_writer
+            name = plugin.name
+            plugin_start = time()
+            try:
+                if scanned_file is None:
+                    close_files_writer(writer)
+                else:
+                    writer.send(scanned_file)
+            except Exception as _e:
+                report_error(name)
+                writers.remove(plugin_writer)
+                all_succeeded = False
+
+            timings[stage + ':' + name] += time() - plugin_start
+        return all_succeeded
+
+    for scanned_file in OutputPlugin.get_files(codebase, **kwargs):
+        if not writers:
+            break
+        if not send_to_writers(scanned_file):
+            success = False
+
+    if not send_to_writers(None):
+        success = False
+
+    timings[stage] = time() - stage_start
+    return success
+
+
 def run_scanners(
     stage,
     plugins,
@@ -1138,6 +1330,9 @@ def run_scanners(
     processes,
     timeout,
     timing,
+    batch_size=DEFAULT_BATCH_SIZE,
+    result_cache=False,
+    result_cache_max_entries=DEFAULT_RESULT_CACHE_MAX_ENTRIES,
     quiet=False,
     verbose=False,
     kwargs=None,
@@ -1152,7 +1347,10 @@ def run_scanners(
     plugin.
 
     Use multiple `processes` and limit the runtime of a single scanner
-    function to `timeout` seconds.
+    function to `timeout` seconds. Send up to `batch_size` small files at once
+    to each process.
+    If `result_cache` is True, reuse and save file scan results in a persistent
+    ResultCache of up to `result_cache_max_entries` entries.
     Compute detailed timings if `timing` is True.
     Display progress and errors based on the `quiet` and `verbose` flags.
     """
@@ -1180,10 +1378,21 @@ def run_scanners(
             item_show_func=item_show_func,
             verbose=verbose, file=sys.stderr)
 
+    cache = None
+    if result_cache and any(is_cacheable_scanner(s) for s in scanners):
+        cache = ResultCache(scanners=scanners, max_entries=result_cache_max_entries)
+
     # TODO: add CLI option to bypass cache entirely?
     scan_success = scan_codebase(
         codebase, scanners, processes, timeout,
-        with_timing=timing, progress_manager=progress_manager)
+        with_timing=timing, progress_manager=progress_manager,
+        batch_size=batch_size, result_cache=cache, stage=stage)
+
+    if cache:
+        cache.close()
+
+    if timing:
+        collect_files_timings(codebase, stage)
 
     # TODO: add progress indicator
     # run the process codebase of each scan plugin (most often a no-op)
@@ -1221,6 +1430,9 @@ def scan_codebase(
     with_timing=False,
     progress_manager=None,
     echo_func=echo_stderr,
+    batch_size=DEFAULT_BATCH_SIZE,
+    result_cache=None,
+    stage='scan',
 ):
     """
     Run the `scanners` Scanner objects on the `codebase` Codebase. Return True
@@ -1230,19 +1442,39 @@ def scan_codebase(
     single process. Disable multiprocessing with processes 0 or -1. Disable
     threading is processes is -1.
 
+    With multiprocessing, send small files in batches of up to `batch_size`
+    files to each process to reduce the inter-process communication overhead.
+    Large files are always sent one at a time. See get_batch_size() for how the
+    actual batch size is computed.
+
+    If `result_cache` ResultCache is provided, reuse the cached scan results of
+    identical files and save new scan results in this cache.
+
     Run each scanner function for up to `timeout` seconds and fail it otherwise.
 
     If `with_timing` is True, each Resource is updated with per-scanner
     execution time (as a float in seconds). This is added to the `scan_timings`
     mapping of each Resource as {scanner.name: execution time}.
 
+    The scan statistics counters reported by the scanners for each file are
+    summed in the `codebase` counters as {"<stage>:<counter name>": count}.
+
     Provide optional progress feedback in the UI using the ``progress_manager``
     callable that accepts an iterable of tuple of (location, path, scan_errors,
     scan_result) as argument.
     """
 
     # NOTE: we never scan directories
-    resources = ((r.location, r.path) for r in codebase.walk() if r.is_file)
+    files = (r for r in codebase.walk() if r.is_file)
+
+    if processes >= 1:
+        batch_size = get_batch_size(
+            files_count=codebase.counters.get('initial:files_count'),
+            processes=processes,
+            batch_size=batch_size,
+        )
+    else:
+        batch_size = 1
 
     use_threading = processes >= 0
     runner = partial(
@@ -1250,30 +1482,58 @@ def scan_codebase(
         scanners=scanners,
         timeout=timeout,
         with_timing=with_timing,
-        with_threading=use_threading
+        with_threading=use_threading,
+        result_cache=result_cache,
     )
+    # Resources cached on-disk are saved directly by the scan processes
+    runner = partial(scan_and_save_resource, runner=runner)
 
     if TRACE:
         logger_debug('scan_codebase: scanners:', ', '.join(s.name for s in scanners))
 
     get_resource = codebase.get_resource
+    scan_counters_totals = defaultdict(int)
 
     success = True
+    completed = False
     pool = None
     scans = None
     try:
         if processes >= 1:
+            # the license index and other large read-only data structures
+            # loaded in plugins setup are shared with the workers processes
+            freeze_heap()
             # maxtasksperchild helps with recycling processes in case of leaks
             pool = get_pool(processes=processes, maxtasksperchild=1000)
             # Using chunksize is documented as much more efficient in the Python
             # doc. Yet "1" still provides a better and more progressive
             # feedback. With imap_unordered, results are returned as soon as
             # ready and out of order so we never know exactly what is processing
-            # until completed.
-            scans = pool.imap_unordered(runner, resources, chunksize=1)
+            # until completed. Instead we send batches of small files such that
+            # each worker scans several files for each round trip.
+            if batch_size > 1:
+                # the file sizes are collected in the codebase inventory
+                batches = get_batches(
+                    resources=(
+                        ((r.location, r.path, r.cache_location), r.size)
+                        for r in files
+                    ),
+                    batch_size=batch_size,
+                )
+                batch_runner = partial(scan_resources, runner=runner)
+                scans = BatchResults(
+                    pool.imap_unordered(batch_runner, batches, chunksize=1),
+                    # a batch result is ready only once all its files are
+                    # scanned: wait for it as long as for each of its files
+                    wait_timeout=POOL_WAIT_TIMEOUT * batch_size,
+                )
+            else:
+                resources = ((r.location, r.path, r.cache_location) for r in files)
+                scans = pool.imap_unordered(runner, resources, chunksize=1)
             pool.close()
         else:
             # no multiprocessing with processes=0 or -1
+            resources = ((r.location, r.path, r.cache_location) for r in files)
             scans = map(runner, resources)
 
         if progress_manager:
@@ -1289,12 +1549,23 @@ def scan_codebase(
                  scan_errors,
                  scan_time,
                  scan_result,
-                 scan_timings) = next(scans)
+                 scan_timings,
+                 scan_counters) = next(scans)
+
+                for name, value in scan_counters.items():
+                    scan_counters_totals[name] += value
 
                 if TRACE_DEEP:
                     logger_debug(
                     'scan_codebase: location:', location, 'results:', scan_result)
 
+                if scan_result is None:
+                    # the scan results of a Resource cached on-disk were
+                    # already saved in the scan process
+                    if scan_errors:
+                        success = False
+                    continue
+
                 resource = get_resource(path=path)
 
                 if not resource:
@@ -1317,26 +1588,21 @@ def scan_codebase(
                     if scan_timings:
                         resource.scan_timings.update(scan_timings)
 
-                # NOTE: here we effectively single threaded the saving a
-                # Resource to the cache! .... not sure this is a good or bad
-                # thing for scale. Likely not
+                # NOTE: only in-memory Resources are saved here. Resources
+                # cached on-disk are saved in the scan processes.
                 # FIXME: should we instead store these in the Plugin resource_attributes?
                 # these should be matched
-                for key, value in scan_result.items():
-                    if not value:
-                        # the scan attribute will have a default value
-                        continue
-                    if key.startswith('extra_data.'):
-                        key = key.replace('extra_data.', '')
-                        resource.extra_data[key] = value
-                    else:
-                        setattr(resource, key, value)
+                attributes, extra_data = get_scan_attributes(scan_result)
+                resource.extra_data.update(extra_data)
+                for key, value in attributes.items():
+                    setattr(resource, key, value)
                 codebase.save_resource(resource)
             except (TimeoutError, ScanCodeTimeoutError):
                 codebase.errors.append("Timeout waiting for resource. Path unknown.")
                 success = False
                 continue
             except StopIteration:
+                completed = True
                 break
             except KeyboardInterrupt:
                 echo_func('\nAborted with Ctrl+C!', fg='red')
@@ -1345,16 +1611,200 @@ def scan_codebase(
                 break
 
     finally:
+        if pool and completed and result_cache:
+            # let the idle workers exit normally to save their result cache
+            # last used times
+            pool.join()
         # ensure the pool is really dead to work around a Python 2.7.3 bug:
         # http://bugs.python.org/issue15101
         terminate_pool(pool)
+        if processes >= 1:
+            unfreeze_heap()
 
         if scans and hasattr(scans, 'render_finish'):
             # hack to avoid using a context manager
             scans.render_finish()
+
+        for name, value in scan_counters_totals.items():
+            codebase.counters[f'{stage}:{name}'] = value
     return success
 
 
+def get_batch_size(files_count, processes, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Return the number of small files to send at once to a scan process given a
+    ``files_count`` number of files to scan, a number of ``processes`` and the
+    maximum ``batch_size``.
+
+    For example::
+    >>> get_batch_size(files_count=100000, processes=4, batch_size=50)
+    50
+    >>> get_batch_size(files_count=100, processes=4, batch_size=50)
+    6
+    >>> get_batch_size(files_count=10, processes=4, batch_size=50)
+    1
+    >>> get_batch_size(files_count=None, processes=4, batch_size=50)
+    50
+    """
+    if not files_count:
+        return max(batch_size, 1)
+    # keep at least a few batches for each process such that all processes
+    # stay busy until the end of a scan
+    return max(1, min(batch_size, files_count // (processes * BATCHES_PER_PROCESS)))
+
+
+def get_batches(
+    resources,
+    batch_size=DEFAULT_BATCH_SIZE,
+    max_file_size=MAX_BATCHED_FILE_SIZE,
+    max_batch_bytes=MAX_BATCH_BYTES,
+):
+    """
+    Yield lists of resources given a ``resources`` iterable of (resource, file
+    size in bytes) tuples.
+
+    Small files are grouped in lists of up to ``batch_size`` files and up to
+    ``max_batch_bytes`` total size. Files larger than ``max_file_size`` or of
+    unknown size are yielded alone.
+
+    For example::
+    >>> resources = [('a', 10), ('b', 10), ('big', 10000), ('c', 10)]
+    >>> list(get_batches(resources, batch_size=2, max_file_size=100))
+    [['a', 'b'], ['big'], ['c']]
+    """
+    batch = []
+    batch_bytes = 0
+    for resource, size in resources:
+        if size is None or size > max_file_size or batch_size <= 1:
+            yield [resource]
+            continue
+
+        batch.append(resource)
+        batch_bytes += size
+        if len(batch) >= batch_size or batch_bytes >= max_batch_bytes:
+            yield batch
+            batch = []
+            batch_bytes = 0
+
+    if batch:
+        yield batch
+
+
+def scan_resources(resources, runner):
+    """
+    Return a list of scan results tuples given a ``resources`` list of
+    arguments for a ``runner`` callable such as scan_and_save_resource().
+    """
+    return [runner(resource) for resource in resources]
+
+
+def scan_and_save_resource(resource, runner):
+    """
+    Return a scan_resource() results tuple given a ``resource`` tuple of
+    (location, path, cache_location) and a ``runner`` scan_resource() callable.
+
+    If ``cache_location`` is not None, the Resource is cached on-disk at this
+    location: update the cached Resource with the scan results and return None
+    in place of the scan results mapping. This way the scan results are saved
+    in parallel in each scan process rather than in the main process.
+    """
+    location, path, cache_location = resource
+    (location,
+     path,
+     scan_errors,
+     scan_time,
+     scan_result,
+     scan_timings,
+     scan_counters) = runner((location, path))
+
+    if cache_location:
+        save_cached_resource(
+            cache_location=cache_location,
+            scan_errors=scan_errors,
+            scan_result=scan_result,
+            scan_timings=scan_timings,
+        )
+        scan_result = None
+
+    return location, path, scan_errors, scan_time, scan_result, scan_timings, scan_counters
+
+
+def get_scan_attributes(scan_result):
+    """
+    Return a tuple of (attributes, extra_data) mappings of the Resource
+    attributes and extra_data to update given a ``scan_result`` mapping.
+    """
+    attributes = {}
+    extra_data = {}
+    for key, value in scan_result.items():
+        if not value:
+            # the scan attribute will have a default value
+            continue
+        if key.startswith('extra_data.'):
+            key = key.replace('extra_data.', '')
+            extra_data[key] = value
+        else:
+            attributes[key] = value
+    return attributes, extra_data
+
+
+def save_cached_resource(cache_location, scan_errors, scan_result, scan_timings):
+    """
+    Update the serialized Resource cached on-disk at ``cache_location`` with
+    the ``scan_errors`` list, ``scan_result`` mapping and ``scan_timings``
+    mapping.
+    """
+    with open(cache_location, 'rb') as cached:
+        resource_data = serializers.loads(cached.read())
+
+    if scan_errors:
+        resource_data['scan_errors'].extend(scan_errors)
+
+    if scan_timings:
+        resource_data['scan_timings'].update(scan_timings)
+
+    attributes, extra_data = get_scan_attributes(scan_result)
+    resource_data['extra_data'].update(extra_data)
+    resource_data.update(attributes)
+
+    # write to a temp file first to never leave a partially written Resource
+    temp_location = cache_location + '.tmp'
+    with open(temp_location, 'wb') as cached:
+        cached.write(serializers.dumps_bytes(resource_data))
+    os.replace(temp_location, cache_location)
+
+
+class BatchResults:
+    """
+    An iterator of scan_resource() results tuples given a ``batches`` iterator
+    of lists of these results tuples.
+
+    This is used to report results and progress file-by-file when files are
+    scanned in batches. Exceptions raised by the ``batches`` iterator (such as
+    timeouts) are propagated and the iteration can continue afterwards.
+
+    If ``wait_timeout`` is provided, wait up to this number of seconds for each
+    batch using the ``batches`` pool iterator next() method.
+    """
+
+    def __init__(self, batches, wait_timeout=None):
+        self.batches = batches
+        self.wait_timeout = wait_timeout
+        self.pending = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while not self.pending:
+            if self.wait_timeout:
+                batch = self.batches.next(timeout=self.wait_timeout)
+            else:
+                batch = next(self.batches)
+            self.pending.extend(batch)
+        return self.pending.popleft()
+
+
 def terminate_pool(pool):
     """
     Invoke terminate() on a process pool and deal with possible Windows issues.
@@ -1383,27 +1833,39 @@ def scan_resource(
     timeout=DEFAULT_TIMEOUT,
     with_timing=False,
     with_threading=True,
+    result_cache=None,
 ):
     """
     Given a ``location_path`` tuple pf (location, path), return a tuple of:
-        (location, path, scan_errors, scan_time, scan_results, timings)
+        (location, path, scan_errors, scan_time, scan_results, timings, counters)
     by running the ``scanners`` Scanner objects for the file or directory
     resource at ``location`` and ``path`` for up to ``timeout`` seconds. If
     ``with_threading`` is False, threading is disabled. Include detailed timings
     if ``with_timing`` is True.
 
+    If a ``result_cache`` ResultCache is provided, return the cached results of
+    the scanners for this file if available instead of running these scanners.
+    Otherwise, save their results in the ``result_cache`` if there are no errors.
+
     The returned tuple has these values:
     - `location` and `path` are the original arguments.
     - `scan_errors` is a list of error strings.
     - `scan_results` is a mapping of scan results from all scanners.
     - `scan_time` is the duration in seconds to run all scans for this resource.
     - `timings` is a mapping of scan {scanner.name: execution time in seconds}
-      tracking the execution duration each each scan individually.
+      tracking the execution duration each each scan individually. This
+      also contains the detailed timings of some scanners such as the license
+      matching stages as {"licenses:<stage>": execution time in seconds} and
+      {"licenses:<stage>:count": number of calls}.
       `timings` is empty unless `with_timing` is True.
+    - `counters` is a mapping of {counter name: count} of scan statistics
+      reported by the scanners such as the license matches cache hits.
 
     All these values MUST be serializable and pickable because of the way multi-
     processing and threading works.
     """
+    from textcode.analysis import file_context
+
     scan_time = time()
     location, path = location_path
     results = {}
@@ -1419,37 +1881,127 @@ def scan_resource(
     # and start returning values. The kill timeout is otherwise there
     # as a gatekeeper for runaway processes.
 
-    # run each scanner in sequence in its own interruptible
-    for scanner in scanners:
+    # the file is read and classified once and shared by all scanners through
+    # its FileContext. Run each scanner in sequence in its own interruptible
+    with file_context(location, with_timing=with_timing) as context:
+        cache_key = None
+        cached_results = None
+        if result_cache:
+            try:
+                content_sha1 = context.checksums(('sha1',))['sha1']
+                cache_key = result_cache.get_key(path=path, content_sha1=content_sha1)
+                cached_results = result_cache.get(cache_key)
+                # the hits and misses are summed for all files in the scan counters
+                hit = cached_results is not None
+                context.counters['result_cache_hits'] = int(hit)
+                context.counters['result_cache_misses'] = int(not hit)
+            except Exception:
+                cache_key = None
+                msg = 'ERROR: failed to get scan results from result cache:\n'
+                scan_errors.append(msg + traceback.format_exc())
+
+        if cached_results is not None:
+            results.update(cached_results)
+            scanners = [s for s in scanners if not is_cacheable_scanner(s)]
+
+        # the results of the scanners to save in the result cache
+        results_to_cache = {}
+
+        for scanner in scanners:
+            if with_timing:
+                start = time()
+
+            try:
+                # pass a deadline that the scanner can opt to honor or not
+                if timeout:
+                    deadline = time() + int(timeout / 2.5)
+                else:
+                    deadline = sys.maxsize
+
+                runner = partial(
+                    scanner.function,
+                    location,
+                    path=path,
+                    deadline=deadline,
+                    file_context=context,
+                )
+                error, values_mapping = interruptor(runner, timeout=timeout)
+                if error:
+                    msg = 'ERROR: for scanner: ' + scanner.name + ':\n' + error
+                    scan_errors.append(msg)
+                # the return value of a scanner fun MUST be a mapping
+                if values_mapping:
+                    results.update(values_mapping)
+                    if cache_key and is_cacheable_scanner(scanner):
+                        results_to_cache.update(values_mapping)
+
+            except Exception:
+                msg = 'ERROR: for scanner: ' + scanner.name + ':\n' + traceback.format_exc()
+                scan_errors.append(msg)
+            finally:
+                if with_timing:
+                    timings[scanner.name] = time() - start
+
         if with_timing:
-            start = time()
+            # detailed timings added by the scanners such as license matching
+            # stages timings
+            timings.update(context.timings)
 
-        try:
-            # pass a deadline that the scanner can opt to honor or not
-            if timeout:
-                deadline = time() + int(timeout / 2.5)
-            else:
-                deadline = sys.maxsize
+        counters = context.counters
 
-            runner = partial(scanner.function, location, path=path, deadline=deadline)
-            error, values_mapping = interruptor(runner, timeout=timeout)
-            if error:
-                msg = 'ERROR: for scanner: ' + scanner.name + ':\n' + error
-                scan_errors.append(msg)
-            # the return value of a scanner fun MUST be a mapping
-            if values_mapping:
-                results.update(values_mapping)
-
-        except Exception:
-            msg = 'ERROR: for scanner: ' + scanner.name + ':\n' + traceback.format_exc()
-            scan_errors.append(msg)
-        finally:
-            if with_timing:
-                timings[scanner.name] = time() - start
+        if cache_key and cached_results is None and not scan_errors:
+            try:
+                result_cache.put(cache_key, results_to_cache)
+            except Exception:
+                msg = 'ERROR: failed to save scan results in result cache:\n'
+                scan_errors.append(msg + traceback.format_exc())
 
     scan_time = time() - scan_time
 
-    return location, path, scan_errors, scan_time, results, timings
+    return location, path, scan_errors, scan_time, results, timings, counters
+
+
+def collect_files_timings(codebase, stage):
+    """
+    Aggregate the per-file ``scan_timings`` of the files of a ``codebase`` for a
+    scan ``stage``. Update the codebase "<stage>:files_timings" counter with a
+    mapping of {timing name: mapping} with the total execution time in seconds,
+    the number of calls and a histogram of files counts by execution time for
+    each scanner and scanner stage such as license matching stages. The
+    histogram has one files count for each TIMINGS_HISTOGRAM_BUCKETS upper bound
+    and one for longer timings.
+    """
+    files_timings = {}
+    for resource in codebase.walk():
+        if not resource.is_file or not resource.scan_timings:
+            continue
+
+        scan_timings = resource.scan_timings
+        for name, value in scan_timings.items():
+            if name.endswith(':count'):
+                continue
+
+            file_timings = files_timings.get(name)
+            if not file_timings:
+                file_timings = files_timings[name] = dict(
+                    time=0,
+                    calls=0,
+                    histogram=[0] * (len(TIMINGS_HISTOGRAM_BUCKETS) + 1),
+                )
+            file_timings['time'] += value
+            file_timings['calls'] += scan_timings.get(name + ':count', 1)
+            file_timings['histogram'][bisect_right(TIMINGS_HISTOGRAM_BUCKETS, value)] += 1
+
+    codebase.counters[stage + ':files_timings'] = files_timings
+
+
+def get_timings_histogram_labels():
+    """
+    Return a list of label strings for the files timings histogram buckets.
+    """
+    labels = [f'<{bound}s' for bound in TIMINGS_HISTOGRAM_BUCKETS]
+    labels.append(f'>={TIMINGS_HISTOGRAM_BUCKETS[-1]}s')
+    return labels
 
 
 def display_summary(codebase, scan_names, processes, errors, echo_func=echo_stderr):
@@ -1558,6 +2110,30 @@ def get_displayable_summary(codebase, scan_names, processes, errors):
             'files/sec. %(prescan_scan_size_speed)s' % locals()
         )
 
+    if 'scan:result_cache_hits' in codebase.counters:
+        result_cache_hits = codebase.counters['scan:result_cache_hits']
+        result_cache_misses = codebase.counters.get('scan:result_cache_misses', 0)
+        summary_messages.append(
+            'Result cache:   %(result_cache_hits)d hit(s) and '
+            '%(result_cache_misses)d miss(es)' % locals()
+        )
+
+    if 'scan:license_matches_cache_hits' in codebase.counters:
+        matches_cache_hits = codebase.counters['scan:license_matches_cache_hits']
+        matches_cache_misses = codebase.counters.get('scan:license_matches_cache_misses', 0)
+        summary_messages.append(
+            'License matches cache: %(matches_cache_hits)d hit(s) and '
+            '%(matches_cache_misses)d miss(es)' % locals()
+        )
+
+    if 'scan:license_expressions_cache_hits' in codebase.counters:
+        expressions_cache_hits = codebase.counters['scan:license_expressions_cache_hits']
+        expressions_cache_misses = codebase.counters.get('scan:license_expressions_cache_misses', 0)
+        summary_messages.append(
+            'License expressions cache: %(expressions_cache_hits)d hit(s) and '
+            '%(expressions_cache_misses)d miss(es)' % locals()
+        )
+
     summary_messages.append(
         'Initial counts: %(initial_res_count)d resource(s): '
         '%(initial_files_count)d file(s) '
@@ -1582,7 +2158,19 @@ def get_displayable_summary(codebase, scan_names, processes, errors):
         if value > 0.1:
             summary_messages.append('  %(name)s: %(value).2fs' % locals())
 
-    # TODO: if timing was requested display top per-scan/per-file stats?
+    files_timings = codebase.counters.get('scan:files_timings')
+    if files_timings:
+        labels = get_timings_histogram_labels()
+        summary_messages.append('Files timings:  total time, calls and files count by time')
+        for name, file_timings in files_timings.items():
+            histogram = ', '.join(
+                f'{label}: {count}'
+                for label, count in zip(labels, file_timings['histogram'])
+            )
+            summary_messages.append(
+                f'  {name}: {file_timings["time"]:.2f}s, '
+                f'{file_timings["calls"]} call(s), {histogram}'
+            )
 
     return error_messages, summary_messages
 
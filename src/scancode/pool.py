@@ -48,6 +48,7 @@ WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 
 
+import gc
 from multiprocessing import pool
 from multiprocessing import TimeoutError
 
@@ -57,6 +58,10 @@ class ScanCodeTimeoutError(Exception):
     pass
 
 
+# default number of seconds to wait for a result of a pool task
+DEFAULT_WAIT_TIMEOUT = 3600
+
+
 def wrapped(func):
     """
     Ensure that we have a default timeout in all cases.
@@ -71,7 +76,7 @@ def wrapped(func):
 
         def wrap(self, timeout=None):
             try:
-                result = func(self, timeout=timeout or 3600)
+                result = func(self, timeout=timeout or DEFAULT_WAIT_TIMEOUT)
             except TimeoutError as te:
                 raise ScanCodeTimeoutError() from te
             return result
@@ -89,3 +94,23 @@ pool.IMapUnorderedIterator.__next__ = pool.IMapUnorderedIterator.next
 
 def get_pool(processes=None, initializer=None, initargs=(), maxtasksperchild=None):
     return pool.Pool(processes, initializer, initargs, maxtasksperchild)
+
+
+def freeze_heap():
+    """
+    Move all the objects tracked by the garbage collector in this process, such
+    as a loaded license index, to a permanent generation that is ignored by
+    future collections. Forked pool workers then keep sharing the memory pages
+    of these objects with their parent process instead of copying these pages
+    when the garbage collector runs in each worker.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def unfreeze_heap():
+    """
+    Move back the objects frozen with ``freeze_heap()`` to the oldest generation
+    of the garbage collector.
+    """
+    gc.unfreeze()
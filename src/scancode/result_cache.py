@@ -0,0 +1,275 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import json
+import os
+import sqlite3
+from functools import partial
+from hashlib import sha1
+from multiprocessing.util import Finalize
+from os.path import join
+from time import time
+
+from scancode import serializers
+
+"""
+A persistent on-disk cache of file scan results reused across scans.
+
+Scan results are stored in an SQLite database. Each file scan results are keyed
+by a checksum of:
+
+- the file content sha1 and the file path. The path is needed because some
+  scanners such as package data detection depend on the file name.
+- the scanners and their options, the ScanCode version and the license index
+  unique id. These are the same for all the files of a scan.
+
+Scanners whose results depend on the file system rather than on the file
+content (such as the file info with its last modified date) are never cached.
+
+The database is shared by the scan processes: each process opens its own
+connection. Looking up results is read-only: the last used time of the results
+found in a previous scan is updated in batches by each process. The least
+recently used results are evicted at the end of a scan to keep up to
+``max_entries`` cached results.
+"""
+
+RESULT_CACHE_FILENAME = 'scan_results_cache.sqlite'
+
+DEFAULT_MAX_ENTRIES = 1000000
+
+# the names of scanners whose results are never cached
+UNCACHED_SCANNERS = frozenset(['info'])
+
+# the names of scanners that depend on the license index
+LICENSE_INDEX_SCANNERS = frozenset(['licenses', 'packages'])
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    results TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+'''
+
+# wait for up to this number of seconds for another process database lock
+LOCK_TIMEOUT = 60
+
+# save the last used time of results in batches of this number of results
+USED_KEYS_BATCH_SIZE = 1000
+
+# cache of {(database location, process id): connection}
+_connections = {}
+
+# mapping of {(database location, process id): {key: last used time}} of the
+# results used in a process that are not yet saved in the database
+_used_keys = {}
+
+
+def get_default_location():
+    """
+    Return the default location of the result cache database.
+    """
+    from scancode_config import scancode_cache_dir
+    return join(scancode_cache_dir, RESULT_CACHE_FILENAME)
+
+
+def get_connection(location):
+    """
+    Return an SQLite connection to the database at ``location``. Connections
+    are cached for each process as they cannot be shared across processes.
+    """
+    key = location, os.getpid()
+    connection = _connections.get(key)
+    if connection is None:
+        connection = sqlite3.connect(location, timeout=LOCK_TIMEOUT)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        _connections[key] = connection
+    return connection
+
+
+def close_connection(location):
+    """
+    Close the current process connection to the database at ``location``.
+    """
+    connection = _connections.pop((location, os.getpid()), None)
+    if connection is not None:
+        connection.close()
+
+
+def get_used_keys(location):
+    """
+    Return the current process mapping of {key: last used time} of results used
+    and not yet saved for the database at ``location``. The saving of this
+    mapping is registered to run at the normal exit of this process.
+    """
+    key = location, os.getpid()
+    used_keys = _used_keys.get(key)
+    if used_keys is None:
+        used_keys = _used_keys[key] = {}
+        Finalize(None, save_used_keys, args=(location,), exitpriority=10)
+    return used_keys
+
+
+def save_used_keys(location, connection=None):
+    """
+    Save the last used time of the results used in the current process in the
+    database at ``location`` using an optional ``connection`` (otherwise in
+    a new transaction).
+    """
+    used_keys = _used_keys.get((location, os.getpid()))
+    if not used_keys:
+        return
+
+    last_used = [(used, key) for key, used in used_keys.items()]
+    used_keys.clear()
+    sql = 'UPDATE results SET last_used = ? WHERE key = ?'
+    if connection:
+        connection.executemany(sql, last_used)
+    else:
+        connection = get_connection(location)
+        with connection:
+            connection.executemany(sql, last_used)
+
+
+def is_cacheable_scanner(scanner):
+    """
+    Return True if the results of a ``scanner`` Scanner can be cached.
+    """
+    return scanner.name not in UNCACHED_SCANNERS
+
+
+def get_scanners_key(scanners):
+    """
+    Return a checksum string for a list of ``scanners`` Scanner objects and
+    their options. This is used as the part of a cache key that is the same for
+    all the files of a scan.
+    """
+    from scancode_config import __version__
+
+    names = set()
+    scanners_data = []
+    for scanner in scanners:
+        if not is_cacheable_scanner(scanner):
+            continue
+        names.add(scanner.name)
+        func = scanner.function
+        args = keywords = ()
+        if isinstance(func, partial):
+            args = func.args
+            keywords = sorted(func.keywords.items())
+            func = func.func
+        function_name = f'{func.__module__}.{func.__qualname__}'
+        scanners_data.append([scanner.name, function_name, repr(args), repr(keywords)])
+
+    index_uid = None
+    if names & LICENSE_INDEX_SCANNERS:
+        from licensedcode.cache import get_cache
+        index_uid = get_cache().index_arrays_uid
+
+    key_data = dict(
+        scancode_version=__version__,
+        license_index=index_uid,
+        scanners=sorted(scanners_data),
+    )
+    return sha1(json.dumps(key_data).encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    A persistent cache of file scan results stored in an SQLite database at
+    ``location`` for a scan with ``scanners`` Scanner objects.
+
+    A ResultCache is pickled and sent to each scan process. Each process uses
+    its own database connection.
+    """
+
+    def __init__(self, scanners, location=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.location = location or get_default_location()
+        self.max_entries = max_entries
+        self.scanners_key = get_scanners_key(scanners)
+        self.timestamp = time()
+
+        connection = get_connection(self.location)
+        with connection:
+            connection.executescript(SCHEMA)
+        # never share a connection with the scan processes forked later
+        close_connection(self.location)
+
+    def get_key(self, path, content_sha1):
+        """
+        Return a cache key string for a file with a ``path`` and a
+        ``content_sha1`` checksum.
+        """
+        key = f'{self.scanners_key}\0{path}\0{content_sha1}'
+        return sha1(key.encode('utf-8', 'surrogateescape')).hexdigest()
+
+    def get(self, key):
+        """
+        Return a mapping of cached scan results for ``key`` or None.
+        """
+        connection = get_connection(self.location)
+        row = connection.execute(
+            'SELECT results, last_used FROM results WHERE key = ?', (key,)
+        ).fetchone()
+        if not row:
+            return
+
+        results, last_used = row
+        # only results from a previous scan need a new last used time
+        if last_used < self.timestamp:
+            used_keys = get_used_keys(self.location)
+            used_keys[key] = self.timestamp
+            if len(used_keys) >= USED_KEYS_BATCH_SIZE:
+                save_used_keys(self.location)
+
+        return serializers.loads(results)
+
+    def put(self, key, results):
+        """
+        Save a ``results`` mapping of scan results for ``key``.
+        """
+        connection = get_connection(self.location)
+        with connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO results (key, results, last_used) VALUES (?, ?, ?)',
+                (key, serializers.dumps(results), self.timestamp),
+            )
+            # piggyback on this write transaction
+            save_used_keys(self.location, connection=connection)
+
+    def evict(self):
+        """
+        Delete the least recently used cached results such that at most
+        ``max_entries`` are kept. Return the number of deleted entries.
+        """
+        connection = get_connection(self.location)
+        with connection:
+            (count,) = connection.execute('SELECT COUNT(*) FROM results').fetchone()
+            excess = count - self.max_entries
+            if excess <= 0:
+                return 0
+
+            connection.execute(
+                'DELETE FROM results WHERE key IN '
+                '(SELECT key FROM results ORDER BY last_used LIMIT ?)',
+                (excess,),
+            )
+        return excess
+
+    def close(self):
+        """
+        Finish using this cache at the end of a scan: save the last used time of
+        the results used in this process, evict old entries and close the
+        database connection.
+        """
+        save_used_keys(self.location)
+        self.evict()
+        close_connection(self.location)
@@ -0,0 +1,150 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+"""
+JSON serializers used to write scan results and to cache Resources on disk.
+
+The "json" serializer uses the standard library json module. The "orjson"
+serializer uses the optional and much faster orjson library, installed with
+`pip install scancode-toolkit[orjson]`.
+
+Both serializers write the same JSON, compact or indented with two spaces,
+except for non-ASCII characters that are escaped by the "json" serializer and
+written as UTF-8 by the "orjson" serializer.
+
+The JSON outputs always use the "json" serializer, unless the "orjson"
+serializer is selected with the SCANCODE_JSON_SERIALIZER environment variable
+set to "orjson". The on-disk caches of Resources and scan results use the
+fastest available serializer, unless this environment variable is set.
+"""
+
+
+class JsonSerializer:
+    """
+    Serialize to JSON with the standard library json module.
+    """
+    name = 'json'
+
+    def dumps(self, obj, pretty=False):
+        """
+        Return a JSON string serialized from ``obj``, indented if ``pretty``
+        is True and compact otherwise.
+        """
+        if pretty:
+            return json.dumps(obj, indent=2, separators=(',', ': '))
+        return json.dumps(obj, separators=(',', ':'), check_circular=False)
+
+    def dumps_bytes(self, obj):
+        """
+        Return compact JSON UTF-8-encoded bytes serialized from ``obj``.
+        """
+        return self.dumps(obj).encode('utf-8')
+
+    def loads(self, data):
+        """
+        Return an object deserialized from a ``data`` JSON string or bytes.
+        """
+        return json.loads(data)
+
+
+class OrjsonSerializer(JsonSerializer):
+    """
+    Serialize to JSON with the orjson library. Fall back to the json module for
+    objects that orjson cannot serialize such as integers larger than 64 bits.
+    """
+    name = 'orjson'
+
+    def dumps(self, obj, pretty=False):
+        return self._dumps(obj, pretty).decode('utf-8')
+
+    def dumps_bytes(self, obj):
+        return self._dumps(obj)
+
+    def _dumps(self, obj, pretty=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            return super().dumps(obj, pretty=pretty).encode('utf-8')
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+SERIALIZERS = {
+    JsonSerializer.name: JsonSerializer,
+    OrjsonSerializer.name: OrjsonSerializer,
+}
+
+
+def get_serializer(name=None, fastest=True):
+    """
+    Return a serializer given its ``name``, or the serializer named in the
+    SCANCODE_JSON_SERIALIZER environment variable. Otherwise, return the
+    fastest available serializer if ``fastest`` is True or the "json"
+    serializer if False.
+    """
+    name = name or os.environ.get('SCANCODE_JSON_SERIALIZER')
+    if not name:
+        name = 'orjson' if orjson and fastest else 'json'
+
+    serializer_class = SERIALIZERS.get(name)
+    if not serializer_class:
+        raise Exception(
+            f'Unknown JSON serializer: {name!r}. '
+            f'Use one of: {", ".join(sorted(SERIALIZERS))}'
+        )
+    if serializer_class is OrjsonSerializer and not orjson:
+        raise Exception(
+            'The orjson JSON serializer is not available: pip install orjson'
+        )
+    return serializer_class()
+
+
+# used for the on-disk caches, where the JSON bytes do not matter
+serializer = get_serializer()
+
+dumps = serializer.dumps
+dumps_bytes = serializer.dumps_bytes
+loads = serializer.loads
+
+# used for the JSON outputs, that must not depend on the installed libraries
+output_serializer = get_serializer(fastest=False)
+
+
+def get_json_encoder_class(serializer=serializer):
+    """
+    Return a json.JSONEncoder subclass that encodes with ``serializer``, for
+    use by libraries that accept an encoder class such as jsonstreams.
+    """
+
+    class SerializerJSONEncoder(json.JSONEncoder):
+
+        def __init__(self, *args, indent=None, **kwargs):
+            if not indent:
+                kwargs['separators'] = (',', ':')
+            super().__init__(*args, indent=indent, **kwargs)
+
+        def encode(self, o):
+            return serializer.dumps(o, pretty=bool(self.indent))
+
+        def iterencode(self, o, _one_shot=False):
+            return [self.encode(o)]
+
+    return SerializerJSONEncoder
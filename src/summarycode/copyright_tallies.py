@@ -14,7 +14,7 @@ import attr
 import fingerprints
 from text_unidecode import unidecode
 
-from cluecode.copyrights import CopyrightDetector
+from cluecode.copyrights import get_detector
 from commoncode.text import toascii
 from summarycode.utils import sorted_counter
 from summarycode.utils import get_resource_tallies
@@ -187,11 +187,13 @@ class Text(object):
         self.key = fp
 
 
-def tally_copyrights(texts, _detector=CopyrightDetector()):
+def tally_copyrights(texts, _detector=None):
     """
     Return a list of mapping of {value:string, count:int} given a
     list of copyright strings or Text() objects.
     """
+    if not _detector:
+        _detector = get_detector()
     texts_to_tally = []
     no_detection_counter = 0
     for text in texts:
@@ -13,10 +13,11 @@ from collections import Counter
 import attr
 from license_expression import Licensing
 
-from cluecode.copyrights import CopyrightDetector
+from cluecode.copyrights import get_detector
 from commoncode.cliutils import PluggableCommandLineOption
 from commoncode.cliutils import POST_SCAN_GROUP
 from commoncode.text import python_safe_name
+from licensedcode import expression_cache
 from packagedcode import models
 from packagedcode.utils import combine_expressions
 from plugincode.post_scan import PostScanPlugin
@@ -45,6 +46,10 @@ if TRACE:
             ' '.join(isinstance(a, str) and a or repr(a) for a in args))
 
 
+# shared so that simplified expressions are cached across consolidations
+_LICENSING = Licensing()
+
+
 @attr.s
 class Consolidation(object):
     """
@@ -77,7 +82,7 @@ class Consolidation(object):
         if license_expressions_to_combine:
             combined_license_expression = combine_expressions(license_expressions_to_combine)
             if combined_license_expression:
-                self.consolidated_license_expression = str(Licensing().parse(combined_license_expression).simplify())
+                self.consolidated_license_expression = str(expression_cache.simplify(combined_license_expression, _LICENSING))
         self.core_holders = [h.original for h in self.core_holders]
         self.other_holders = [h.original for h in self.other_holders]
         self.consolidated_holders = sorted(set(self.core_holders + self.other_holders))
@@ -253,7 +258,7 @@ def get_consolidated_packages(codebase):
             if package_copyright:
                 numbered_lines = [(0, package_copyright)]
 
-                holder_detections = CopyrightDetector().detect(
+                holder_detections = get_detector().detect(
                     numbered_lines,
                     include_copyrights=False,
                     include_holders=True,
@@ -282,7 +287,7 @@ def get_consolidated_packages(codebase):
 
             combined_discovered_license_expression = combine_expressions(discovered_license_expressions)
             if combined_discovered_license_expression:
-                simplified_discovered_license_expression = str(Licensing().parse(combined_discovered_license_expression).simplify())
+                simplified_discovered_license_expression = str(expression_cache.simplify(combined_discovered_license_expression, _LICENSING))
             else:
                 simplified_discovered_license_expression = None
 
@@ -16,6 +16,7 @@ from plugincode.post_scan import PostScanPlugin
 from plugincode.post_scan import post_scan_impl
 
 from packagedcode.utils import combine_expressions
+from licensedcode import expression_cache
 from licensedcode.cache import get_cache
 from licensedcode.detection import get_matches_from_detection_mappings
 from licensedcode.detection import LicenseMatchFromResult
@@ -343,7 +344,7 @@ def get_categories_from_match(license_match, licensing=Licensing()):
     """
     Return a list of license category strings from a single LicenseMatch mapping.
     """
-    license_keys = licensing.license_keys(license_match.rule.license_expression)
+    license_keys = expression_cache.license_keys(license_match.rule.license_expression, licensing)
     cache = get_cache()
     return [
         cache.db[license_key].category
@@ -16,7 +16,7 @@ from commoncode.cliutils import POST_SCAN_GROUP, PluggableCommandLineOption
 from license_expression import Licensing
 from plugincode.post_scan import PostScanPlugin, post_scan_impl
 
-from cluecode.copyrights import CopyrightDetector
+from cluecode.copyrights import get_detector
 from packagedcode.utils import combine_expressions
 from packagedcode import models
 from summarycode.copyright_tallies import canonical_holder
@@ -304,7 +304,7 @@ def get_holders_from_copyright(copyrght):
     else:
         numbered_lines.append((0, copyrght))
 
-    holder_detections = CopyrightDetector().detect(
+    holder_detections = get_detector().detect(
         numbered_lines,
         include_copyrights=False,
         include_holders=True,
@@ -7,11 +7,17 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+import hashlib
 import io
 import json
 import os
 import re
 import unicodedata
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import partial
+from itertools import accumulate
+from os.path import getsize
 
 import chardet
 import typecode
@@ -86,6 +92,58 @@ def numbered_text_lines(
             logger_debug('numbered_text_lines:', 'plain_text')
         return enumerate(unicode_text_lines(location), start_line)
 
+    file_context = get_file_context(location)
+    if file_context:
+        return file_context.numbered_text_lines(demarkup=demarkup, start_line=start_line)
+
+    return _numbered_text_lines(location, demarkup=demarkup, start_line=start_line)
+
+
+def numbered_text(location, demarkup=False):
+    """
+    Return a NumberedText for the text lines of the file at ``location``. See
+    numbered_text_lines() for details.
+    """
+    file_context = get_file_context(location)
+    if file_context:
+        return file_context.numbered_text(demarkup=demarkup)
+
+    return NumberedText(numbered_text_lines(location, demarkup=demarkup))
+
+
+class NumberedText:
+    """
+    The text of a sequence of numbered text lines joined with a LF such that
+    the whole text can be searched at once, with an index of the lines end
+    offsets to find the line of any text offset.
+
+    Note that a text line may contain its own line endings.
+    """
+
+    def __init__(self, numbered_lines):
+        # list of tuples of (line number, text line)
+        self.numbered_lines = list(numbered_lines)
+        lines = [line for _ln, line in self.numbered_lines]
+        self.text = '\n'.join(lines)
+        # the offset of the end of each line in text: this is the offset of the
+        # LF that follows this line
+        self.line_ends = [
+            end - 1 for end in accumulate(len(line) + 1 for line in lines)
+        ]
+
+    def line_index(self, offset):
+        """
+        Return the index in ``numbered_lines`` of the line that contains the
+        text character at ``offset``.
+        """
+        return bisect_left(self.line_ends, offset)
+
+
+def _numbered_text_lines(location, demarkup=False, start_line=1):
+    """
+    Yield tuples of (line number, text line) from the file at `location` based
+    on its detected file type. See numbered_text_lines() for details.
+    """
     T = typecode.get_type(location)
 
     if TRACE:
@@ -113,23 +171,25 @@ def numbered_text_lines(
 
     # lightweight markup stripping support
     if demarkup and markup.is_markup(location):
-        try:
-            numbered_lines = list(enumerate(markup.demarkup(location), start_line))
-            if TRACE:
-                logger_debug('numbered_text_lines:', 'demarkup')
+        if TRACE:
+            logger_debug('numbered_text_lines:', 'demarkup')
 
-            numbered_lines = break_numbered_unicode_text_lines(numbered_lines)
+        numbered_lines = enumerate(markup.demarkup(location), start_line)
+        numbered_lines = break_numbered_unicode_text_lines(numbered_lines)
 
-            if TRACE:
-                logger_debug('numbered_text_lines demarkup:', 'break_numbered_unicode_text_lines')
+        if TRACE:
+            logger_debug('numbered_text_lines demarkup:', 'break_numbered_unicode_text_lines')
 
-            return numbered_lines
-        except:
-            # try again later with as plain text
-            pass
+        # otherwise try again with as plain text
+        return fallback_on_error(
+            numbered_lines,
+            fallback=partial(_numbered_text_lines, location, start_line=start_line),
+        )
 
     if T.is_js_map:
         try:
+            # the JSON of the map is loaded at once: extracting its lines lazily
+            # would not use less memory
             numbered_lines = list(enumerate(js_map_sources_lines(location), start_line))
             if TRACE:
                 logger_debug('numbered_text_lines:', 'js_map')
@@ -176,6 +236,165 @@ def numbered_text_lines(
     return iter([])
 
 
+def fallback_on_error(numbered_lines, fallback):
+    """
+    Yield tuples of (line number, text line) from a lazy ``numbered_lines``
+    iterable. If extracting these lines fails with an exception, yield instead
+    the lines from the ``fallback`` callable returning an iterable of (line
+    number, text line) for the same file, skipping the lines already yielded.
+
+    This is used to fall back to another text extraction when a lazy extraction
+    fails at any line, without extracting all the lines upfront.
+    """
+    last_line_number = None
+    try:
+        for line_number, line in numbered_lines:
+            yield line_number, line
+            last_line_number = line_number
+    except Exception:
+        if TRACE:
+            logger_debug('fallback_on_error: failed after line:', last_line_number)
+
+        for line_number, line in fallback():
+            if last_line_number is None or line_number > last_line_number:
+                yield line_number, line
+
+
+# Files larger than this are not cached in a FileContext and are read as needed
+MAX_CONTEXT_FILE_SIZE = 10 * 1024 * 1024
+
+
+class FileContext:
+    """
+    Cache the data of a file at ``location`` that is shared by the scanners of
+    this file such that it is read and classified only once: the typecode Type,
+    the file content bytes and the numbered text lines and NumberedText with or
+    without markup.
+
+    Files larger than ``max_size`` bytes are not cached and are read as needed.
+
+    If ``with_timing`` is True, scanners can add detailed timings for this file
+    to the ``timings`` mapping. Otherwise ``timings`` is None. Scanners can also
+    add scan statistics for this file to the ``counters`` mapping.
+    """
+
+    def __init__(self, location, max_size=MAX_CONTEXT_FILE_SIZE, with_timing=False):
+        self.location = location
+        self.is_cacheable = os.path.isfile(location) and getsize(location) <= max_size
+        self._content = None
+        self._numbered_lines_by_demarkup = {}
+        self._numbered_text_by_demarkup = {}
+        # mapping of {timing key: execution time in seconds or calls count}
+        self.timings = {} if with_timing else None
+        # mapping of {counter name: count}
+        self.counters = {}
+        # mapping of {key: data} computed by a scanner of this file that other
+        # scanners of this file can reuse
+        self.cache = {}
+
+    @property
+    def file_type(self):
+        """
+        Return the typecode Type of this file.
+        """
+        return typecode.get_type(self.location)
+
+    @property
+    def content(self):
+        """
+        Return the content bytes of this file or None if this file is not
+        cacheable.
+        """
+        if self._content is None and self.is_cacheable:
+            with open(self.location, 'rb') as inp:
+                self._content = inp.read()
+        return self._content
+
+    def checksums(self, checksum_names=('sha1', 'md5', 'sha256')):
+        """
+        Return a mapping of {checksum name: hexdigest} for this file using the
+        ``checksum_names`` hashlib algorithm names. The values are None for an
+        empty file as in commoncode.hash.multi_checksums().
+        """
+        content = self.content
+        if content is None:
+            from commoncode.hash import multi_checksums
+            return multi_checksums(self.location, checksum_names)
+
+        return {
+            name: content and hashlib.new(name, content).hexdigest() or None
+            for name in checksum_names
+        }
+
+    def numbered_text_lines(self, demarkup=False, start_line=1):
+        """
+        Return an iterator of tuples of (line number, text line) for this file.
+        See numbered_text_lines() for details.
+        """
+        location = self.location
+        if not self.is_cacheable:
+            return _numbered_text_lines(location, demarkup=demarkup, start_line=start_line)
+
+        # the lines of a file without markup are the same with or without demarkup
+        demarkup = demarkup and markup.is_markup(location)
+
+        numbered_lines = self._numbered_lines_by_demarkup.get(demarkup)
+        if numbered_lines is None:
+            numbered_lines = list(_numbered_text_lines(location, demarkup=demarkup))
+            self._numbered_lines_by_demarkup[demarkup] = numbered_lines
+
+        if start_line != 1:
+            offset = start_line - 1
+            return ((line_number + offset, line) for line_number, line in numbered_lines)
+
+        return iter(numbered_lines)
+
+    def numbered_text(self, demarkup=False):
+        """
+        Return a NumberedText for the text lines of this file.
+        """
+        if not self.is_cacheable:
+            return NumberedText(self.numbered_text_lines(demarkup=demarkup))
+
+        demarkup = demarkup and markup.is_markup(self.location)
+
+        text = self._numbered_text_by_demarkup.get(demarkup)
+        if text is None:
+            text = NumberedText(self.numbered_text_lines(demarkup=demarkup))
+            self._numbered_text_by_demarkup[demarkup] = text
+        return text
+
+
+# The FileContext of the file currently scanned, if any
+_file_context = None
+
+
+@contextmanager
+def file_context(location, with_timing=False):
+    """
+    Context manager yielding a FileContext for the file at ``location``. Text
+    lines returned by numbered_text_lines() for this ``location`` are cached in
+    this FileContext for the duration of the ``with`` block. Collect detailed
+    timings if ``with_timing`` is True.
+    """
+    global _file_context
+    previous = _file_context
+    _file_context = FileContext(location, with_timing=with_timing)
+    try:
+        yield _file_context
+    finally:
+        _file_context = previous
+
+
+def get_file_context(location):
+    """
+    Return the current FileContext for the file at ``location`` or None.
+    """
+    context = _file_context
+    if context and context.location == location:
+        return context
+
+
 def unicode_text_lines_from_binary(location):
     """
     Return an iterable over unicode text lines extracted from a binary file at
@@ -335,10 +554,37 @@ def unicode_text_lines(location, decrlf=False):
 
 def _unicode_text_lines(location):
     with open(location, 'rb') as f:
-        for line in f.read().splitlines(True):
+        for line in binary_lines(f):
             yield as_unicode(line)
 
 
+def binary_lines(binary_file, buff_size=64 * 1024):
+    """
+    Yield bytes lines with their line endings read from a ``binary_file``
+    file-like object in chunks of `buff_size` bytes. Lines are split on LF, CR
+    and CRLF line endings as with bytes.splitlines(True).
+    """
+    # the pieces of the last line which may continue in the next chunk: these
+    # are joined only once a line ending is found, such that a very long line
+    # is not copied over and over for each chunk
+    pending = []
+    while 1:
+        buf = binary_file.read(buff_size)
+        if not buf:
+            break
+        pending.append(buf)
+        if b'\n' not in buf and b'\r' not in buf:
+            continue
+        lines = b''.join(pending).splitlines(True)
+        # the last line may continue in the next chunk, even if it ends with a
+        # CR that could be followed by a LF
+        pending = [lines.pop()]
+        yield from lines
+
+    # a pending CR may be followed by other pieces without line ending
+    yield from b''.join(pending).splitlines(True)
+
+
 def unicode_text(location, decrlf=False):
     """
     Return a string guaranteed to be unicode from the content of the file at
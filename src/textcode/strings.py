@@ -40,16 +40,40 @@ def strings_from_file(location, buff_size=1024 * 1024, clean=True, min_len=MIN_L
     memory usage).
     """
     with open(location, 'rb') as f:
-        while 1:
-            buf = f.read(buff_size)
-            if not buf:
-                break
+        for buf in binary_chunks(f, buff_size=buff_size):
             for s in strings_from_string(buf, clean=clean, min_len=min_len):
                 s = s.strip()
                 if len(s) >= min_len:
                     yield s
 
 
+def binary_chunks(binary_file, buff_size=1024 * 1024):
+    """
+    Yield bytes chunks read from a ``binary_file`` file-like object in chunks
+    of about `buff_size` bytes such that a string is not split between two
+    chunks: the trailing bytes of a chunk that may be the start of a string are
+    carried over to the start of the next chunk. A string longer than
+    `buff_size` bytes may still be split.
+    """
+    carried = b''
+    while 1:
+        buf = binary_file.read(buff_size)
+        if not buf:
+            if carried:
+                yield carried
+            break
+
+        buf = carried + buf
+        # the trailing string bytes may continue in the next chunk
+        end = len(buf.rstrip(string_bytes))
+        if len(buf) - end > buff_size:
+            # do not carry over more than one chunk
+            end = len(buf)
+        carried = buf[end:]
+        if end:
+            yield buf[:end]
+
+
 # Extracted text is digit, letters, punctuation and white spaces
 punctuation = re.escape(b"""!"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~""")
 whitespaces = b' \\t\\n\\r\t\n\r'
@@ -72,6 +96,12 @@ _ascii_pattern = (
 
 ascii_strings = re.compile(_ascii_pattern).finditer
 
+# all the bytes that can be part of a plain or utf-16-le-encoded string
+string_bytes = bytes(
+    byte for byte in range(256)
+    if re.match(b'[' + printable + null_byte + b']', bytes([byte]))
+)
+
 replace_literal_line_returns = re.compile(
     '[\\n\\r]+$'
 ).sub
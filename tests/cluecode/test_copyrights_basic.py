@@ -224,6 +224,44 @@ class TestTextPreparation(FileBasedTesting):
         result = list(copyrights.collect_candidate_lines(enumerate(lines, 1)))
         assert result == expected
 
+    def test_filter_candidate_lines_keeps_candidate_lines_groups(self):
+        lines = '''
+            int main(void) {
+                return 0;
+            }
+            /*
+             * Written by: J. Doe
+             * All rights reserved
+             */
+            static int x;
+
+            static int y;
+            static int z;
+            static int w;
+            /* Portions are © The Foo Project */
+            #define COPYRIGHT_H
+
+            static int v;
+            const char* c = "Copy-
+            right Bar";
+            const char* u = "http://example.com";
+        '''.splitlines(False)
+        numbered_lines = list(enumerate(lines, 1))
+        filtered = copyrights.filter_candidate_lines(numbered_lines)
+        assert [ln for ln, _ in filtered] == [
+            6, 7, 8, 9, 10, 14, 15, 16, 17, 18, 19, 20, 21]
+
+        expected = list(copyrights.collect_candidate_lines(numbered_lines))
+        assert list(copyrights.collect_candidate_lines(filtered)) == expected
+
+    def test_filter_candidate_lines_skips_lines_without_markers(self):
+        lines = [
+            'import os',
+            'def main():',
+            '    return os.getcwd()',
+        ]
+        assert copyrights.filter_candidate_lines(enumerate(lines, 1)) == []
+
     def test_is_candidates_should_not_select_line_with_bare_full_year(self):
         line = '2012'
         line = prepare_text_line(line)
@@ -299,6 +337,39 @@ class TestTextPreparation(FileBasedTesting):
 class TestCopyrightDetector(FileBasedTesting):
     test_data_dir = os.path.join(os.path.dirname(__file__), 'data')
 
+    def test_get_detector_returns_a_shared_detector(self):
+        detector = copyrights.get_detector()
+        assert isinstance(detector, copyrights.CopyrightDetector)
+        assert copyrights.get_detector() is detector
+
+    def test_compiled_lexer_assigns_the_same_labels_as_the_lexer(self):
+        from pygmars import lex
+        from pygmars import Token
+
+        matchers = [
+            (r'^[Cc]opyright$', 'COPY'),
+            (r'^(?i:\(c\))$', 'COPY'),
+            (r'^([0-9]{4})(-[0-9]{4})?$', 'YR'),
+            (r'^[A-Z][a-z]+$', 'NNP'),
+            (r'^Foo$', 'NEVER'),
+            (r'.*s$', 'NNS'),
+            (r'^$', 'EMPTY'),
+        ]
+        values = [
+            'Copyright', 'copyright', '(C)', '2008', '2008-2010', '20082',
+            'Foo', 'bars', 'bar', '', 'Copyrights',
+        ]
+        lexer = lex.Lexer(matchers)
+        expected = [(t.value, t.label) for t in lexer.lex_strings(values)]
+
+        compiled = copyrights.CompiledLexer(matchers, max_cached=4)
+        for _ in range(2):
+            results = [(t.value, t.label) for t in compiled.lex_strings(values)]
+            assert results == expected
+
+        token = Token('bar', label='JUNK')
+        assert list(compiled.lex_tokens([token]))[0].label == 'JUNK'
+
     def test_detect(self):
         location = self.get_test_loc('copyrights_basic/essential_smoke-ibm_c.c')
         expected = [
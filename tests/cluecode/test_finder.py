@@ -758,6 +758,68 @@ class TestUrl(FileBasedTesting):
             assert str == type(url)
 
 
+class TestClues(FileBasedTesting):
+    test_data_dir = os.path.join(os.path.dirname(__file__), 'data')
+
+    def test_find_clues_returns_the_same_matches_as_find(self):
+        test_dirs = 'finder/email', 'finder/url'
+        for test_dir in test_dirs:
+            test_dir = self.get_test_loc(test_dir)
+            for test_file in sorted(os.listdir(test_dir)):
+                location = os.path.join(test_dir, test_file)
+                expected = dict(
+                    emails=list(find(location, [('emails', finder.emails_regex())])),
+                    urls=list(find(location, [('urls', urls_regex())])),
+                )
+                assert finder.find_clues(location) == expected
+
+    def test_find_clues_searches_large_files_line_by_line(self):
+        from unittest import mock
+        from textcode import analysis
+
+        test_dirs = 'finder/email', 'finder/url'
+        for test_dir in test_dirs:
+            test_dir = self.get_test_loc(test_dir)
+            for test_file in sorted(os.listdir(test_dir)):
+                location = os.path.join(test_dir, test_file)
+                expected = finder.find_clues(location)
+                with mock.patch.object(analysis, 'MAX_CONTEXT_FILE_SIZE', 0), \
+                    mock.patch.object(analysis, 'numbered_text', side_effect=AssertionError):
+                    assert finder.is_large_file(location) == bool(os.path.getsize(location))
+                    assert finder.find_clues(location) == expected
+
+    def test_find_clues_finds_anchors_in_any_case(self):
+        lines = [
+            'see WWW.Example.org or FTP.gnu.org',
+            'and Git@GitHub.com:nexb/scancode.git',
+            'or HTTPS://gnu.org by Joe@GNU.org',
+            'but not www or ftp: or @',
+        ]
+        result = finder.find_clues(lines)
+        assert [m for _k, m, _l, _ln in result['emails']] == [
+            'Git@GitHub.com', 'Joe@GNU.org']
+        assert [(m, ln) for _k, m, _l, ln in result['urls']] == [
+            ('WWW.Example.org', 1),
+            ('FTP.gnu.org', 1),
+            ('Git@GitHub.com:nexb/scancode.git', 2),
+            ('HTTPS://gnu.org', 3),
+        ]
+
+    def test_find_clues_in_file_context_finds_all_clues_once(self):
+        from textcode.analysis import file_context
+        test_file = self.get_test_loc('finder/url/verify.go')
+        expected_urls = list(finder.find_urls(test_file))
+
+        with file_context(test_file) as context:
+            emails = list(finder.find_emails(test_file, clue_keys=('emails', 'urls')))
+            assert sorted(context.cache['clues']) == ['emails', 'urls']
+            cached_urls = context.cache['clues']['urls']
+            assert list(finder.find_urls(test_file, clue_keys=('emails', 'urls'))) == expected_urls
+            assert context.cache['clues']['urls'] is cached_urls
+
+        assert emails == list(finder.find_emails(test_file))
+
+
 class TestSearch(FileBasedTesting):
     test_data_dir = os.path.join(os.path.dirname(__file__), 'data')
 
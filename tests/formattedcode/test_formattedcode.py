@@ -99,3 +99,80 @@ def test_validate_output_file_path_with_existing_non_writable_file_raise_excepti
             validate_output_file_path(test_file)
     finally:
         fileutils.chmod(test_dir, fileutils.RW, recurse=True)
+
+
+def get_synthetic_files(count):
+    """
+    Yield ``count`` synthetic scanned file mappings, each created on demand.
+    """
+    for i in range(count):
+        yield dict(
+            path=f'synthetic/dir{i // 100}/file{i}.c',
+            type='file',
+            name=f'file{i}.c',
+            size=i,
+            sha1=f'{i:040x}',
+            copyrights=[
+                dict(copyright=f'Copyright (c) {i} Synthetic Authors', start_line=1, end_line=1),
+            ],
+            holders=[dict(holder=f'{i} Synthetic Authors', start_line=1, end_line=1)],
+            scan_errors=[],
+        )
+
+
+def check_files_writer_memory_is_bounded(writer, output_location, count=20000):
+    """
+    Check that the ``writer`` files writer streams ``count`` synthetic files to
+    ``output_location`` with a peak memory that is a small fraction of the size
+    of its output. The memory used to start the writer is not accounted.
+    """
+    import tracemalloc
+    from formattedcode import close_files_writer
+
+    next(writer)
+    tracemalloc.start()
+    try:
+        for scanned_file in get_synthetic_files(count):
+            writer.send(scanned_file)
+        close_files_writer(writer)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    output_size = os.path.getsize(output_location)
+    assert output_size > 2000000
+    assert peak < output_size / 10
+
+
+def test_json_results_writer_memory_is_bounded():
+    from commoncode.resource import Codebase
+    from formattedcode.output_json import results_writer
+
+    codebase = Codebase(test_env.get_temp_dir('codebase'))
+    result_file = test_env.get_temp_file('json')
+    with open(result_file, 'w') as output_file:
+        writer = results_writer(codebase, output_file)
+        check_files_writer_memory_is_bounded(writer, result_file)
+
+
+def test_csv_writer_memory_is_bounded():
+    from formattedcode.output_csv import csv_writer
+
+    result_file = test_env.get_temp_file('csv')
+    with open(result_file, 'w') as output_file:
+        writer = csv_writer(output_file)
+        check_files_writer_memory_is_bounded(writer, result_file)
+
+
+def test_html_app_writer_memory_is_bounded():
+    from formattedcode.output_html import html_app_writer
+
+    result_file = test_env.get_temp_file('html')
+    with open(result_file, 'w') as output_file:
+        writer = html_app_writer(output_file, version='1.0', scanned_path='synthetic')
+        data_file = os.path.join(
+            os.path.dirname(result_file),
+            fileutils.file_base_name(result_file) + '_files',
+            'data.js',
+        )
+        check_files_writer_memory_is_bounded(writer, data_file)
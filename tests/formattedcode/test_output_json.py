@@ -8,6 +8,7 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+import json
 import os
 
 import pytest
@@ -43,6 +44,54 @@ def test_json_compact():
     check_json_scan(expected, result_file, remove_file_date=True, regen=REGEN_TEST_FIXTURES)
 
 
+def test_json_outputs_escape_non_ascii_and_use_standard_separators(monkeypatch):
+    monkeypatch.delenv('SCANCODE_JSON_SERIALIZER', raising=False)
+    test_dir = test_env.get_temp_dir()
+    with open(os.path.join(test_dir, 'fran\u00e7ois.txt'), 'w') as out:
+        out.write('some text')
+    result_file = test_env.get_temp_file('json')
+    result_file_pp = test_env.get_temp_file('json')
+    run_scan_click(['-i', test_dir, '--json', result_file, '--json-pp', result_file_pp])
+
+    with open(result_file, 'rb') as res:
+        compact = res.read()
+    assert b'fran\\u00e7ois.txt' in compact
+    assert b'", "' in compact
+
+    with open(result_file_pp, 'rb') as res:
+        pretty = res.read()
+    assert b'fran\\u00e7ois.txt' in pretty
+    assert json.loads(compact) == json.loads(pretty)
+
+
+def test_json_with_multiple_outputs_in_a_single_run():
+    test_dir = test_env.get_test_loc('json/simple')
+    result_file_pp = test_env.get_temp_file('json')
+    result_file = test_env.get_temp_file('json')
+    result_file_lines = test_env.get_temp_file('jsonlines')
+    args = [
+        '-clip', test_dir,
+        '--json-pp', result_file_pp,
+        '--json', result_file,
+        '--json-lines', result_file_lines,
+    ]
+    run_scan_click(args)
+    expected = test_env.get_test_loc('json/simple-expected.jsonpp')
+    check_json_scan(expected, result_file_pp, remove_file_date=True, regen=False)
+    expected = test_env.get_test_loc('json/simple-expected.json')
+    check_json_scan(expected, result_file, remove_file_date=True, regen=False)
+
+    with open(result_file) as res:
+        expected_files = json.load(res)['files']
+    with open(result_file_lines) as res:
+        results_files = [
+            scanned_file
+            for line in res
+            for scanned_file in json.loads(line).get('files', [])
+        ]
+    assert results_files == expected_files
+
+
 def test_json_with_extracted_license_statements():
     test_dir = test_env.get_test_loc('common/manifests')
     result_file = test_env.get_temp_file('json')
@@ -72,7 +121,6 @@ def test_scan_output_does_not_truncate_copyright_with_json_to_stdout():
 
 @pytest.mark.scanslow
 def test_scan_output_for_timestamp():
-    import json
 
     test_dir = test_env.get_test_loc('json/simple')
     result_file = test_env.get_temp_file('json')
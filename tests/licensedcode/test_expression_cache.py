@@ -0,0 +1,78 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+from unittest import TestCase
+
+from license_expression import Licensing
+
+from licensedcode import expression_cache
+from licensedcode.expression_cache import LicenseExpressionCache
+from licensedcode.expression_cache import get_expression_cache
+
+
+class TestLicenseExpressionCache(TestCase):
+
+    def test_parse_simplify_and_license_keys_are_cached(self):
+        licensing = Licensing()
+        expression = 'mit or gpl-2.0 and mit'
+
+        parsed = expression_cache.parse(expression, licensing)
+        assert parsed == licensing.parse(expression)
+        assert expression_cache.parse(expression, licensing) is parsed
+
+        simplified = expression_cache.simplify(expression, licensing)
+        assert str(simplified) == str(licensing.parse(expression).simplify())
+        assert expression_cache.simplify(expression, licensing) is simplified
+
+        keys = expression_cache.license_keys(expression, licensing)
+        assert keys == ['mit', 'gpl-2.0']
+        # a new list is returned each time
+        keys.append('foo')
+        assert expression_cache.license_keys(expression, licensing) == ['mit', 'gpl-2.0']
+
+        cache = get_expression_cache(licensing)
+        assert dict(cache.misses) == {'_parse': 1, '_simplify': 1, '_license_keys': 1}
+        assert dict(cache.hits) == {'_parse': 1, '_simplify': 1, '_license_keys': 1}
+
+    def test_caches_are_not_shared_between_licensings(self):
+        licensing1 = Licensing()
+        licensing2 = Licensing()
+        assert get_expression_cache(licensing1) is get_expression_cache(licensing1)
+        assert get_expression_cache(licensing1) is not get_expression_cache(licensing2)
+
+    def test_expression_objects_are_not_cached(self):
+        licensing = Licensing()
+        parsed = licensing.parse('mit and apache-2.0')
+        assert expression_cache.license_keys(parsed, licensing) == ['mit', 'apache-2.0']
+        assert not get_expression_cache(licensing).results
+
+    def test_cache_evicts_least_recently_used_results(self):
+        cache = LicenseExpressionCache(max_entries=2)
+        licensing = Licensing()
+
+        def upper(expression, licensing):
+            return expression.upper()
+
+        assert cache.get(upper, 'mit', licensing) == 'MIT'
+        assert cache.get(upper, 'bsd-new', licensing) == 'BSD-NEW'
+        assert cache.get(upper, 'mit', licensing) == 'MIT'
+        assert cache.get(upper, 'apache-2.0', licensing) == 'APACHE-2.0'
+        assert list(cache.results) == [(upper, 'mit'), (upper, 'apache-2.0')]
+        assert cache.hits['upper'] == 1
+        assert cache.misses['upper'] == 3
+
+    def test_get_stats(self):
+        licensing = Licensing()
+        hits, misses = expression_cache.get_stats()
+        expression_cache.license_keys('mit or bsd-new', licensing)
+        expression_cache.license_keys('mit or bsd-new', licensing)
+        expression_cache.license_keys('mit or bsd-new', licensing)
+        new_hits, new_misses = expression_cache.get_stats()
+        assert new_hits - hits == 2
+        assert new_misses - misses == 1
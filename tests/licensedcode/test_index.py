@@ -15,6 +15,7 @@ from commoncode import fileutils
 from commoncode.testcase import FileBasedTesting
 from licensedcode import index
 from licensedcode import match_seq
+from licensedcode import match_set
 from licensedcode import models
 from licensedcode.legalese import build_dictionary_from_iterable
 from licensedcode.query import Query
@@ -193,6 +194,48 @@ class TestIndexing(IndexTesting):
 
         assert sorted([sorted(kv.items()) for kv in htmset]) == sorted([sorted(kv.items()) for kv in expected_msets_by_rid])
 
+    def test_index_high_rids_by_tid_is_the_inverted_index_of_approx_matchable_high_sets(self):
+        idx = MiniLicenseIndex(self.get_test_rules('index/bsd'))
+        assert len(idx.high_rids_by_tid) == idx.len_legalese
+
+        expected = {}
+        for rid in idx.approx_matchable_rids:
+            for tid in idx.sets_by_rid[rid]:
+                if tid < idx.len_legalese:
+                    expected.setdefault(tid, []).append(rid)
+        results = {tid: list(rids) for tid, rids in enumerate(idx.high_rids_by_tid) if rids}
+        assert results == {tid: sorted(rids) for tid, rids in expected.items()}
+
+    def test_count_high_matched_lengths_is_the_length_of_high_sets_intersections(self):
+        idx = MiniLicenseIndex(self.get_test_rules('index/bsd'))
+        qry = Query(location=self.get_test_loc('index/querysimple'), idx=idx)
+        qset, _ = match_set.build_set_and_mset(qry.whole_query_run().matchable_tokens())
+
+        high_matched_lengths = match_set.count_high_matched_lengths(
+            qset=qset,
+            high_rids_by_tid=idx.high_rids_by_tid,
+            len_legalese=idx.len_legalese,
+        )
+        assert high_matched_lengths
+        for rid in idx.approx_matchable_rids:
+            intersection = qset & idx.sets_by_rid[rid]
+            high_intersection = match_set.high_tids_set_subset(intersection, idx.len_legalese)
+            if high_intersection:
+                assert high_matched_lengths[rid] == len(high_intersection)
+            else:
+                assert rid not in high_matched_lengths
+
+    def test_compute_candidates_is_empty_without_high_tokens(self):
+        idx = MiniLicenseIndex(self.get_test_rules('index/bsd'))
+        qry = Query(query_string='this is some non legal text', idx=idx)
+        query_run = qry.whole_query_run()
+        candidates = match_set.compute_candidates(
+            query_run=query_run,
+            idx=idx,
+            matchable_rids=idx.approx_matchable_rids,
+        )
+        assert candidates == []
+
     def test_index_fails_on_duplicated_rules(self):
         rule_dir = self.get_test_loc('index/no_duplicated_rule')
         try:
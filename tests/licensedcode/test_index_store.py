@@ -0,0 +1,116 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import os
+import pickle
+
+from commoncode import fileutils
+from commoncode.testcase import FileBasedTesting
+from licensedcode import index
+from licensedcode import index_store
+from licensedcode_test_utils import create_rule_from_text_file_and_expression
+from licensedcode_test_utils import mini_legalese
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+
+class TestIndexStore(FileBasedTesting):
+    test_data_dir = TEST_DATA_DIR
+
+    def get_test_index(self):
+        rule_data_dir = self.get_test_loc('index/bsd')
+        rules = []
+        for text_file in sorted(os.listdir(rule_data_dir)):
+            rules.append(create_rule_from_text_file_and_expression(
+                text_file=os.path.join(rule_data_dir, text_file),
+                license_expression=fileutils.file_base_name(text_file),
+            ))
+        return index.LicenseIndex(rules, _legalese=mini_legalese)
+
+    def get_stored_index(self, idx):
+        location = self.get_temp_file('index_arrays')
+        uid = index_store.dump(idx, location)
+        with index_store.detached(idx):
+            stored = pickle.loads(pickle.dumps(idx))
+        assert stored.tids_by_rid is None
+        return index_store.load(stored, location, uid=uid)
+
+    def test_load_has_same_structures_as_original_index(self):
+        idx = self.get_test_index()
+        stored = self.get_stored_index(idx)
+
+        assert len(stored.tids_by_rid) == len(idx.tids_by_rid)
+        for rid in range(len(idx.rules_by_rid)):
+            assert list(stored.tids_by_rid[rid]) == list(idx.tids_by_rid[rid])
+            assert stored.sets_by_rid[rid] == idx.sets_by_rid[rid]
+            assert stored.msets_by_rid[rid] == idx.msets_by_rid[rid]
+
+            postings = idx.high_postings_by_rid[rid]
+            stored_postings = stored.high_postings_by_rid[rid]
+            if postings is None:
+                assert stored_postings is None
+            else:
+                stored_postings = {t: list(p) for t, p in stored_postings.items()}
+                assert stored_postings == {t: list(p) for t, p in postings.items()}
+
+        assert len(stored.high_rids_by_tid) == len(idx.high_rids_by_tid)
+        for tid, rids in enumerate(idx.high_rids_by_tid):
+            assert list(stored.high_rids_by_tid[tid]) == list(rids)
+
+    def test_load_matches_like_original_index(self):
+        idx = self.get_test_index()
+        stored = self.get_stored_index(idx)
+        query_loc = self.get_test_loc('index/querysimple')
+
+        expected = [(m.rule.identifier, m.qspan, m.ispan) for m in idx.match(location=query_loc)]
+        results = [(m.rule.identifier, m.qspan, m.ispan) for m in stored.match(location=query_loc)]
+        assert results == expected
+
+    def test_load_fails_on_stale_uid(self):
+        idx = self.get_test_index()
+        location = self.get_temp_file('index_arrays')
+        index_store.dump(idx, location)
+        try:
+            index_store.load(idx, location, uid='not-the-uid')
+            self.fail('IndexStoreError not raised')
+        except index_store.IndexStoreError as e:
+            assert 'stale' in str(e)
+
+    def test_load_fails_on_invalid_file(self):
+        idx = self.get_test_index()
+        location = self.get_temp_file('index_arrays')
+        with open(location, 'wb') as out:
+            out.write(b'some junk' * 10)
+        try:
+            index_store.load(idx, location)
+            self.fail('IndexStoreError not raised')
+        except index_store.IndexStoreError as e:
+            assert 'Invalid' in str(e)
+
+    def test_stored_structures_can_be_pickled(self):
+        idx = self.get_test_index()
+        stored = self.get_stored_index(idx)
+        tids_by_rid = pickle.loads(pickle.dumps(stored.tids_by_rid))
+        assert [list(t) for t in tids_by_rid] == [list(t) for t in idx.tids_by_rid]
+
+    def test_dump_does_not_modify_a_loaded_arrays_file_in_place(self):
+        idx = self.get_test_index()
+        stored = self.get_stored_index(idx)
+        location = stored.tids_by_rid.store.location
+        expected = [list(t) for t in idx.tids_by_rid]
+
+        with open(location, 'rb') as inp:
+            original_inode = os.fstat(inp.fileno()).st_ino
+
+        new_uid = index_store.dump(self.get_test_index(), location)
+        assert os.stat(location).st_ino != original_inode
+        assert index_store.IndexArrays(location).uid == new_uid
+        # the previously loaded arrays are still the same
+        assert [list(t) for t in stored.tids_by_rid] == expected
+        assert not [f for f in os.listdir(os.path.dirname(location)) if f.endswith('.tmp')]
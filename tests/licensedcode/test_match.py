@@ -1684,6 +1684,19 @@ class TestCollectLicenseMatchTexts(FileBasedTesting):
         ]
         assert results == expected
 
+    def test_matched_text_is_collected_from_the_query_without_reading_the_file_again(self):
+        rules_data_dir = self.get_test_loc('matched_text/index/rules')
+        query_location = self.get_test_loc('matched_text/query.txt', copy=True)
+        rules = models.load_rules(rules_data_dir)
+        idx = LicenseIndex(rules)
+
+        matches = idx.match(location=query_location)
+        expected = [match.matched_text(_usecache=False) for match in matches]
+        os.remove(query_location)
+        results = [match.matched_text() for match in matches]
+        assert results == expected
+        assert matches[0].query.matched_text_tokens
+
     def check_matched_texts(self, test_loc, expected_texts, whole_lines=True):
         idx = cache.get_index()
         test_loc = self.get_test_loc(test_loc)
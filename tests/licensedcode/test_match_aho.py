@@ -34,3 +34,16 @@ class TestMatchExact(FileBasedTesting):
         assert len(matches) == 1
         match = matches[0]
         assert match.matcher == match_aho.MATCH_AHO_EXACT
+
+    def test_filter_already_matched_overlapping_matches(self):
+        from types import SimpleNamespace
+        from intbitset import intbitset
+        from licensedcode.spans import Span
+
+        qry = SimpleNamespace(matched=intbitset([5, 20, 21]))
+        overlapping = SimpleNamespace(qspan=Span(1, 3) | Span(19, 30))
+        other = SimpleNamespace(qspan=Span(6, 19) | Span(22, 25))
+        kept, discarded = match_aho.filter_already_matched_overlapping_matches(
+            [overlapping, other], qry)
+        assert kept == [other]
+        assert discarded == [overlapping]
@@ -0,0 +1,96 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import os
+
+from commoncode.testcase import FileBasedTesting
+
+from licensedcode import index
+from licensedcode import match_seq
+from licensedcode.legalese import build_dictionary_from_iterable
+from licensedcode.match_cache import QueryRunMatchesCache
+from licensedcode.match_cache import get_query_run_key
+from licensedcode.query import Query
+
+from licensedcode_test_utils import mini_legalese  # NOQA
+from licensedcode_test_utils import create_rule_from_text_and_expression
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+RULE_TEXT = '''
+    Copyright
+    THIS IS FROM [[THE OLD CODEHAUS]] AND CONTRIBUTORS
+    IN NO EVENT SHALL [[THE OLD CODEHAUS]] OR ITS CONTRIBUTORS BE LIABLE
+    EVEN IF ADVISED OF THE [[POSSIBILITY OF NEW SUCH]] DAMAGE
+'''
+
+NOTICE_TEXT = '''
+    Copyright 2003 (C) James. All Rights Reserved.
+    THIS IS FROM THE CODEHAUS AND CONTRIBUTORS
+    IN NO EVENT SHALL THE CODEHAUS OR ITS CONTRIBUTORS BE LIABLE
+    EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+'''
+
+
+class TestQueryRunMatchesCache(FileBasedTesting):
+    test_data_dir = TEST_DATA_DIR
+
+    def get_index(self):
+        rule = create_rule_from_text_and_expression(text=RULE_TEXT, license_expression='test')
+        legalese = build_dictionary_from_iterable(
+            set(mini_legalese) |
+            set(['copyright', 'reserved', 'advised', 'liable', 'damage',
+                 'contributors', 'alternately', 'possibility'])
+        )
+        return index.LicenseIndex([rule], _legalese=legalese)
+
+    def get_query_string(self, junk_lines):
+        # enough lines without legalese to break the notice in its own query run
+        junk = '\n'.join(f'int foo{i} = bar{i};' for i in range(junk_lines))
+        return junk + '\n' + NOTICE_TEXT
+
+    def get_results(self, matches):
+        return [(m.rule.identifier, m.qspan, m.ispan, m.hispan, m.start_line, m.end_line, m.matcher)
+            for m in matches]
+
+    def test_match_replays_cached_query_run_matches_at_new_positions(self):
+        idx = self.get_index()
+        cache = idx.query_run_matches_cache
+
+        idx.match(query_string=self.get_query_string(20))
+        assert cache.get_stats() == (0, 1)
+
+        query_string = self.get_query_string(30)
+        matches = idx.match(query_string=query_string)
+        assert cache.get_stats() == (1, 1)
+        assert len(matches) == 1
+        assert matches[0].matcher == match_seq.MATCH_SEQ
+        assert matches[0].start_line == 32
+
+        # these are the same matches as without a cache
+        idx.query_run_matches_cache = QueryRunMatchesCache()
+        expected = idx.match(query_string=query_string)
+        assert self.get_results(matches) == self.get_results(expected)
+
+    def test_cache_evicts_least_recently_used_entries(self):
+        idx = self.get_index()
+        query_run = Query(query_string=NOTICE_TEXT, idx=idx).whole_query_run()
+        cache = QueryRunMatchesCache(max_entries=2)
+        cache.put(b'1', query_run, [])
+        cache.put(b'2', query_run, [])
+        assert cache.get(b'1', query_run) == []
+        cache.put(b'3', query_run, [])
+        assert list(cache.matches_by_key) == [b'1', b'3']
+        assert cache.get(b'2', query_run) is None
+        assert cache.get_stats() == (1, 1)
+
+    def test_get_query_run_key_is_none_without_high_tokens(self):
+        idx = self.get_index()
+        query_run = Query(query_string='int foo = bar;', idx=idx).whole_query_run()
+        assert get_query_run_key(query_run) is None
@@ -0,0 +1,66 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import os
+from time import sleep
+
+from commoncode.testcase import FileBasedTesting
+from licensedcode import index
+from licensedcode import models
+from licensedcode.match_timings import MATCH_STAGES
+from licensedcode.match_timings import MatchTimings
+from licensedcode.match_timings import get_timer
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+
+class TestMatchTimings(FileBasedTesting):
+    test_data_dir = TEST_DATA_DIR
+
+    def test_timed_excludes_nested_stages_time(self):
+        timings = MatchTimings()
+        with timings.timed('seq'):
+            with timings.timed('candidates'):
+                sleep(0.05)
+            with timings.timed('candidates'):
+                sleep(0.05)
+
+        assert timings.counts == {'seq': 1, 'candidates': 2}
+        assert timings.durations['candidates'] >= 0.1
+        assert timings.durations['seq'] < 0.05
+
+    def test_to_dict_has_durations_and_counts(self):
+        timings = MatchTimings()
+        with timings.timed('hash'):
+            pass
+        results = timings.to_dict(prefix='licenses:')
+        assert sorted(results) == ['licenses:hash', 'licenses:hash:count']
+        assert results['licenses:hash:count'] == 1
+
+    def test_get_timer_without_timings_does_nothing(self):
+        timed = get_timer(None)
+        with timed('hash'):
+            pass
+
+    def test_match_collects_timings_of_matching_stages(self):
+        rule_dir = self.get_test_loc('hash/rules')
+        idx = index.LicenseIndex(models.load_rules(rule_dir))
+        query_doc = self.get_test_loc('hash/old_rules/lgpl-2.0-plus_23.RULE')
+
+        timings = MatchTimings()
+        matches = idx.match(query_doc, timings=timings)
+        assert matches
+        assert timings.counts == {'query': 1, 'hash': 1}
+
+        timings = MatchTimings()
+        idx.match(query_doc, timings=timings, _skip_hash_match=True)
+        assert 'hash' not in timings.counts
+        assert 'aho' in timings.counts
+        assert 'refine:merge' in timings.counts
+        assert set(timings.counts).issubset(MATCH_STAGES)
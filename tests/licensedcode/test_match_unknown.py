@@ -23,6 +23,8 @@ from licensedcode.models import get_rules
 from licensedcode.models import get_all_spdx_key_tokens
 from licensedcode.models import get_license_tokens
 
+from licensedcode.match_unknown import get_good_tids_ngrams
+from licensedcode.match_unknown import is_good_tokens_ngram
 from licensedcode.match_unknown import match_unknowns
 from licensedcode.match_unknown import MATCH_UNKNOWN
 from licensedcode.detection import LicenseMatchFromResult
@@ -61,6 +63,26 @@ class TestUnknownLicenses(FileBasedTesting):
 
         assert LicenseMatchFromResult.from_dict(match.to_dict())
 
+    def test_get_good_tids_ngrams_is_the_same_as_checking_each_ngram(self):
+        tokens = (
+            'copyright 2004 the foundation a b c permission is hereby granted '
+            'free of charge 1 2 3 to any person obtaining a copy 2 x y z the '
+            'software is provided as is as is as is without warranty of any kind'
+        ).split()
+        dictionary = {}
+        tids = [dictionary.setdefault(token, len(dictionary)) for token in tokens]
+        len_legalese = 8
+
+        ngram_tids = [tuple(tids[i:i + 6]) for i in range(len(tids) - 5)]
+        ngram_tokens = [tuple(tokens[i:i + 6]) for i in range(len(tokens) - 5)]
+        expected = [
+            tids_ngram for tids_ngram, tokens_ngram in zip(ngram_tids, ngram_tokens)
+            if is_good_tokens_ngram(tokens_ngram, tids_ngram, len_legalese)
+        ]
+        result = get_good_tids_ngrams(tids, tokens, len_legalese, ngram_length=6)
+        assert result == expected
+        assert 0 < len(result) < len(ngram_tids)
+
     def test_unknown_licenses_works(self):
         test_dir = self.get_test_loc('match_unknown/unknown.txt', copy=True)
         result_file = self.get_temp_file('json')
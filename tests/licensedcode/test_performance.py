@@ -145,6 +145,155 @@ class TestMatchingPerf(FileBasedTesting):
         self.profile_match(idx, locations, stats_file)
 
 
+class TestRefineMatchesPerformance(FileBasedTesting):
+    test_data_dir = TEST_DATA_DIR
+
+    def get_synthetic_matches(self, count, seed=42):
+        """
+        Return a list of ``count`` LicenseMatch to a few rules, mostly
+        overlapping or contained in each other such as seen in generated
+        license lists or concatenated NOTICE files.
+        """
+        import random
+        from licensedcode.match import LicenseMatch
+        from licensedcode.spans import Span
+        from licensedcode_test_utils import create_rule_from_text_and_expression
+
+        expressions = ['mit', 'apache-2.0', 'gpl-2.0', 'bsd-new', 'mit OR apache-2.0']
+        rules = [
+            create_rule_from_text_and_expression(
+                text=' '.join(f'{expression} word{i}' for i in range(length)),
+                license_expression=expression,
+            )
+            for length in range(4, 40, 5)
+            for expression in expressions
+        ]
+        index.LicenseIndex(rules)
+
+        random_ = random.Random(seed)
+        matches = []
+        pos = 0
+        for _ in range(count):
+            rule = random_.choice(rules)
+            length = random_.randint(2, rule.length)
+            start = max(pos + random_.randint(-length, 3), 0)
+            if random_.random() < 0.3:
+                # a sparse match with gaps
+                qspan = Span([p for p in range(start, start + length + 5) if random_.random() < 0.8] or [start])
+            else:
+                qspan = Span(start, start + length - 1)
+            istart = random_.randint(0, rule.length - length)
+            ispan = Span(istart, istart + len(qspan) - 1)
+            matches.append(LicenseMatch(
+                rule=rule,
+                qspan=qspan,
+                ispan=ispan,
+                hispan=Span(p for p in ispan if p % 3),
+                matcher='3-seq',
+                matcher_order=3,
+            ))
+            pos = start + random_.randint(0, length)
+        return matches
+
+    @skip('Use only for local profiling')
+    def test_refine_matches_performance_timing_on_many_synthetic_matches(self):
+        from time import time
+        from licensedcode.match import filter_contained_matches
+        from licensedcode.match import filter_overlapping_matches
+        from licensedcode.match import merge_matches
+
+        results = []
+        for count in (10000, 20000, 40000):
+            for function in (merge_matches, filter_contained_matches, filter_overlapping_matches):
+                matches = self.get_synthetic_matches(count)
+                start = time()
+                function(matches)
+                results.append((function.__name__, count, round(time() - start, 3)))
+        raise Exception(results)
+
+    @skip('Use only for local profiling')
+    def test_refine_matches_performance_profiling_on_many_synthetic_matches(self):
+        import cProfile as profile
+        import pstats
+        from licensedcode.match import filter_contained_matches
+        from licensedcode.match import filter_overlapping_matches
+        from licensedcode.match import merge_matches
+
+        matches = self.get_synthetic_matches(20000)
+
+        def refine():
+            merged = merge_matches(list(matches))
+            kept, _discarded = filter_contained_matches(merged)
+            filter_overlapping_matches(kept)
+
+        stats_file = 'test_refine_matches_performance_profiling_on_many_synthetic_matches.txt'
+        profile.runctx('refine()', globals(), locals(), stats_file)
+        p = pstats.Stats(stats_file)
+        p.sort_stats('time').print_stats(40)
+        raise Exception('refine matches perfs test')
+
+
+class TestSpanPerformance(FileBasedTesting):
+    test_data_dir = TEST_DATA_DIR
+
+    @skip('Use only for local profiling')
+    def test_span_performance_timing_against_intbitset(self):
+        """
+        Compare the run-length Span with the intbitset operations of the
+        previous intbitset-backed Span on spans of one, a few and many
+        contiguous runs. The spans of matches have typically a few runs.
+        """
+        results = []
+        for runs_count in (1, 3, 40):
+            runs = [(start, start + 40) for start in range(1000, 1000 + runs_count * 50, 50)]
+            positions = [p for start, end in runs for p in range(start, end + 1)]
+            other_positions = [p + 25 for p in positions]
+            results.extend(
+                (runs_count,) + result
+                for result in self.get_span_timings(positions, other_positions)
+            )
+        raise Exception(results)
+
+    def get_span_timings(self, positions, other_positions):
+        """
+        Return a list of (operation, Span time, intbitset time) for common
+        operations on two sets of ``positions`` and ``other_positions``.
+        The intbitset-backed Span built a new intbitset from a list for each new
+        Span, as done here.
+        """
+        from timeit import timeit
+        from intbitset import intbitset
+        from licensedcode.spans import Span
+
+        span = Span(positions)
+        other_span = Span(other_positions)
+        bits = intbitset(positions)
+        other_bits = intbitset(other_positions)
+        start = positions[0]
+        end = positions[-1]
+
+        benchmarks = [
+            ('range', lambda: Span(start, end), lambda: intbitset(list(range(start, end + 1)))),
+            ('positions', lambda: Span(positions), lambda: intbitset(list(positions))),
+            ('start-end', lambda: (span.start, span.end), lambda: (bits[0], bits[-1])),
+            ('length', lambda: len(span), lambda: len(bits)),
+            ('union', lambda: span | other_span, lambda: intbitset(list(bits | other_bits))),
+            ('intersection', lambda: span & other_span, lambda: intbitset(list(bits & other_bits))),
+            ('overlap', lambda: span.overlap(other_span), lambda: len(intbitset(list(bits & other_bits)))),
+            ('difference', lambda: span.difference(other_span), lambda: intbitset(list(bits - other_bits))),
+            ('contains', lambda: other_span in span, lambda: bits.issuperset(other_bits)),
+            ('membership', lambda: end in span, lambda: end in bits),
+            ('iteration', lambda: list(span), lambda: list(bits)),
+        ]
+
+        timings = []
+        for name, span_op, bits_op in benchmarks:
+            span_time = timeit(span_op, number=10000)
+            bits_time = timeit(bits_op, number=10000)
+            timings.append((name, round(span_time, 4), round(bits_time, 4)))
+        return timings
+
+
 class TestIndexingPerformance(FileBasedTesting):
     test_data_dir = TEST_DATA_DIR
 
@@ -109,7 +109,7 @@ class TestQueryWithSingleRun(IndexTesting):
 
         assert result_str == expected_str
 
-        assert qry.line_by_pos == [3, 3, 3, 3, 3, 3, 3, 3, 3, 6]
+        assert list(qry.line_by_pos) == [3, 3, 3, 3, 3, 3, 3, 3, 3, 6]
 
         idx = index.LicenseIndex([create_rule_from_text_and_expression(text=rule_text, license_expression='bsd')])
         querys = 'and this is not a license'
@@ -129,11 +129,11 @@ class TestQueryWithSingleRun(IndexTesting):
         qry = Query(query_string=querys, idx=idx, _test_mode=False)
         # we have only 4 known positions in this query, hence only 4 entries there on a single line
         # "Redistribution and use in"
-        assert qry.line_by_pos == [1, 1, 1, 1, 1]
+        assert list(qry.line_by_pos) == [1, 1, 1, 1, 1]
 
         # this show our 4 known token in this query with their known position
         # "Redistribution and use in"
-        assert qry.tokens == [1, 2, 3, 4, 0]
+        assert list(qry.tokens) == [1, 2, 3, 4, 0]
 
         # the first two tokens are unknown, then starting after "in" we have three trailing unknown.
         assert qry.unknowns_by_pos == {3: 1, 4: 1, -1: 2}
@@ -155,6 +155,23 @@ class TestQueryWithSingleRun(IndexTesting):
         ]
         assert result == expected
 
+    def test_Query_tokens_are_compact_arrays_and_track_shorts_and_digits(self):
+        rule_text = 'Redistribution and use in source and binary forms 2 b'
+        rule = create_rule_from_text_and_expression(text=rule_text, license_expression='bsd')
+        legalese = build_dictionary_from_iterable(['redistribution', 'form', ])
+        idx = index.LicenseIndex([rule], _legalese=legalese)
+
+        querys = 'The b Redistribution and use\n in 2 source div and binary'
+        qry = Query(query_string=querys, idx=idx)
+        assert qry.tokens.typecode == 'h'
+        assert qry.line_by_pos.typecode == 'i'
+        assert list(qry.line_by_pos) == [1, 1, 1, 1, 2, 2, 2, 2, 2]
+        # "div" is a stopword
+        assert qry.stopwords_by_pos == {6: 1}
+        assert qry.unknowns_by_pos == {-1: 1}
+        # "b" and "2"
+        assert qry.shorts_and_digits_pos == {0, 5}
+
     def test_Query_tokenize_from_string(self):
         rule_text = 'Redistribution and use in source and binary forms with or without modification are permitted'
         idx = index.LicenseIndex([create_rule_from_text_and_expression(text=rule_text, license_expression='bsd')])
@@ -278,7 +295,7 @@ class TestQueryWithSingleRun(IndexTesting):
             4, 4, 4, 4, 4, 4, 4, 4, 6, 6, 6, 6, 6, 7, 7, 7, 7, 7, 8,
             9, 9, 9, 9, 9, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 11, 15
         ]
-        assert qry.line_by_pos == expected_lbp
+        assert list(qry.line_by_pos) == expected_lbp
 
     def test_query_and_index_tokens_are_identical_for_same_text(self):
         rule_dir = self.get_test_loc('query/rtos_exact/')
@@ -310,56 +327,56 @@ class TestQueryWithSingleRun(IndexTesting):
         q = Query(query_string='a the', idx=idx)
         assert q.line_by_pos
         qrun = q.query_runs[0]
-        assert qrun.tokens == [2]
+        assert list(qrun.tokens) == [2]
         assert qrun.query.unknowns_by_pos == {}
 
         # one junk
         q = Query(query_string='a binary', idx=idx)
         qrun = q.query_runs[0]
         assert q.line_by_pos
-        assert qrun.tokens == [0]
+        assert list(qrun.tokens) == [0]
         assert qrun.query.unknowns_by_pos == {}
 
         # one junk
         q = Query(query_string='binary the', idx=idx)
         qrun = q.query_runs[0]
         assert q.line_by_pos
-        assert qrun.tokens == [0, 2]
+        assert list(qrun.tokens) == [0, 2]
         assert qrun.query.unknowns_by_pos == {}
 
         # one unknown at start
         q = Query(query_string='that binary', idx=idx)
         qrun = q.query_runs[0]
         assert q.line_by_pos
-        assert qrun.tokens == [0]
+        assert list(qrun.tokens) == [0]
         assert qrun.query.unknowns_by_pos == {-1: 1}
 
         # one unknown at end
         q = Query(query_string='binary that', idx=idx)
         qrun = q.query_runs[0]
         assert q.line_by_pos
-        assert qrun.tokens == [0]
+        assert list(qrun.tokens) == [0]
         assert qrun.query.unknowns_by_pos == {0: 1}
 
         # onw unknown in the middle
         q = Query(query_string='binary that a binary', idx=idx)
         qrun = q.query_runs[0]
         assert q.line_by_pos
-        assert qrun.tokens == [0, 0]
+        assert list(qrun.tokens) == [0, 0]
         assert qrun.query.unknowns_by_pos == {0: 1}
 
         # onw unknown in the middle
         q = Query(query_string='a binary that a binary', idx=idx)
         qrun = q.query_runs[0]
         assert q.line_by_pos
-        assert qrun.tokens == [0, 0]
+        assert list(qrun.tokens) == [0, 0]
         assert qrun.query.unknowns_by_pos == {0: 1}
 
         # two unknowns in the middle
         q = Query(query_string='binary that was a binary', idx=idx)
         qrun = q.query_runs[0]
         assert q.line_by_pos
-        assert qrun.tokens == [0, 0]
+        assert list(qrun.tokens) == [0, 0]
         assert qrun.query.unknowns_by_pos == {0: 2}
 
         # unknowns at start, middle and end
@@ -367,7 +384,7 @@ class TestQueryWithSingleRun(IndexTesting):
         #                         u     u           u    u            u    u
         qrun = q.query_runs[0]
         assert q.line_by_pos
-        assert qrun.tokens == [0, 0]
+        assert list(qrun.tokens) == [0, 0]
         assert qrun.query.unknowns_by_pos == {0: 2, 1: 2, -1: 2}
 
     def test_query_tokens_are_same_for_different_text_formatting(self):
@@ -0,0 +1,61 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import pickle
+import random
+
+from intbitset import intbitset
+
+from licensedcode.spans import Span
+
+
+def get_random_ints(random_):
+    start = random_.randint(0, 40)
+    return [i for i in range(start, start + random_.randint(0, 60)) if random_.random() < 0.7]
+
+
+def test_Span_operations_are_the_same_as_set_operations():
+    random_ = random.Random(42)
+    for _ in range(2000):
+        ints1 = get_random_ints(random_)
+        ints2 = get_random_ints(random_)
+        random_.shuffle(ints2)
+        set1 = set(ints1)
+        set2 = set(ints2)
+        span1 = Span(ints1)
+        span2 = Span(ints2)
+
+        assert list(span1) == sorted(set1)
+        assert len(span2) == len(set2)
+        assert set(span1 & span2) == set1 & set2
+        assert set(span1 | span2) == set1 | set2
+        assert set(span1.difference(span2)) == set1 - set2
+        assert span1.overlap(span2) == len(set1 & set2)
+        assert (span2 in span1) == set2.issubset(set1)
+        assert span1.issubset(span2) == set1.issubset(set2)
+        assert (span1 == span2) == (set1 == set2)
+        assert (span1 | span2) == Span(set1 | set2)
+        assert hash(span1 & span2) == hash(Span(sorted(set1 & set2)))
+        assert [set(s) for s in span1.subspans()] == [set(s) for s in Span.from_ints(ints1)]
+        for i in range(110):
+            assert (i in span1) == (i in set1)
+
+
+def test_Span_can_be_pickled():
+    span = Span([1, 2, 3, 7, 9, 10])
+    assert pickle.loads(pickle.dumps(span)) == span
+    assert len(pickle.loads(pickle.dumps(span))) == 6
+
+
+def test_Span_set_is_built_once_and_runs_are_the_span_runs():
+    span = Span([1, 2, 3, 7, 9, 10])
+    assert span.set == intbitset([1, 2, 3, 7, 9, 10])
+    assert span.set is span.set
+    assert span.runs == ((1, 3), (7, 7), (9, 10))
+    assert pickle.loads(pickle.dumps(span)).set == span.set
@@ -52,6 +52,8 @@ class LicenseIndexCacheTest(FileBasedTesting):
         )
 
         assert os.path.exists(cache_file)
+        arrays_file = cache.get_index_arrays_file(cache_file)
+        assert os.path.exists(arrays_file)
         fileutils.delete(cache_file)
 
         # force=True builds an index too if none exists
@@ -93,6 +95,72 @@ class LicenseIndexCacheTest(FileBasedTesting):
         )
         assert hash.sha1(cache_file) == idx_checksum_before
 
+        # the flat arrays are memory-mapped and not unpickled on load
+        from licensedcode import index_store
+        assert isinstance(_cached4.index.tids_by_rid, index_store.TokenIdsByRid)
+        assert len(_cached4.index.tids_by_rid) == len(_cached4.index.rules_by_rid)
+
+        # a missing flat arrays file is reported as a corrupted cache
+        fileutils.delete(arrays_file)
+        try:
+            cache.load_cache_file(cache_file)
+            self.fail('No exception raised for missing index arrays file.')
+        except Exception as ex:
+            assert 'Failed to load license cache' in str(ex)
+
+    def test_RuleFilesCache_reuses_the_rules_of_unchanged_rule_files(self):
+        from licensedcode.models import load_rules
+
+        rules_data_dir = self.get_test_loc('cache/data/rules', copy=True)
+        cache_file = os.path.join(self.get_temp_dir(), cache.LICENSE_CHECKSUM_FILE)
+
+        rule_files_cache = cache.RuleFilesCache.load(cache_file)
+        assert not rule_files_cache.rules_by_location
+        rules = list(load_rules(rules_data_dir=rules_data_dir, rule_files_cache=rule_files_cache))
+        rule_files_cache.dump(cache_file)
+        checksums_before = {
+            loc: checksum for loc, (checksum, _) in
+            rule_files_cache.rules_by_location.items()
+        }
+        assert len(checksums_before) == len(rules)
+
+        changed_rule_file = os.path.join(rules_data_dir, 'apache-1.0.RULE')
+        with open(changed_rule_file, 'a') as rf:
+            rf.write('\nsome changed text\n')
+
+        rule_files_cache = cache.RuleFilesCache.load(cache_file)
+        cached_rules = list(load_rules(rules_data_dir=rules_data_dir, rule_files_cache=rule_files_cache))
+        expected = list(load_rules(rules_data_dir=rules_data_dir))
+        assert cached_rules == expected
+        assert [r.identifier for r in cached_rules] == [r.identifier for r in rules]
+
+        changed = [
+            loc for loc, (checksum, _) in rule_files_cache.rules_by_location.items()
+            if checksums_before[loc] != checksum
+        ]
+        assert changed == [changed_rule_file]
+        changed_rule = [r for r in cached_rules if r.identifier == 'apache-1.0.RULE'][0]
+        assert 'some changed text' in changed_rule.text
+
+    def test_RuleFilesCache_discards_rules_cached_with_another_fingerprint(self):
+        import pickle
+        from licensedcode.models import load_rules
+
+        rules_data_dir = self.get_test_loc('cache/data/rules')
+        cache_file = os.path.join(self.get_temp_dir(), cache.LICENSE_CHECKSUM_FILE)
+
+        rule_files_cache = cache.RuleFilesCache.load(cache_file)
+        list(load_rules(rules_data_dir=rules_data_dir, rule_files_cache=rule_files_cache))
+        rule_files_cache.dump(cache_file)
+        assert cache.RuleFilesCache.load(cache_file).rules_by_location
+
+        # a cache saved by another version or with other Rule code is discarded
+        with open(cache_file, 'rb') as cf:
+            _fingerprint, rules_by_location = pickle.load(cf)
+        with open(cache_file, 'wb') as cf:
+            pickle.dump(('0.0.0:some-other-code', rules_by_location), cf)
+        assert not cache.RuleFilesCache.load(cache_file).rules_by_location
+
     def test_load_index_with_corrupted_index(self):
         test_file = self.get_temp_file('test')
         with open(test_file, 'w') as tf:
@@ -39,6 +39,29 @@ class TestDebianPackageGetInstalledPackages(PackageTester):
         run_scan_click(['--system-package', test_dir, '--json-pp', result_file])
         check_json_scan(expected_file, result_file, regen=REGEN_TEST_FIXTURES)
 
+    def test_assemble_installed_status_db_can_be_called_outside_of_a_resource_index_block(self):
+        from commoncode.resource import Codebase
+        from packagedcode.plugin_package import PackageScanner
+        test_dir = self.extract_test_tar('debian/basic-rootfs.tar.gz')
+        codebase = Codebase(
+            location=test_dir,
+            codebase_attributes=PackageScanner.codebase_attributes,
+            resource_attributes=PackageScanner.resource_attributes,
+        )
+        status = codebase.get_resource(path=f'{codebase.root.path}/var/lib/dpkg/status')
+
+        added_paths = []
+
+        def package_adder(package_uid, resource, codebase):
+            added_paths.append(resource.path)
+
+        handler = debian.DebianInstalledStatusDatabaseHandler
+        for package_data in handler.parse(status.location):
+            list(handler.assemble(package_data, status, codebase, package_adder))
+
+        assert f'{codebase.root.path}/usr/share/doc/libndp0/copyright' in added_paths
+        assert f'{codebase.root.path}/var/lib/dpkg/info/libndp0:amd64.md5sums' in added_paths
+
     def test_can_get_installed_system_packages_with_license_from_debian_container_layer(self):
         from packagedcode.plugin_package import get_installed_packages
         test_dir = self.extract_test_tar('debian/debian-container-layer.tar.xz')
@@ -269,3 +269,23 @@ class TestModels(PackageTester):
         assert package.holder == 'openstunts project'
         assert package.declared_license_expression == 'gpl-1.0-plus AND gpl-2.0'
         assert package.declared_license_expression_spdx == 'GPL-1.0-or-later AND GPL-2.0-only'
+
+    def test_populate_holder_field_reuses_holders_of_identical_copyrights(self):
+        models.get_holder_from_copyright.cache_clear()
+        for _ in range(3):
+            package = PackageData(
+                type='alpine',
+                name='musl',
+                copyright='Copyright (c) 2005-2020 Rich Felker, et al.',
+            )
+            package.populate_holder_field()
+            assert package.holder == 'Rich Felker'
+
+        cache_info = models.get_holder_from_copyright.cache_info()
+        assert cache_info.hits == 2
+        assert cache_info.misses == 1
+
+    def test_populate_holder_field_uses_copyright_without_holder(self):
+        package = PackageData(type='debian', name='foo', copyright='Public domain')
+        package.populate_holder_field()
+        assert package.holder == 'Public domain'
@@ -11,6 +11,7 @@ import os
 from unittest.case import skipIf
 
 import pytest
+from commoncode.resource import Codebase
 from commoncode.resource import VirtualCodebase
 from commoncode.system import on_windows
 
@@ -86,6 +87,18 @@ class TestPyPiEndtoEnd(PackageTester):
         run_scan_click(['--package', '--processes', '-1', test_dir, '--json-pp', result_file])
         check_json_scan(expected_file, result_file, remove_uuid=True, regen=REGEN_TEST_FIXTURES)
 
+    def test_get_resource_for_path(self):
+        test_dir = self.get_test_loc('pypi/site-packages/codebase')
+        codebase = Codebase(test_dir)
+        root = codebase.get_resource(f'{codebase.root.path}/lib/python3.9/site-packages')
+        resource = pypi.get_resource_for_path('click/core.py', root, codebase)
+        assert resource.path == f'{root.path}/click/core.py'
+        assert pypi.get_resource_for_path('/click/core.py', root, codebase).path == resource.path
+        assert not pypi.get_resource_for_path('click/missing.py', root, codebase)
+        assert not pypi.get_resource_for_path('../site-packages/click/core.py', root, codebase)
+        assert not pypi.get_resource_for_path('click//core.py', root, codebase)
+        assert not pypi.get_resource_for_path('', root, codebase)
+
 
 class TestPyPiDevelopEggInfoPkgInfo(PackageTester):
     test_data_dir = os.path.join(os.path.dirname(__file__), 'data')
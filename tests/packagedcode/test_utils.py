@@ -7,9 +7,19 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+import os
 from unittest import TestCase
 
+import pytest
+
+from commoncode.resource import Codebase
+from commoncode.testcase import FileBasedTesting
+
+from packagedcode.utils import get_descendants
+from packagedcode.utils import get_descendants_with_suffix
+from packagedcode.utils import get_resource_index
 from packagedcode.utils import normalize_vcs_url
+from packagedcode.utils import resource_index
 
 
 class TestPackageUtils(TestCase):
@@ -128,3 +138,105 @@ class TestPackageUtils(TestCase):
         assert normalize_vcs_url(None) == None
         assert normalize_vcs_url('') == None
         assert normalize_vcs_url(' ') == None
+
+
+class TestResourceIndex(FileBasedTesting):
+
+    def get_test_codebase(self):
+        test_dir = self.get_temp_dir()
+        for path in (
+            'rootfs/usr/share/doc/foo/copyright',
+            'rootfs/usr/share/doc/bar/copyright',
+            'rootfs/var/lib/dpkg/info/foo.list',
+            'rootfs/var/lib/dpkg/info/xfoo.list',
+            'other/var/lib/dpkg/info/foo.list',
+        ):
+            location = os.path.join(test_dir, *path.split('/'))
+            os.makedirs(os.path.dirname(location), exist_ok=True)
+            with open(location, 'w') as out:
+                out.write(path)
+        return Codebase(test_dir)
+
+    def test_resource_index_finds_descendants_in_walk_order(self):
+        codebase = self.get_test_codebase()
+        root = codebase.get_resource(f'{codebase.root.path}/rootfs')
+        with resource_index(codebase) as index:
+            self.check_descendants_in_walk_order(index, root, codebase)
+
+    def check_descendants_in_walk_order(self, index, root, codebase):
+        resources = index.get_descendants_with_suffix(
+            suffixes=('usr/share/doc/foo/copyright', 'var/lib/dpkg/info/foo.list'),
+            root=root,
+        )
+        expected = [
+            r.path for r in root.walk(codebase)
+            if r.path.endswith(('usr/share/doc/foo/copyright', 'var/lib/dpkg/info/foo.list'))
+        ]
+        assert [r.path for r in resources] == expected
+        assert len(expected) == 2
+
+        paths = [
+            f'{root.path}/var/lib/dpkg/info/xfoo.list',
+            f'{root.path}/usr/share/doc/bar/copyright',
+            f'{root.path}/missing',
+            f'{codebase.root.path}/other/var/lib/dpkg/info/foo.list',
+            root.path,
+        ]
+        resources = index.get_descendants(paths, root)
+        expected = [r.path for r in root.walk(codebase) if r.path in paths]
+        assert [r.path for r in resources] == expected
+        assert len(expected) == 2
+
+    def test_get_descendants_walks_the_codebase_outside_of_a_with_block(self):
+        codebase = self.get_test_codebase()
+        root = codebase.get_resource(f'{codebase.root.path}/rootfs')
+        self.check_descendants_in_walk_order(DescendantsLookup(codebase), root, codebase)
+
+    def test_get_descendants_uses_the_index_in_a_with_block(self):
+        codebase = self.get_test_codebase()
+        root = codebase.get_resource(f'{codebase.root.path}/rootfs')
+        with resource_index(codebase) as index:
+            assert not index.is_built
+            self.check_descendants_in_walk_order(DescendantsLookup(codebase), root, codebase)
+            assert index.is_built
+
+    def test_resource_index_is_built_on_first_use(self):
+        codebase = self.get_test_codebase()
+        with resource_index(codebase) as index:
+            assert not index.is_built
+            assert f'{codebase.root.path}/rootfs/usr' in get_resource_index(codebase)
+            assert index.is_built
+
+    def test_get_resource_index_fails_outside_of_a_with_block(self):
+        codebase = self.get_test_codebase()
+        with pytest.raises(Exception):
+            get_resource_index(codebase)
+
+        with resource_index(self.get_test_codebase()):
+            with pytest.raises(Exception):
+                get_resource_index(codebase)
+
+    def test_resource_index_is_reused_in_a_with_block(self):
+        codebase = self.get_test_codebase()
+        with resource_index(codebase) as index:
+            assert get_resource_index(codebase) is index
+            with resource_index(codebase) as nested:
+                assert nested is index
+
+        with resource_index(codebase) as other:
+            assert other is not index
+
+
+class DescendantsLookup:
+    """
+    Call the get_descendants* functions with the ResourceIndex interface.
+    """
+
+    def __init__(self, codebase):
+        self.codebase = codebase
+
+    def get_descendants(self, paths, root):
+        return get_descendants(paths, root, self.codebase)
+
+    def get_descendants_with_suffix(self, suffixes, root):
+        return get_descendants_with_suffix(suffixes, root, self.codebase)
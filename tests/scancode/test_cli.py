@@ -14,6 +14,7 @@ import os
 import pytest
 
 from commoncode import fileutils
+from commoncode.resource import Codebase
 from commoncode.testcase import FileDrivenTesting
 from commoncode.system import on_linux
 from commoncode.system import on_mac
@@ -22,6 +23,8 @@ from commoncode.system import on_windows
 from commoncode.system import py36
 from commoncode.system import py37
 
+from scancode.cli import collect_files_timings
+from scancode.cli import get_displayable_summary
 from scancode.cli_test_utils import check_json_scan
 from scancode.cli_test_utils import load_json_result
 from scancode.cli_test_utils import load_json_result_from_string
@@ -306,6 +309,79 @@ def test_scan_works_with_multiple_processes():
     assert sorted(res1['files'], key=lambda x: tuple(x.items())) == sorted(res3['files'], key=lambda x: tuple(x.items()))
 
 
+def test_scan_with_multiple_processes_unfreezes_heap_when_done():
+    import gc
+    test_dir = test_env.get_test_loc('multiprocessing', copy=True)
+    result_file = test_env.get_temp_file('json')
+    args = ['--copyright', '--processes', '2', test_dir, '--json', result_file]
+    run_scan_click(args)
+    assert gc.get_freeze_count() == 0
+
+
+def test_scan_works_with_multiple_processes_and_batches():
+    test_dir = test_env.get_temp_dir()
+    for i in range(40):
+        with open(os.path.join(test_dir, f'file{i}.c'), 'w') as tf:
+            tf.write(f'/* Copyright (c) {2000 + i} Author{i} */\n')
+
+    # run the same scan sending files one at a time or in batches
+    result_file_1 = test_env.get_temp_file('json')
+    args = ['--copyright', '--processes', '2', '--batch-size', '1', test_dir, '--json', result_file_1]
+    run_scan_click(args)
+
+    result_file_10 = test_env.get_temp_file('json')
+    args = ['--copyright', '--processes', '2', '--batch-size', '10', test_dir, '--json', result_file_10]
+    run_scan_click(args)
+    res1 = json.loads(open(result_file_1).read())
+    res10 = json.loads(open(result_file_10).read())
+    assert sorted(res1['files'], key=lambda x: tuple(x.items())) == sorted(res10['files'], key=lambda x: tuple(x.items()))
+
+
+def test_BatchResults_continues_iteration_after_errors():
+    from scancode.cli import BatchResults
+
+    def batches():
+        yield [1, 2]
+        yield []
+        yield [3]
+
+    class FailingOnce:
+
+        def __init__(self):
+            self.batches = batches()
+            self.failed = False
+
+        def __next__(self):
+            if not self.failed:
+                self.failed = True
+                raise TimeoutError()
+            return next(self.batches)
+
+    results = BatchResults(FailingOnce())
+    with pytest.raises(TimeoutError):
+        next(results)
+    assert list(results) == [1, 2, 3]
+
+
+def test_BatchResults_waits_for_batches_with_wait_timeout():
+    from scancode.cli import BatchResults
+
+    class PoolResults:
+
+        def __init__(self):
+            self.batches = iter([[1, 2], [3]])
+            self.timeouts = []
+
+        def next(self, timeout=None):
+            self.timeouts.append(timeout)
+            return next(self.batches)
+
+    pool_results = PoolResults()
+    results = BatchResults(pool_results, wait_timeout=7200)
+    assert list(results) == [1, 2, 3]
+    assert pool_results.timeouts == [7200, 7200, 7200]
+
+
 def test_scan_works_with_no_processes_in_threaded_mode():
     test_dir = test_env.get_test_loc('multiprocessing', copy=True)
 
@@ -757,6 +833,8 @@ def test_scan_with_timing_json_return_timings_for_each_scanner():
     # NB: these keys are the name of the scan plugins in setup.py
     expected = set(['emails', 'urls', 'licenses', 'copyrights', 'info', 'packages'])
     check_timings(expected, file_results)
+    # license matching stages timings are collected too
+    assert any('licenses:query' in res['scan_timings'] for res in file_results)
 
 
 @pytest.mark.scanslow
@@ -773,6 +851,17 @@ def test_scan_with_timing_jsonpp_return_timings_for_each_scanner():
     check_timings(expected, file_results)
 
 
+def test_scan_without_timing_does_not_collect_timings():
+    test_dir = test_env.get_test_loc('summaries/counts')
+    result_file = test_env.get_temp_file('json')
+    args = ['--copyright', '--info', '--json', result_file, test_dir]
+    result = run_scan_click(args)
+    assert 'Files timings' not in result.output
+    file_results = load_json_result(result_file)['files']
+    assert file_results
+    assert not any(res.get('scan_timings') for res in file_results)
+
+
 def check_timings(expected, file_results):
     for res in file_results:
         scan_timings = res['scan_timings']
@@ -784,9 +873,40 @@ def check_timings(expected, file_results):
 
         assert scan_timings
 
-        for scanner, timing in scan_timings.items():
+        for name, timing in scan_timings.items():
+            scanner, _, stage = name.partition(':')
             assert scanner in expected
-            assert timing
+            if stage:
+                # detailed timings or calls counts of a scanner stage
+                assert timing >= 0
+            else:
+                assert timing
+
+
+def test_collect_files_timings_aggregates_resources_scan_timings():
+    test_dir = test_env.get_test_loc('summaries/counts')
+    codebase = Codebase(test_dir)
+    timings = [0.001, 0.5, 20]
+    files = [r for r in codebase.walk() if r.is_file]
+    for i, resource in enumerate(files):
+        timing = timings[i % len(timings)]
+        resource.scan_timings = {
+            'licenses': timing,
+            'licenses:seq': timing / 2,
+            'licenses:seq:count': 2,
+        }
+        codebase.save_resource(resource)
+
+    collect_files_timings(codebase, 'scan')
+
+    files_timings = codebase.counters['scan:files_timings']
+    assert sorted(files_timings) == ['licenses', 'licenses:seq']
+    assert sum(files_timings['licenses']['histogram']) == len(files)
+    assert files_timings['licenses:seq']['calls'] == len(files) * 2
+    assert files_timings['licenses']['histogram'][-1] > 0
+
+    _errors, summary = get_displayable_summary(codebase, 'licenses', 1, [])
+    assert 'Files timings:  total time, calls and files count by time' in summary
 
 
 @pytest.mark.scanslow
@@ -805,6 +925,60 @@ def test_scan_should_not_fail_with_low_max_in_memory_setting_when_ignoring_files
     run_scan_click(args, expected_rc=0)
 
 
+def test_scan_with_disk_cache_saves_results_from_scan_processes():
+    test_dir = test_env.get_test_loc('multiprocessing', copy=True)
+
+    # run the same scan with all resources in memory or on-disk
+    result_file_memory = test_env.get_temp_file('json')
+    args = ['--copyright', '--info', '-n', '2', '--max-in-memory', '0',
+            test_dir, '--json', result_file_memory]
+    run_scan_click(args)
+
+    result_file_disk = test_env.get_temp_file('json')
+    args = ['--copyright', '--info', '-n', '2', '--max-in-memory', '-1',
+            test_dir, '--json', result_file_disk]
+    run_scan_click(args)
+
+    res_memory = json.loads(open(result_file_memory).read())
+    res_disk = json.loads(open(result_file_disk).read())
+    assert res_disk['files'] == res_memory['files']
+
+
+def test_save_cached_resource_updates_serialized_resource():
+    from scancode.cli import save_cached_resource
+    cache_location = test_env.get_temp_file('json')
+    resource_data = dict(
+        path='foo/bar.c',
+        scan_errors=['some error'],
+        scan_timings={},
+        extra_data={'key': 'value'},
+        copyrights=[],
+    )
+    with open(cache_location, 'w') as cached:
+        json.dump(resource_data, cached)
+
+    save_cached_resource(
+        cache_location=cache_location,
+        scan_errors=['other error'],
+        scan_result={
+            'copyrights': [{'copyright': 'Copyright (c) Foo'}],
+            'holders': [],
+            'extra_data.more': 'data',
+        },
+        scan_timings={'copyrights': 1.0},
+    )
+
+    expected = dict(
+        path='foo/bar.c',
+        scan_errors=['some error', 'other error'],
+        scan_timings={'copyrights': 1.0},
+        extra_data={'key': 'value', 'more': 'data'},
+        copyrights=[{'copyright': 'Copyright (c) Foo'}],
+    )
+    with open(cache_location) as cached:
+        assert json.load(cached) == expected
+
+
 def test_get_displayable_summary():
     from scancode.cli import get_displayable_summary
     from commoncode.resource import Codebase
@@ -1001,3 +1175,48 @@ def test_scan_does_validate_input_and_fails_on_faulty_json_input(test_file, expe
 def test_scan_does_validate_input_and_does_not_fail_on_valid_json_input():
     test_file = test_env.get_test_loc('various-inputs/true-scan-json.json')
     run_scan_click(['--from-json', test_file, '--json-pp', '-'], retry=False)
+
+
+def test_scan_with_result_cache_returns_same_results(monkeypatch):
+    from scancode import result_cache
+    cache_location = os.path.join(test_env.get_temp_dir(), result_cache.RESULT_CACHE_FILENAME)
+    monkeypatch.setattr(result_cache, 'get_default_location', lambda: cache_location)
+
+    test_dir = test_env.get_test_loc('multiprocessing', copy=True)
+
+    results = []
+    outputs = []
+    for args in (
+        [],
+        ['--result-cache'],
+        # the second scan with the result cache uses the cached results
+        ['--result-cache'],
+    ):
+        result_file = test_env.get_temp_file('json')
+        args = args + ['--copyright', '--email', '-n', '2', test_dir, '--json', result_file]
+        outputs.append(run_scan_click(args).output)
+        results.append(json.loads(open(result_file).read())['files'])
+
+    assert results[1] == results[0]
+    assert results[2] == results[0]
+
+    assert os.path.exists(cache_location)
+    assert 'Result cache:' not in outputs[0]
+    assert 'Result cache:   0 hit(s) and 3 miss(es)' in outputs[1]
+    assert 'Result cache:   3 hit(s) and 0 miss(es)' in outputs[2]
+
+
+def test_scan_with_result_cache_max_entries_requires_result_cache():
+    test_file = test_env.get_test_loc('single/iproute.c')
+    args = ['--copyright', '--result-cache-max-entries', '10', test_file, '--json', '-']
+    result = run_scan_click(args, expected_rc=2)
+    assert 'requires the option(s) --result-cache' in result.output
+
+
+def test_scan_with_license_reports_license_matches_cache_stats():
+    test_file = test_env.get_test_loc('single/iproute.c')
+    result_file = test_env.get_temp_file('json')
+    args = ['--license', test_file, '--json', result_file]
+    result = run_scan_click(args)
+    assert 'License matches cache: ' in result.output
+    assert 'License expressions cache: ' in result.output
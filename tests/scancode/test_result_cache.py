@@ -0,0 +1,138 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+from functools import partial
+
+from commoncode.testcase import FileBasedTesting
+
+from scancode import Scanner
+from scancode.api import get_copyrights
+from scancode.api import get_emails
+from scancode.api import get_file_info
+from scancode.result_cache import get_connection
+from scancode.result_cache import get_scanners_key
+from scancode.result_cache import is_cacheable_scanner
+from scancode.result_cache import ResultCache
+
+
+class TestResultCache(FileBasedTesting):
+
+    def get_result_cache(self, scanners=None, max_entries=10):
+        scanners = scanners or [Scanner('copyrights', get_copyrights)]
+        location = self.get_temp_file('sqlite')
+        return ResultCache(scanners=scanners, location=location, max_entries=max_entries)
+
+    def get_last_used(self, cache, key):
+        connection = get_connection(cache.location)
+        row = connection.execute(
+            'SELECT last_used FROM results WHERE key = ?', (key,)
+        ).fetchone()
+        return row and row[0]
+
+    def test_get_returns_put_results(self):
+        cache = self.get_result_cache()
+        key = cache.get_key(path='foo/bar.c', content_sha1='abcd')
+        assert cache.get(key) is None
+
+        results = dict(copyrights=[dict(copyright='Copyright (c) Foo')])
+        cache.put(key, results)
+        assert cache.get(key) == results
+        assert cache.get(key) == results
+        cache.close()
+
+    def test_results_are_available_in_a_later_run(self):
+        cache = self.get_result_cache()
+        key = cache.get_key(path='foo/bar.c', content_sha1='abcd')
+        cache.put(key, dict(emails=[]))
+        cache.close()
+
+        later = ResultCache(
+            scanners=[Scanner('copyrights', get_copyrights)],
+            location=cache.location,
+        )
+        assert later.get(key) == dict(emails=[])
+        later.close()
+
+    def test_get_saves_last_used_in_batches_and_on_close(self):
+        cache = self.get_result_cache(max_entries=100)
+        keys = [cache.get_key(path=f'foo/{i}.c', content_sha1='abcd') for i in range(3)]
+        cache.timestamp = 1
+        for key in keys:
+            cache.put(key, dict(emails=[]))
+        cache.timestamp = 2
+
+        assert cache.get(keys[0]) == dict(emails=[])
+        # the last used time is not saved on get
+        assert self.get_last_used(cache, keys[0]) == 1
+
+        # but is saved with the next put
+        cache.put(cache.get_key(path='foo/other.c', content_sha1='abcd'), dict(emails=[]))
+        assert self.get_last_used(cache, keys[0]) == 2
+
+        assert cache.get(keys[1]) == dict(emails=[])
+        assert self.get_last_used(cache, keys[1]) == 1
+        cache.close()
+        assert self.get_last_used(cache, keys[1]) == 2
+        assert self.get_last_used(cache, keys[2]) == 1
+
+    def test_get_saves_last_used_when_a_batch_is_full(self):
+        from scancode import result_cache
+        cache = self.get_result_cache(max_entries=100)
+        keys = [cache.get_key(path=f'foo/{i}.c', content_sha1='abcd') for i in range(3)]
+        cache.timestamp = 1
+        for key in keys:
+            cache.put(key, dict(emails=[]))
+        cache.timestamp = 2
+
+        batch_size = result_cache.USED_KEYS_BATCH_SIZE
+        try:
+            result_cache.USED_KEYS_BATCH_SIZE = 2
+            cache.get(keys[0])
+            assert self.get_last_used(cache, keys[0]) == 1
+            cache.get(keys[1])
+            assert self.get_last_used(cache, keys[0]) == 2
+            assert self.get_last_used(cache, keys[1]) == 2
+        finally:
+            result_cache.USED_KEYS_BATCH_SIZE = batch_size
+        cache.close()
+
+    def test_evict_deletes_least_recently_used_results(self):
+        cache = self.get_result_cache(max_entries=2)
+        keys = [cache.get_key(path=f'foo/{i}.c', content_sha1='abcd') for i in range(4)]
+        for i, key in enumerate(keys):
+            cache.timestamp = i
+            cache.put(key, dict(index=i))
+
+        assert cache.evict() == 2
+        assert cache.get(keys[0]) is None
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) == dict(index=2)
+        assert cache.get(keys[3]) == dict(index=3)
+        assert cache.evict() == 0
+
+    def test_get_key_depends_on_path_content_and_scanners(self):
+        cache = self.get_result_cache()
+        key = cache.get_key(path='foo/bar.c', content_sha1='abcd')
+        assert key == cache.get_key(path='foo/bar.c', content_sha1='abcd')
+        assert key != cache.get_key(path='foo/baz.c', content_sha1='abcd')
+        assert key != cache.get_key(path='foo/bar.c', content_sha1='abce')
+
+        other = self.get_result_cache(scanners=[Scanner('emails', get_emails)])
+        assert key != other.get_key(path='foo/bar.c', content_sha1='abcd')
+
+    def test_get_scanners_key_depends_on_scanner_options_but_not_uncached_scanners(self):
+        emails = Scanner('emails', partial(get_emails, threshold=50))
+        other_emails = Scanner('emails', partial(get_emails, threshold=10))
+        info = Scanner('info', get_file_info)
+
+        assert get_scanners_key([emails]) == get_scanners_key([emails])
+        assert get_scanners_key([emails]) != get_scanners_key([other_emails])
+        assert get_scanners_key([emails]) == get_scanners_key([emails, info])
+        assert not is_cacheable_scanner(info)
+        assert is_cacheable_scanner(emails)
@@ -0,0 +1,140 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import os
+from time import time
+from unittest.case import skip
+
+import pytest
+
+from commoncode.testcase import FileBasedTesting
+from scancode.cli_test_utils import run_scan_click
+
+pytestmark = pytest.mark.scanslow
+
+# Instructions: Comment out the skip decorators to run a test. Do not commit without a skip
+
+
+class TestScanPerformance(FileBasedTesting):
+
+    def get_small_files_tree(self, files_count=5000):
+        """
+        Return a directory with ``files_count`` tiny files spread in
+        sub-directories.
+        """
+        test_dir = self.get_temp_dir()
+        for i in range(files_count):
+            subdir = os.path.join(test_dir, f'dir{i // 100}')
+            os.makedirs(subdir, exist_ok=True)
+            with open(os.path.join(subdir, f'file{i}.c'), 'w') as tf:
+                tf.write(f'/* Copyright (c) {2000 + i % 20} Author{i} */\nint f{i};\n')
+        return test_dir
+
+    @skip('Use only for local profiling')
+    def test_scan_small_files_batches_performance_timing(self):
+        files_count = 5000
+        test_dir = self.get_small_files_tree(files_count)
+
+        for batch_size in (1, 10, 50, 200):
+            result_file = self.get_temp_file('json')
+            args = [
+                '--copyright', '--email', '--url', '--info',
+                '--processes', '4',
+                '--batch-size', str(batch_size),
+                '--quiet',
+                test_dir,
+                '--json', result_file,
+            ]
+            start = time()
+            run_scan_click(args)
+            duration = time() - start
+            print(f'batch size: {batch_size}: {files_count / duration:.2f} files/sec.')
+
+
+class TestJsonSerializerPerformance(FileBasedTesting):
+
+    @skip('Use only for local profiling')
+    def test_json_serializers_performance_timing(self):
+        import json
+        from scancode.serializers import SERIALIZERS
+        from scancode.serializers import get_serializer
+
+        # a real scan result
+        test_file = os.path.join(
+            os.path.dirname(os.path.dirname(__file__)),
+            'summarycode', 'data', 'plugin_consolidate', 'zlib-expected.json',
+        )
+        with open(test_file) as tf:
+            files = json.load(tf)['files']
+
+        repeats = 20
+        for name in sorted(SERIALIZERS):
+            try:
+                serializer = get_serializer(name)
+            except Exception:
+                print(f'{name}: not available')
+                continue
+
+            for pretty in (False, True):
+                start = time()
+                size = 0
+                for _ in range(repeats):
+                    for scanned_file in files:
+                        size += len(serializer.dumps(scanned_file, pretty=pretty))
+                duration = time() - start
+                mb_per_sec = size / duration / 1024 / 1024
+                print(f'{name}: dumps pretty={pretty}: {mb_per_sec:.2f} MB/sec.')
+
+            serialized = [serializer.dumps_bytes(scanned_file) for scanned_file in files]
+            start = time()
+            size = 0
+            for _ in range(repeats):
+                for data in serialized:
+                    serializer.loads(data)
+                    size += len(data)
+            duration = time() - start
+            print(f'{name}: loads: {size / duration / 1024 / 1024:.2f} MB/sec.')
+
+
+class TestCopyrightPrefilterPerformance(FileBasedTesting):
+
+    @skip('Use only for local profiling')
+    def test_copyright_candidate_lines_prefilter_performance_timing(self):
+        from unittest import mock
+        from cluecode import copyrights
+        from textcode.analysis import numbered_text_lines
+
+        # a large mixed source tree: the scancode sources and data files
+        root_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        src_dir = os.path.join(root_dir, 'src')
+
+        files_lines = []
+        for top, _dirs, files in os.walk(src_dir):
+            for name in files:
+                location = os.path.join(top, name)
+                files_lines.append(list(numbered_text_lines(location, demarkup=True)))
+
+        def detect_all():
+            start = time()
+            detections = [
+                list(copyrights.detect_copyrights_from_lines(numbered_lines))
+                for numbered_lines in files_lines
+            ]
+            return detections, time() - start
+
+        filtered, filtered_duration = detect_all()
+        with mock.patch.object(copyrights, 'filter_candidate_lines', list):
+            unfiltered, unfiltered_duration = detect_all()
+
+        assert filtered == unfiltered
+        print(
+            f'{len(files_lines)} files: '
+            f'without prefilter: {unfiltered_duration:.2f} sec., '
+            f'with prefilter: {filtered_duration:.2f} sec.'
+        )
@@ -0,0 +1,95 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import io
+import json
+
+import jsonstreams
+import pytest
+
+from scancode.serializers import get_json_encoder_class
+from scancode.serializers import get_serializer
+from scancode.serializers import orjson
+
+test_data = {
+    'path': 'some/path.c',
+    'size': 12,
+    'is_text': True,
+    'sha1': None,
+    'percentage': 12.5,
+    'copyrights': [{'copyright': 'Copyright (c) nexB Inc.', 'start_line': 1}],
+    'package_data': [],
+    'extra_data': {},
+}
+
+serializer_names = ['json']
+if orjson:
+    serializer_names.append('orjson')
+
+
+@pytest.mark.parametrize('name', serializer_names)
+def test_serializer_dumps_and_loads(name):
+    serializer = get_serializer(name)
+    assert serializer.name == name
+
+    expected = json.dumps(test_data, separators=(',', ':'))
+    assert serializer.dumps(test_data) == expected
+    assert serializer.dumps_bytes(test_data) == expected.encode('utf-8')
+
+    expected = json.dumps(test_data, indent=2)
+    assert serializer.dumps(test_data, pretty=True) == expected
+
+    assert serializer.loads(serializer.dumps(test_data)) == test_data
+    assert serializer.loads(serializer.dumps_bytes(test_data)) == test_data
+
+
+@pytest.mark.parametrize('name', serializer_names)
+def test_serializer_dumps_non_ascii_and_large_values(name):
+    serializer = get_serializer(name)
+    data = {1: 2 ** 70, 'name': 'François'}
+    assert serializer.loads(serializer.dumps(data)) == {'1': 2 ** 70, 'name': 'François'}
+
+
+@pytest.mark.parametrize('name', serializer_names)
+def test_get_json_encoder_class_with_jsonstreams(name):
+    serializer = get_serializer(name)
+    for pretty, indent in ((False, None), (True, 2)):
+        output = io.StringIO()
+        with jsonstreams.Stream(
+            jsonstreams.Type.OBJECT,
+            fd=output,
+            close_fd=False,
+            indent=indent,
+            pretty=pretty,
+            encoder=get_json_encoder_class(serializer),
+        ) as s:
+            s.write('headers', [{'tool_name': 'scancode-toolkit'}])
+            with s.subarray('files') as files:
+                files.write(test_data)
+                files.write(test_data)
+
+        expected = dict(headers=[{'tool_name': 'scancode-toolkit'}], files=[test_data, test_data])
+        if pretty:
+            assert output.getvalue() == json.dumps(expected, indent=2)
+        else:
+            assert output.getvalue() == json.dumps(expected, separators=(',', ':'))
+
+
+def test_get_serializer_with_unknown_name_raise_exception():
+    with pytest.raises(Exception):
+        get_serializer('unknown')
+
+
+def test_get_serializer_for_outputs_is_json_unless_selected(monkeypatch):
+    monkeypatch.delenv('SCANCODE_JSON_SERIALIZER', raising=False)
+    assert get_serializer(fastest=False).name == 'json'
+    if orjson:
+        assert get_serializer().name == 'orjson'
+        monkeypatch.setenv('SCANCODE_JSON_SERIALIZER', 'orjson')
+        assert get_serializer(fastest=False).name == 'orjson'
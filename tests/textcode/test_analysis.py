@@ -18,7 +18,12 @@ from commoncode.testcase import FileBasedTesting
 
 from scancode_config import REGEN_TEST_FIXTURES
 from textcode.analysis import as_unicode
+from textcode.analysis import file_context
+from textcode.analysis import FileContext
+from textcode.analysis import get_file_context
+from textcode.analysis import numbered_text
 from textcode.analysis import numbered_text_lines
+from textcode.analysis import NumberedText
 from textcode.analysis import unicode_text_lines
 
 
@@ -163,3 +168,147 @@ class TestAnalysis(FileBasedTesting):
         from_string = list(numbered_text_lines(location=text.splitlines(True)))
         assert from_string == from_file
 
+
+    def test_numbered_text_lines_in_file_context_are_cached_and_same_as_without(self):
+        test_file = self.get_test_loc('analysis/bsd-new')
+        expected = list(numbered_text_lines(test_file))
+        expected_demarkup = list(numbered_text_lines(test_file, demarkup=True))
+
+        with file_context(test_file) as context:
+            assert list(numbered_text_lines(test_file)) == expected
+            assert list(numbered_text_lines(test_file, demarkup=True)) == expected_demarkup
+            # a file without markup has the same lines with and without demarkup
+            assert list(context._numbered_lines_by_demarkup) == [False]
+            cached = context._numbered_lines_by_demarkup[False]
+            assert list(numbered_text_lines(test_file)) == expected
+            assert context._numbered_lines_by_demarkup[False] is cached
+
+            result = list(numbered_text_lines(test_file, start_line=10))
+            assert result == list(numbered_text_lines(test_file, start_line=10))
+            assert result[0] == (expected[0][0] + 9, expected[0][1])
+
+        assert get_file_context(test_file) is None
+
+    def test_numbered_text_lines_in_file_context_with_markup(self):
+        test_file = self.get_test_loc('markup/lgpl_license.html')
+        expected = list(numbered_text_lines(test_file))
+        expected_demarkup = list(numbered_text_lines(test_file, demarkup=True))
+        assert expected != expected_demarkup
+
+        with file_context(test_file):
+            assert list(numbered_text_lines(test_file, demarkup=True)) == expected_demarkup
+            assert list(numbered_text_lines(test_file)) == expected
+
+    def test_numbered_text_line_index_returns_the_line_of_an_offset(self):
+        numbered_lines = [(1, 'ab\n'), (2, ''), (3, 'c'), (3, 'de')]
+        text = NumberedText(numbered_lines)
+        assert text.text == 'ab\n\n\nc\nde'
+        results = [
+            numbered_lines[text.line_index(offset)]
+            for offset in range(len(text.text))
+        ]
+        expected = [
+            (1, 'ab\n'), (1, 'ab\n'), (1, 'ab\n'), (1, 'ab\n'),
+            (2, ''),
+            (3, 'c'), (3, 'c'),
+            (3, 'de'), (3, 'de'),
+        ]
+        assert results == expected
+
+    def test_numbered_text_in_file_context_is_cached_and_same_as_without(self):
+        test_file = self.get_test_loc('analysis/bsd-new')
+        expected = list(numbered_text_lines(test_file))
+        assert numbered_text(test_file).numbered_lines == expected
+
+        with file_context(test_file):
+            text = numbered_text(test_file)
+            assert text.numbered_lines == expected
+            assert numbered_text(test_file) is text
+
+    def test_file_context_checksums_are_same_as_multi_checksums(self):
+        from commoncode.hash import multi_checksums
+        test_file = self.get_test_loc('analysis/bsd-new')
+        expected = multi_checksums(test_file, ('sha1', 'md5', 'sha256'))
+        assert FileContext(test_file).checksums() == expected
+        assert FileContext(test_file, max_size=1).checksums() == expected
+
+    def test_file_context_checksums_are_none_for_empty_file(self):
+        test_file = self.get_temp_file('empty')
+        with open(test_file, 'wb'):
+            pass
+        assert FileContext(test_file).checksums(('sha1',)) == {'sha1': None}
+
+    def test_binary_lines_splits_on_line_endings_across_chunks(self):
+        from textcode.analysis import binary_lines
+        content = b'a\r\nbb\rccc\n\n\r\r\ndddd\r\n\reeeee'
+        expected = content.splitlines(True)
+        for buff_size in range(1, len(content) + 2):
+            result = list(binary_lines(io.BytesIO(content), buff_size=buff_size))
+            assert result == expected
+
+    def test_binary_lines_with_a_very_long_line_without_line_ending(self):
+        from textcode.analysis import binary_lines
+        content = b'a' * (8 * 1024 * 1024)
+        result = list(binary_lines(io.BytesIO(content), buff_size=1024))
+        assert result == [content]
+
+        content = b'a\r' + content + b'\n' + content
+        result = list(binary_lines(io.BytesIO(content), buff_size=1024))
+        assert result == content.splitlines(True)
+
+    def test_numbered_text_lines_falls_back_to_plain_text_if_demarkup_fails(self):
+        from unittest import mock
+        from textcode import markup
+
+        test_file = self.get_temp_file('test.html')
+        with open(test_file, 'w') as out:
+            out.writelines(f'<p>line {i}</p>\n' for i in range(1, 6))
+        plain_lines = list(numbered_text_lines(test_file, demarkup=False))
+
+        def demarkup_failing_at(failing_line):
+
+            def demarkup(location):
+                for line_number, (_ln, line) in enumerate(plain_lines, 1):
+                    if line_number == failing_line:
+                        raise Exception('failed')
+                    yield f'demarked {line}'
+
+            return demarkup
+
+        with mock.patch.object(markup, 'demarkup', demarkup_failing_at(1)):
+            assert list(numbered_text_lines(test_file, demarkup=True)) == plain_lines
+
+        with mock.patch.object(markup, 'demarkup', demarkup_failing_at(3)):
+            result = list(numbered_text_lines(test_file, demarkup=True))
+        expected = [
+            (1, 'demarked <p>line 1</p>\n'),
+            (2, 'demarked <p>line 2</p>\n'),
+        ] + plain_lines[2:]
+        assert result == expected
+
+    def test_numbered_text_lines_with_demarkup_memory_is_bounded(self):
+        import tracemalloc
+        import typecode.contenttype
+
+        test_file = self.get_temp_file('big.xml')
+        line = '<entry key="{}"><value>Some text for this entry.</value></entry>\n'
+        with open(test_file, 'w') as out:
+            out.write('<?xml version="1.0" encoding="UTF-8"?>\n<entries>\n')
+            out.writelines(line.format(i) for i in range(40000))
+            out.write('</entries>\n')
+        # warm up the file type detection caches
+        typecode.contenttype.get_type(test_file)
+
+        tracemalloc.start()
+        try:
+            lines = 0
+            for _ in numbered_text_lines(test_file, demarkup=True):
+                lines += 1
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        file_size = os.path.getsize(test_file)
+        assert lines == 40003
+        assert file_size > 2000000
+        assert peak < file_size / 5
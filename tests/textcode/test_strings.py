@@ -35,6 +35,19 @@ class TestStrings(FileBasedTesting):
         assert results == expected
         return results
 
+    def test_strings_from_file_are_the_same_across_chunk_boundaries(self):
+        test_file = self.get_test_loc('strings/with-lf/strings.exe')
+        expected = list(strings.strings_from_file(test_file))
+        assert expected
+        result = list(strings.strings_from_file(test_file, buff_size=1024))
+        assert result == expected
+
+    def test_binary_chunks_do_not_split_strings(self):
+        content = b'\x01\x02some string\x00\x00another string\x03last'
+        chunks = list(strings.binary_chunks(io.BytesIO(content), buff_size=20))
+        expected = [b'\x01\x02', b'some string\x00\x00another string\x03', b'last']
+        assert chunks == expected
+
     def test_clean_string(self):
         assert list(strings.clean_string('aw w we ww '))
         assert not list(strings.clean_string('ab'))